@@ -14,27 +14,52 @@ from ._all_any import (
     any_maintenance,
     any_waiting,
 )
-from ._juju import CLIError, ConfigValue, Juju, WaitError
-from ._task import Task, TaskError
-from ._test_helpers import temp_model
+from ._async_juju import AsyncJuju
+from ._backoff import Backoff
+from ._debug_log import DebugLogBuffer, DebugLogRecord
+from ._executor import AsyncioExecutor, CLIError, Executor, SerialExecutor, ThreadExecutor
+from ._juju import ConfigValue, Juju, WaitError
+from ._limiter import Limiter, LimiterStats, controller_limiter, limit_controller
+from ._plan import DeploymentPlan
+from ._runner import Runner, WorkerRunner
+from ._task import Task, TaskError, TaskHandle
+from ._test_helpers import ModelPool, temp_model, wait_model_teardowns
 from ._version import Version
+from ._wait_all import wait_all
+from ._when import Condition, when
 from .modeltypes import ModelInfo
 from .secrettypes import RevealedSecret, Secret, SecretURI
 from .statustypes import Status
 
 __all__ = [
+    'AsyncJuju',
+    'AsyncioExecutor',
+    'Backoff',
     'CLIError',
+    'Condition',
     'ConfigValue',
+    'DebugLogBuffer',
+    'DebugLogRecord',
+    'DeploymentPlan',
+    'Executor',
     'Juju',
+    'Limiter',
+    'LimiterStats',
     'ModelInfo',
+    'ModelPool',
     'RevealedSecret',
+    'Runner',
     'Secret',
     'SecretURI',
+    'SerialExecutor',
     'Status',
     'Task',
     'TaskError',
+    'TaskHandle',
+    'ThreadExecutor',
     'Version',
     'WaitError',
+    'WorkerRunner',
     'all_active',
     'all_agents_idle',
     'all_blocked',
@@ -46,10 +71,15 @@ __all__ = [
     'any_error',
     'any_maintenance',
     'any_waiting',
+    'controller_limiter',
+    'limit_controller',
     'modeltypes',
     'secrettypes',
     'statustypes',
     'temp_model',
+    'wait_all',
+    'wait_model_teardowns',
+    'when',
 ]
 
 __version__ = '1.7.0'
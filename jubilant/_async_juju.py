@@ -0,0 +1,1157 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import pathlib
+import subprocess
+import tempfile
+import time
+from collections.abc import Callable, Iterable, Mapping
+from typing import Any, AsyncGenerator, Literal, overload
+
+from . import _juju, _yaml
+from ._backoff import Backoff
+from ._debug_log import DebugLogRecord, debug_log_stream_args
+from ._executor import CLIError, Executor, _run_cli_async
+from ._juju import ConfigValue, ConstraintValue
+from ._limiter import limiter_for_model
+from ._runner import Runner
+from ._task import Task, TaskHandle
+from ._version import Version
+from .modeltypes import ModelInfo
+from .secrettypes import RevealedSecret, Secret, SecretURI
+from .statustypes import Status
+
+logger = logging.getLogger('jubilant')
+
+
+class AsyncJuju(_juju._BaseJuju):
+    """Instantiate this class to run Juju commands from asyncio code.
+
+    This is the asyncio version of :class:`Juju`. Each method runs the Juju CLI using
+    :func:`asyncio.create_subprocess_exec`, so a single event loop can drive many CLI commands
+    (on many models) concurrently, without a thread per command.
+
+    It has the same methods as :class:`Juju`, and the arguments and return values of each
+    method are the same as the :class:`Juju` method of the same name, except that
+    :meth:`run_multiple` and :meth:`debug_log_stream` are async generators.
+
+    Example::
+
+        async def deploy_all(juju: jubilant.AsyncJuju):
+            await asyncio.gather(
+                juju.deploy('snappass-test'),
+                juju.deploy('redis-k8s', channel='latest/edge'),
+            )
+            await juju.wait(jubilant.all_active)
+
+    Args:
+        model: If specified, operate on this Juju model, otherwise use the current Juju model.
+            If the model is in another controller, prefix the model name with ``<controller>:``.
+        wait_timeout: The default timeout for :meth:`wait` (in seconds) if that method's *timeout*
+            parameter is not specified.
+        cli_binary: Path to the Juju CLI binary. If not specified, uses ``juju`` and assumes it is
+            in the PATH.
+        json_loads: Function used to decode the JSON output of Juju commands. If not specified,
+            uses ``orjson.loads`` or ``msgspec.json.decode`` if one of those is installed, as
+            they're several times faster than :func:`json.loads` (which is used otherwise).
+        runner: Object used to run Juju CLI commands, such as a :class:`WorkerRunner`. If not
+            specified, each command is run in a new ``juju`` process.
+        executor: Object that schedules Juju CLI commands, such as a :class:`ThreadExecutor`
+            shared with other instances. If specified, *runner* is not used (the executor
+            has its own). If not specified, each command is run when it's called.
+    """
+
+    model: str | None
+    """If not None, operate on this Juju model, otherwise use the current Juju model."""
+
+    wait_timeout: float
+    """The default timeout for :meth:`wait` (in seconds) if that method's *timeout* parameter is
+    not specified.
+    """
+
+    cli_binary: str
+    """Path to the Juju CLI binary. If None, uses ``juju`` and assumes it is in the PATH."""
+
+    json_loads: Callable[[str], Any]
+    """Function used to decode the JSON output of Juju commands."""
+
+    runner: Runner | None
+    """Object used to run Juju CLI commands, or None to run each in a new ``juju`` process."""
+
+    executor: Executor | None
+    """Object that schedules Juju CLI commands, or None to run each when it's called."""
+
+    # Keep the public methods in alphabetical order, so we don't have to think
+    # about where to put each new method.
+
+    @overload
+    async def add_credential(
+        self,
+        cloud: str,
+        credential: str | pathlib.Path | Mapping[str, Any],
+        *,
+        client: Literal[True],
+        controller: None = None,
+        region: str | None = None,
+    ) -> None: ...
+
+    @overload
+    async def add_credential(
+        self,
+        cloud: str,
+        credential: str | pathlib.Path | Mapping[str, Any],
+        *,
+        client: bool = False,
+        controller: str,
+        region: str | None = None,
+    ) -> None: ...
+
+    async def add_credential(
+        self,
+        cloud: str,
+        credential: str | pathlib.Path | Mapping[str, Any],
+        *,
+        client: bool = False,
+        controller: str | None = None,
+        region: str | None = None,
+    ) -> None:
+        """Add a credential for a cloud.
+
+        See :meth:`Juju.add_credential` for details.
+        """
+        args = _juju._add_credential_args(
+            cloud, client=client, controller=controller, region=region
+        )
+        if isinstance(credential, (str, pathlib.Path)):
+            args.extend(['--file', str(credential)])
+            await self.cli(*args, include_model=False)
+        else:
+            with tempfile.NamedTemporaryFile('w+', dir=self._temp_dir) as temp_file:
+                _yaml.safe_dump(credential, temp_file)
+                temp_file.flush()
+                args.extend(['--file', temp_file.name])
+                await self.cli(*args, include_model=False)
+
+    async def add_model(
+        self,
+        model: str,
+        cloud: str | None = None,
+        *,
+        controller: str | None = None,
+        config: Mapping[str, ConfigValue] | None = None,
+        credential: str | None = None,
+    ) -> None:
+        """Add a named model and set this instance's model to it.
+
+        See :meth:`Juju.add_model` for details.
+        """
+        args = _juju._add_model_args(
+            model, cloud, controller=controller, config=config, credential=credential
+        )
+        await self.cli(*args, include_model=False)
+        self.model = model if controller is None else f'{controller}:{model}'
+
+    async def add_secret(
+        self,
+        name: str,
+        content: Mapping[str, str],
+        *,
+        info: str | None = None,
+    ) -> SecretURI:
+        """Add a new named secret and return its secret URI.
+
+        See :meth:`Juju.add_secret` for details.
+        """
+        args = _juju._add_secret_args(name, info=info)
+        with tempfile.NamedTemporaryFile('w+', dir=self._temp_dir) as file:
+            _yaml.safe_dump(content, file)
+            file.flush()
+            args.extend(['--file', file.name])
+            output = await self.cli(*args)
+
+        return SecretURI(output.strip())
+
+    async def add_ssh_key(self, *keys: str) -> None:
+        """Add one or more SSH keys to the model.
+
+        See :meth:`Juju.add_ssh_key` for details.
+        """
+        await self.cli('add-ssh-key', *keys)
+
+    async def add_unit(
+        self,
+        app: str,
+        *,
+        attach_storage: str | Iterable[str] | None = None,
+        num_units: int = 1,
+        to: str | Iterable[str] | None = None,
+    ) -> None:
+        """Add one or more units to a deployed application.
+
+        See :meth:`Juju.add_unit` for details.
+        """
+        args = _juju._add_unit_args(app, attach_storage=attach_storage, num_units=num_units, to=to)
+        await self.cli(*args)
+
+    async def bootstrap(
+        self,
+        cloud: str,
+        controller: str,
+        *,
+        bootstrap_base: str | None = None,
+        bootstrap_constraints: Mapping[str, str] | None = None,
+        config: Mapping[str, ConfigValue] | None = None,
+        constraints: Mapping[str, str] | None = None,
+        credential: str | None = None,
+        force: bool = False,
+        model_defaults: Mapping[str, ConfigValue] | None = None,
+        storage_pool: Mapping[str, str] | None = None,
+        to: str | Iterable[str] | None = None,
+    ) -> None:
+        """Bootstrap a controller on a cloud environment.
+
+        See :meth:`Juju.bootstrap` for details.
+        """
+        args = _juju._bootstrap_args(
+            cloud,
+            controller,
+            bootstrap_base=bootstrap_base,
+            bootstrap_constraints=bootstrap_constraints,
+            config=config,
+            constraints=constraints,
+            credential=credential,
+            force=force,
+            model_defaults=model_defaults,
+            storage_pool=storage_pool,
+            to=to,
+        )
+        _, stderr = await self._cli(*args, include_model=False)
+        logger.info('bootstrap output:\n%s', stderr)
+
+    async def cli(self, *args: str, include_model: bool = True, stdin: str | None = None) -> str:
+        """Run a Juju CLI command and return its standard output.
+
+        Args:
+            args: Command-line arguments (excluding ``juju``).
+            include_model: If true and :attr:`model` is set, insert the ``--model`` argument
+                after the first argument in *args*.
+            stdin: Standard input to send to the process, if any.
+        """
+        stdout, _ = await self._cli(*args, include_model=include_model, stdin=stdin)
+        return stdout
+
+    async def _cli(
+        self,
+        *args: str,
+        include_model: bool = True,
+        stdin: str | None = None,
+        log: bool = True,
+        timeout: float | None = None,
+    ) -> tuple[str, str]:
+        """Run a Juju CLI command and return its standard output and standard error."""
+        cli_args = self._cli_args(args, include_model=include_model, log=log)
+        limiter = limiter_for_model(self.model)
+        if limiter is not None:
+            # Waits with asyncio rather than blocking a thread, and releases if cancelled.
+            await limiter._acquire_async()
+        try:
+            if self.executor is not None:
+                future = self.executor.submit(cli_args, stdin=stdin, timeout=timeout)
+                return await asyncio.wrap_future(future)
+            return await _run_cli_async(cli_args, stdin=stdin, timeout=timeout, runner=self.runner)
+        finally:
+            if limiter is not None:
+                limiter._release()
+
+    @overload
+    async def config(self, app: str, *, app_config: bool = False) -> Mapping[str, ConfigValue]: ...
+
+    @overload
+    async def config(
+        self,
+        app: str,
+        values: Mapping[str, ConfigValue],
+        *,
+        reset: str | Iterable[str] = (),
+    ) -> None: ...
+
+    @overload
+    async def config(self, app: str, *, reset: str | Iterable[str]) -> None: ...
+
+    async def config(
+        self,
+        app: str,
+        values: Mapping[str, ConfigValue] | None = None,
+        *,
+        app_config: bool = False,
+        reset: str | Iterable[str] = (),
+    ) -> Mapping[str, ConfigValue] | None:
+        """Get or set the configuration of a deployed application.
+
+        See :meth:`Juju.config` for details.
+        """
+        if values is None and not reset:
+            stdout = await self.cli('config', '--format', 'json', app)
+            return _juju._config_output(stdout, app_config=app_config, loads=self.json_loads)
+
+        args = _juju._config_args(app, values, reset=reset)
+        await self.cli(*args)
+
+    async def consume(
+        self,
+        model_and_app: str,
+        alias: str | None = None,
+        *,
+        controller: str | None = None,
+        owner: str | None = None,
+    ) -> None:
+        """Add a remote offer to the model.
+
+        See :meth:`Juju.consume` for details.
+        """
+        args = _juju._consume_args(model_and_app, alias, controller=controller, owner=owner)
+        await self.cli(*args)
+
+    async def debug_log(self, *, limit: int = 0) -> str:
+        """Return debug log messages from a model.
+
+        See :meth:`Juju.debug_log` for details.
+        """
+        return await self.cli('debug-log', '--limit', str(limit))
+
+    async def debug_log_stream(
+        self,
+        *,
+        include: Iterable[str] = (),
+        exclude: Iterable[str] = (),
+        include_module: Iterable[str] = (),
+        exclude_module: Iterable[str] = (),
+        level: str | None = None,
+        replay: bool = False,
+        lines: int | None = None,
+        tail: bool = True,
+    ) -> AsyncGenerator[DebugLogRecord]:
+        """Follow a model's debug log, yielding each record as it's logged.
+
+        The "juju debug-log" process is stopped when the generator is closed (for example, when
+        an ``async for`` loop over it ends with ``break``). See :meth:`Juju.debug_log_stream`
+        for details.
+        """
+        args = debug_log_stream_args(
+            include=include,
+            exclude=exclude,
+            include_module=include_module,
+            exclude_module=exclude_module,
+            level=level,
+            replay=replay,
+            lines=lines,
+            tail=tail,
+        )
+        cli_args = self._cli_args(args, include_model=True, log=True)
+        # As with Juju.debug_log_stream, send stderr to a file so it can't fill up a pipe.
+        with tempfile.TemporaryFile() as stderr_file:
+            process = await asyncio.create_subprocess_exec(
+                *cli_args, stdout=subprocess.PIPE, stderr=stderr_file
+            )
+            try:
+                assert process.stdout is not None
+                while True:
+                    line = await process.stdout.readline()
+                    if not line:
+                        break
+                    yield DebugLogRecord._from_line(line.decode('utf-8').rstrip('\n'))
+                returncode = await process.wait()
+                if returncode:
+                    stderr_file.seek(0)
+                    stderr = stderr_file.read().decode('utf-8')
+                    raise CLIError(returncode, cli_args, '', stderr)
+            finally:
+                if process.returncode is None:
+                    with contextlib.suppress(ProcessLookupError):
+                        process.terminate()
+                    try:
+                        await asyncio.wait_for(process.wait(), 5)
+                    except asyncio.TimeoutError:
+                        process.kill()
+                        await process.wait()
+
+    async def deploy(
+        self,
+        charm: str | pathlib.Path,
+        app: str | None = None,
+        *,
+        attach_storage: str | Iterable[str] | None = None,
+        base: str | None = None,
+        bind: Mapping[str, str] | str | None = None,
+        channel: str | None = None,
+        config: Mapping[str, ConfigValue] | None = None,
+        constraints: Mapping[str, str] | None = None,
+        force: bool = False,
+        num_units: int = 1,
+        overlays: Iterable[str | pathlib.Path] = (),
+        resources: Mapping[str, str] | None = None,
+        revision: int | None = None,
+        storage: Mapping[str, str] | None = None,
+        to: str | Iterable[str] | None = None,
+        trust: bool = False,
+    ) -> None:
+        """Deploy an application or bundle.
+
+        See :meth:`Juju.deploy` for details.
+        """
+        # Need this check because str is also an iterable of str.
+        if isinstance(overlays, str):
+            raise TypeError('overlays must be an iterable of str or pathlib.Path, not str')
+
+        with self._deploy_tempdir(charm, resources) as (_charm, resources):
+            assert _charm is not None
+            args = _juju._deploy_args(
+                _charm,
+                app,
+                attach_storage=attach_storage,
+                base=base,
+                bind=bind,
+                channel=channel,
+                config=config,
+                constraints=constraints,
+                force=force,
+                num_units=num_units,
+                overlays=overlays,
+                resources=resources,
+                revision=revision,
+                storage=storage,
+                to=to,
+                trust=trust,
+            )
+            await self.cli(*args)
+
+    async def destroy_model(
+        self,
+        model: str,
+        *,
+        destroy_storage: bool = False,
+        force: bool = False,
+        no_wait: bool = False,
+        release_storage: bool = False,
+        timeout: float | None = None,
+    ) -> None:
+        """Terminate all machines (or containers) and resources for a model.
+
+        See :meth:`Juju.destroy_model` for details.
+        """
+        args = _juju._destroy_model_args(
+            model,
+            destroy_storage=destroy_storage,
+            force=force,
+            no_wait=no_wait,
+            release_storage=release_storage,
+            timeout=timeout,
+        )
+        await self.cli(*args, include_model=False)
+        if model == self.model:
+            self.model = None
+
+    @overload
+    async def exec(
+        self, command: str, *args: str, machine: int | str, wait: float | None = None
+    ) -> Task: ...
+
+    @overload
+    async def exec(
+        self, command: str, *args: str, unit: str, wait: float | None = None
+    ) -> Task: ...
+
+    async def exec(
+        self,
+        command: str,
+        *args: str,
+        machine: int | str | None = None,
+        unit: str | None = None,
+        wait: float | None = None,
+    ) -> Task:
+        """Run the command on the remote target specified.
+
+        See :meth:`Juju.exec` for details.
+        """
+        cli_args = _juju._exec_args(command, args, machine=machine, unit=unit, wait=wait)
+        try:
+            stdout, stderr = await self._cli(*cli_args)
+        except CLIError as exc:
+            stdout, stderr = _juju._task_failed_output(exc)
+        return _juju._task_from_output(
+            stdout, stderr, 'error running command', loads=self.json_loads
+        )
+
+    @overload
+    async def exec_background(
+        self, command: str, *args: str, machine: int | str
+    ) -> TaskHandle: ...
+
+    @overload
+    async def exec_background(self, command: str, *args: str, unit: str) -> TaskHandle: ...
+
+    async def exec_background(
+        self,
+        command: str,
+        *args: str,
+        machine: int | str | None = None,
+        unit: str | None = None,
+    ) -> TaskHandle:
+        """Start running the command on the remote target specified, without waiting for it.
+
+        See :meth:`Juju.exec_background` for details.
+        """
+        args_ = _juju._exec_args(
+            command, args, machine=machine, unit=unit, wait=None, background=True
+        )
+        stdout, stderr = await self._cli(*args_)
+        target = str(machine) if machine is not None else unit
+        assert target is not None
+        return _juju._task_handle_from_output(stdout, stderr, target)
+
+    async def exec_multiple(
+        self,
+        command: str,
+        *args: str,
+        all: bool = False,
+        app: str | Iterable[str] | None = None,
+        machine: int | str | Iterable[int | str] | None = None,
+        unit: str | Iterable[str] | None = None,
+        wait: float | None = None,
+    ) -> dict[str, Task]:
+        """Run the command on multiple remote targets at once.
+
+        See :meth:`Juju.exec_multiple` for details.
+        """
+        cli_args = _juju._exec_multiple_args(
+            command, args, all=all, app=app, machine=machine, unit=unit, wait=wait
+        )
+        try:
+            stdout, stderr = await self._cli(*cli_args)
+        except CLIError as exc:
+            stdout, stderr = _juju._task_failed_output(exc)
+        return _juju._tasks_from_output(
+            stdout, stderr, 'error running command', loads=self.json_loads
+        )
+
+    async def grant_secret(self, identifier: str | SecretURI, app: str | Iterable[str]) -> None:
+        """Grant access to a secret for one or more applications.
+
+        See :meth:`Juju.grant_secret` for details.
+        """
+        args = _juju._grant_secret_args(identifier, app)
+        await self.cli(*args)
+
+    async def integrate(
+        self, app1: str, app2: str, *, via: str | Iterable[str] | None = None
+    ) -> None:
+        """Integrate two applications, creating a relation between them.
+
+        See :meth:`Juju.integrate` for details.
+        """
+        args = _juju._integrate_args(app1, app2, via=via)
+        await self.cli(*args)
+
+    @overload
+    async def model_config(self) -> Mapping[str, ConfigValue]: ...
+
+    @overload
+    async def model_config(
+        self, values: Mapping[str, ConfigValue], *, reset: str | Iterable[str] = ()
+    ) -> None: ...
+
+    @overload
+    async def model_config(self, *, reset: str | Iterable[str]) -> None: ...
+
+    async def model_config(
+        self, values: Mapping[str, ConfigValue] | None = None, reset: str | Iterable[str] = ()
+    ) -> Mapping[str, ConfigValue] | None:
+        """Get or set the configuration of the model.
+
+        See :meth:`Juju.model_config` for details.
+        """
+        if values is None and not reset:
+            stdout = await self.cli('model-config', '--format', 'json')
+            return _juju._model_config_output(stdout, loads=self.json_loads)
+
+        args = _juju._model_config_args(values, reset=reset)
+        await self.cli(*args)
+
+    @overload
+    async def model_constraints(self) -> Mapping[str, ConstraintValue]: ...
+
+    @overload
+    async def model_constraints(self, constraints: Mapping[str, ConstraintValue]) -> None: ...
+
+    async def model_constraints(
+        self,
+        constraints: Mapping[str, ConstraintValue] | None = None,
+    ) -> Mapping[str, ConstraintValue] | None:
+        """Get or set machine constraints on a model.
+
+        See :meth:`Juju.model_constraints` for details.
+        """
+        if constraints is None:
+            stdout = await self.cli('model-constraints', '--format', 'json')
+            return self.json_loads(stdout)
+
+        args = _juju._set_model_constraints_args(constraints)
+        await self.cli(*args)
+
+    async def offer(
+        self,
+        app: str,
+        *,
+        controller: str | None = None,
+        endpoint: str | Iterable[str],
+        name: str | None = None,
+    ) -> None:
+        """Offer application endpoints for use in other models.
+
+        See :meth:`Juju.offer` for details.
+        """
+        args = _juju._offer_args(app, controller=controller, endpoint=endpoint, name=name)
+        await self.cli(*args, include_model=False)
+
+    async def refresh(
+        self,
+        app: str,
+        *,
+        base: str | None = None,
+        channel: str | None = None,
+        config: Mapping[str, ConfigValue] | None = None,
+        force: bool = False,
+        path: str | pathlib.Path | None = None,
+        resources: Mapping[str, str] | None = None,
+        revision: int | None = None,
+        storage: Mapping[str, str] | None = None,
+        trust: bool = False,
+    ) -> None:
+        """Refresh (upgrade) an application's charm.
+
+        See :meth:`Juju.refresh` for details.
+        """
+        with self._deploy_tempdir(path, resources) as (path, resources):
+            args = _juju._refresh_args(
+                app,
+                base=base,
+                channel=channel,
+                config=config,
+                force=force,
+                path=path,
+                resources=resources,
+                revision=revision,
+                storage=storage,
+                trust=trust,
+            )
+            await self.cli(*args)
+
+    async def remove_application(
+        self,
+        *app: str,
+        destroy_storage: bool = False,
+        force: bool = False,
+    ) -> None:
+        """Remove applications from the model.
+
+        See :meth:`Juju.remove_application` for details.
+        """
+        args = _juju._remove_application_args(app, destroy_storage=destroy_storage, force=force)
+        await self.cli(*args)
+
+    async def remove_relation(self, app1: str, app2: str, *, force: bool = False) -> None:
+        """Remove an existing relation between two applications (opposite of :meth:`integrate`).
+
+        See :meth:`Juju.remove_relation` for details.
+        """
+        args = _juju._remove_relation_args(app1, app2, force=force)
+        await self.cli(*args)
+
+    async def remove_secret(
+        self, identifier: str | SecretURI, *, revision: int | None = None
+    ) -> None:
+        """Remove a secret from the model.
+
+        See :meth:`Juju.remove_secret` for details.
+        """
+        args = _juju._remove_secret_args(identifier, revision=revision)
+        await self.cli(*args)
+
+    async def remove_ssh_key(self, *ids: str) -> None:
+        """Remove one or more SSH keys from the model.
+
+        See :meth:`Juju.remove_ssh_key` for details.
+        """
+        await self.cli('remove-ssh-key', *ids)
+
+    async def remove_unit(
+        self,
+        *app_or_unit: str,
+        destroy_storage: bool = False,
+        force: bool = False,
+        num_units: int = 0,
+    ) -> None:
+        """Remove application units from the model.
+
+        See :meth:`Juju.remove_unit` for details.
+        """
+        args = _juju._remove_unit_args(
+            app_or_unit, destroy_storage=destroy_storage, force=force, num_units=num_units
+        )
+        await self.cli(*args)
+
+    async def run(
+        self,
+        unit: str,
+        action: str,
+        params: Mapping[str, Any] | None = None,
+        *,
+        wait: float | None = None,
+    ) -> Task:
+        """Run an action on the given unit and wait for the result.
+
+        See :meth:`Juju.run` for details.
+        """
+        with self._params_file(params) as params_args:
+            _, task = await self._run_unit(unit, action, params_args, wait=wait)
+        task.raise_on_failure()
+        return task
+
+    async def run_background(
+        self,
+        unit: str,
+        action: str,
+        params: Mapping[str, Any] | None = None,
+    ) -> TaskHandle:
+        """Start running an action on the given unit, without waiting for it to finish.
+
+        See :meth:`Juju.run_background` for details.
+        """
+        with self._params_file(params) as params_args:
+            args = _juju._run_args(unit, action, params_args, wait=None, background=True)
+            stdout, stderr = await self._cli(*args)
+        return _juju._task_handle_from_output(stdout, stderr, unit)
+
+    async def run_multiple(
+        self,
+        units: Iterable[str],
+        action: str,
+        params: Mapping[str, Any] | None = None,
+        *,
+        max_workers: int = 8,
+        wait: float | None = None,
+    ) -> AsyncGenerator[tuple[str, Task]]:
+        """Run an action on multiple units, yielding each result as soon as it's available.
+
+        See :meth:`Juju.run_multiple` for details.
+        """
+        # Need this check because str is also an iterable of str.
+        if isinstance(units, str):
+            raise TypeError('units must be an iterable of str, not str')
+
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def run_unit(unit: str) -> tuple[str, Task]:
+            async with semaphore:
+                return await self._run_unit(unit, action, params_args, wait=wait)
+
+        with self._params_file(params) as params_args:
+            tasks = [asyncio.ensure_future(run_unit(unit)) for unit in units]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    yield await next_done
+            finally:
+                # Don't start actions on the remaining units if we're exiting early, and wait
+                # for the running ones before the params file is removed.
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run_unit(
+        self, unit: str, action: str, params_args: list[str], *, wait: float | None
+    ) -> tuple[str, Task]:
+        args = _juju._run_args(unit, action, params_args, wait=wait)
+        try:
+            stdout, stderr = await self._cli(*args)
+        except CLIError as exc:
+            stdout, stderr = _juju._task_failed_output(exc, action=action)
+        return _juju._run_output(stdout, stderr, action, loads=self.json_loads)
+
+    async def scp(
+        self,
+        source: str | pathlib.Path,
+        destination: str | pathlib.Path,
+        *,
+        container: str | None = None,
+        host_key_checks: bool = True,
+        scp_options: Iterable[str] = (),
+    ) -> None:
+        """Securely transfer files within a model.
+
+        See :meth:`Juju.scp` for details.
+        """
+        args = _juju._scp_args(
+            container=container, host_key_checks=host_key_checks, scp_options=scp_options
+        )
+        with self._scp_staging(str(source), str(destination)) as (source, destination):
+            await self.cli(*args, source, destination)
+
+    async def scp_multiple(
+        self,
+        source: str | pathlib.Path,
+        destinations: Iterable[str],
+        *,
+        container: str | None = None,
+        host_key_checks: bool = True,
+        scp_options: Iterable[str] = (),
+        max_workers: int = 8,
+    ) -> dict[str, CLIError | None]:
+        """Securely transfer a local file (or directory) to multiple targets at once.
+
+        See :meth:`Juju.scp_multiple` for details.
+        """
+        args = _juju._scp_args(
+            container=container, host_key_checks=host_key_checks, scp_options=scp_options
+        )
+        source, destinations = _juju._scp_multiple_check(source, destinations)
+        if not destinations:
+            return {}
+
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def transfer(destination: str) -> CLIError | None:
+            async with semaphore:
+                try:
+                    await self._cli(*args, staged, destination)
+                except CLIError as exc:
+                    return exc
+                return None
+
+        with self._scp_staging(source, destinations[0]) as (staged, _):
+            tasks = [asyncio.ensure_future(transfer(d)) for d in destinations]
+            try:
+                results = await asyncio.gather(*tasks)
+            finally:
+                for task in tasks:
+                    task.cancel()
+                # Wait for cancelled transfers before the staged file is removed.
+                await asyncio.gather(*tasks, return_exceptions=True)
+        return dict(zip(destinations, results))
+
+    async def secrets(self, *, owner: str | None = None) -> list[Secret]:
+        """Get all secrets in the model.
+
+        See :meth:`Juju.secrets` for details.
+        """
+        args = ['secrets']
+        if owner is not None:
+            args.extend(['--owner', owner])
+        stdout = await self.cli(*args, '--format', 'json')
+        return _juju._secrets_from_output(stdout, loads=self.json_loads)
+
+    async def show_model(self, model: str | None = None) -> ModelInfo:
+        """Get information about the current model (or another model).
+
+        See :meth:`Juju.show_model` for details.
+        """
+        args = _juju._show_model_args(model if model is not None else self.model)
+        stdout = await self.cli(*args, include_model=False)
+        return _juju._model_info_from_output(stdout, loads=self.json_loads)
+
+    @overload
+    async def show_secret(
+        self,
+        identifier: str | SecretURI,
+        *,
+        reveal: Literal[True],
+        revision: int | None = None,
+        revisions: Literal[False] = False,
+    ) -> RevealedSecret: ...
+
+    @overload
+    async def show_secret(
+        self,
+        identifier: str | SecretURI,
+        *,
+        reveal: Literal[False] = False,
+        revision: int | None = None,
+        revisions: Literal[False] = False,
+    ) -> Secret: ...
+
+    @overload
+    async def show_secret(
+        self,
+        identifier: str | SecretURI,
+        *,
+        reveal: Literal[False] = False,
+        revision: None = None,
+        revisions: Literal[True],
+    ) -> Secret: ...
+
+    async def show_secret(
+        self,
+        identifier: str | SecretURI,
+        *,
+        reveal: bool = False,
+        revision: int | None = None,
+        revisions: bool = False,
+    ) -> Secret | RevealedSecret:
+        """Get the content of a secret.
+
+        See :meth:`Juju.show_secret` for details.
+        """
+        args = _juju._show_secret_args(
+            identifier, reveal=reveal, revision=revision, revisions=revisions
+        )
+        stdout = await self.cli(*args)
+        return _juju._secret_from_output(stdout, reveal=reveal, loads=self.json_loads)
+
+    async def ssh(
+        self,
+        target: str | int,
+        command: str,
+        *args: str,
+        container: str | None = None,
+        host_key_checks: bool = True,
+        ssh_options: Iterable[str] = (),
+        user: str | None = None,
+    ) -> str:
+        """Executes a command using SSH on a machine or container and returns its standard output.
+
+        See :meth:`Juju.ssh` for details.
+        """
+        cli_args = _juju._ssh_args(
+            target,
+            command,
+            args,
+            container=container,
+            host_key_checks=host_key_checks,
+            ssh_options=ssh_options,
+            user=user,
+        )
+        return await self.cli(*cli_args)
+
+    async def status(self, *apps: str) -> Status:
+        """Fetch the status of the current model, including its applications and units.
+
+        See :meth:`Juju.status` for details.
+        """
+        stdout = await self.cli(*_juju._status_args(apps))
+        return Status._from_dict(self.json_loads(stdout))
+
+    async def status_raw(self, *apps: str) -> dict[str, Any]:
+        """Fetch the status of the current model as the dict decoded from ``juju status`` JSON.
+
+        See :meth:`Juju.status_raw` for details.
+        """
+        stdout = await self.cli(*_juju._status_args(apps))
+        return self.json_loads(stdout)
+
+    async def trust(
+        self, app: str, *, remove: bool = False, scope: Literal['cluster'] | None = None
+    ) -> None:
+        """Set the trust status of a deployed application.
+
+        See :meth:`Juju.trust` for details.
+        """
+        args = _juju._trust_args(app, remove=remove, scope=scope)
+        await self.cli(*args)
+
+    async def update_secret(
+        self,
+        identifier: str | SecretURI,
+        content: Mapping[str, str],
+        *,
+        info: str | None = None,
+        name: str | None = None,
+        auto_prune: bool = False,
+    ) -> None:
+        """Update the content of a secret.
+
+        See :meth:`Juju.update_secret` for details.
+        """
+        args = _juju._update_secret_args(identifier, info=info, name=name, auto_prune=auto_prune)
+        with tempfile.NamedTemporaryFile('w+', dir=self._temp_dir) as file:
+            _yaml.safe_dump(content, file)
+            file.flush()
+            args.extend(['--file', file.name])
+            await self.cli(*args)
+
+    async def version(self) -> Version:
+        """Return the parsed Juju CLI version.
+
+        See :meth:`Juju.version` for details.
+        """
+        stdout = await self.cli(*_juju._VERSION_ARGS, include_model=False)
+        return Version._from_dict(self.json_loads(stdout))
+
+    @overload
+    async def wait(
+        self,
+        ready: Callable[[Status], bool],
+        *,
+        error: Callable[[Status], bool] | None = None,
+        delay: float = 1.0,
+        timeout: float | None = None,
+        successes: int = 3,
+        backoff: Backoff | None = None,
+        debug_log_interval: float | None = None,
+        apps: Iterable[str] = (),
+        raw: Literal[False] = False,
+    ) -> Status: ...
+
+    @overload
+    async def wait(
+        self,
+        ready: Callable[[dict[str, Any]], bool],
+        *,
+        error: Callable[[dict[str, Any]], bool] | None = None,
+        delay: float = 1.0,
+        timeout: float | None = None,
+        successes: int = 3,
+        backoff: Backoff | None = None,
+        debug_log_interval: float | None = None,
+        apps: Iterable[str] = (),
+        raw: Literal[True],
+    ) -> dict[str, Any]: ...
+
+    async def wait(
+        self,
+        ready: Callable[[Any], bool],
+        *,
+        error: Callable[[Any], bool] | None = None,
+        delay: float = 1.0,
+        timeout: float | None = None,
+        successes: int = 3,
+        backoff: Backoff | None = None,
+        debug_log_interval: float | None = None,
+        apps: Iterable[str] = (),
+        raw: bool = False,
+    ) -> Any:
+        """Wait until ``ready(status)`` returns ``True``.
+
+        While waiting, other tasks on the event loop continue to run. See :meth:`Juju.wait` for
+        details.
+        """
+        if timeout is None:
+            timeout = self.wait_timeout
+        # Need this check because str is also an iterable of str.
+        if isinstance(apps, str):
+            raise TypeError('apps must be an iterable of str, not str')
+        status_args = _juju._status_args(apps)
+
+        waiter = _juju._Waiter(
+            ready,
+            error=error,
+            successes=successes,
+            delay=delay,
+            backoff=backoff,
+            loads=self.json_loads,
+            raw=raw,
+        )
+        watcher = None
+        if debug_log_interval is not None:
+            args = self._cli_args(_juju._HOOK_LOG_ARGS, include_model=True, log=True)
+            watcher = await _LogWatcher.start(args)
+        start = time.monotonic()
+
+        try:
+            while time.monotonic() - start < timeout:
+                stdout, _ = await self._cli(*status_args, log=False)
+                status = waiter.update(stdout)
+                if status is not None:
+                    return status
+
+                if watcher is None or not waiter.idle:
+                    await asyncio.sleep(waiter.next_delay())
+                    continue
+
+                assert debug_log_interval is not None
+                idle_start = time.monotonic()
+                while (
+                    time.monotonic() - idle_start < debug_log_interval
+                    and time.monotonic() - start < timeout
+                ):
+                    await asyncio.sleep(delay)
+                    if watcher.activity():
+                        break
+        finally:
+            if watcher is not None:
+                await watcher.close()
+
+        raise waiter.timeout_error(timeout)
+
+    async def wait_tasks(
+        self,
+        handles: Iterable[TaskHandle],
+        *,
+        delay: float = 1.0,
+        max_delay: float = 10.0,
+        timeout: float | None = None,
+    ) -> list[Task]:
+        """Wait for background tasks to finish and return their results.
+
+        The pending tasks are polled concurrently. See :meth:`Juju.wait_tasks` for details.
+        """
+        if timeout is None:
+            timeout = self.wait_timeout
+
+        poller = _juju._TaskPoller(
+            handles, delay=delay, max_delay=max_delay, loads=self.json_loads
+        )
+        start = time.monotonic()
+
+        async def poll(handle: TaskHandle) -> None:
+            stdout, _ = await self._cli('show-task', handle.id, '--format', 'json', log=False)
+            poller.update(handle, stdout)
+
+        while time.monotonic() - start < timeout:
+            await asyncio.gather(*(poll(handle) for handle in poller.pending()))
+            if not poller.pending():
+                return poller.results()
+
+            await asyncio.sleep(poller.next_delay())
+
+        raise poller.timeout_error(timeout)
+
+
+class _LogWatcher:
+    """Follows "juju debug-log" in a background task, noting when hooks run.
+
+    This is the asyncio version of :class:`jubilant._juju._LogWatcher`.
+    """
+
+    def __init__(self, process: asyncio.subprocess.Process):
+        self._process = process
+        self._activity = False
+        self._reader = asyncio.ensure_future(self._read())
+
+    @classmethod
+    async def start(cls, args: list[str]) -> _LogWatcher:
+        process = await asyncio.create_subprocess_exec(
+            *args, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+        return cls(process)
+
+    async def _read(self) -> None:
+        assert self._process.stdout is not None
+        while await self._process.stdout.readline():
+            self._activity = True
+
+    def activity(self) -> bool:
+        """Report whether a hook has run since the last call."""
+        activity, self._activity = self._activity, False
+        return activity
+
+    async def close(self) -> None:
+        """Stop following the log."""
+        self._reader.cancel()
+        with contextlib.suppress(ProcessLookupError):  # process may have already exited
+            self._process.terminate()
+        try:
+            await asyncio.wait_for(self._process.wait(), 5)
+        except asyncio.TimeoutError:
+            self._process.kill()
+            await self._process.wait()
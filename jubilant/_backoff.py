@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import dataclasses
+import random
+
+
+@dataclasses.dataclass(frozen=True)
+class Backoff:
+    """Exponential backoff policy for the delay between polls.
+
+    The delay starts at *initial* seconds and is multiplied by *factor* after each poll where
+    nothing changed, up to *maximum* seconds. When something changes, it's reset to *initial*,
+    so polling is fast right after a change and slows down while things are stable.
+
+    For example, to poll every second after a status change, backing off to every 30 seconds
+    while the model is stable::
+
+        juju.wait(jubilant.all_active, backoff=jubilant.Backoff(initial=1, maximum=30))
+
+    To implement a different policy, subclass and override :meth:`delay`.
+    """
+
+    initial: float = 1.0
+    """Delay in seconds after a change (and before the second poll)."""
+
+    maximum: float = 10.0
+    """Maximum delay in seconds."""
+
+    factor: float = 2.0
+    """Multiplier applied to the delay after each poll where nothing changed."""
+
+    jitter: float = 0.0
+    """Fraction of the delay to randomly add or subtract, for example ``0.1`` for ±10%.
+
+    Jitter avoids many clients polling a controller in lockstep.
+    """
+
+    def delay(self, unchanged: int) -> float:
+        """Return the delay in seconds before the next poll.
+
+        Args:
+            unchanged: Number of polls in a row where nothing changed (0 right after a change).
+        """
+        try:
+            delay = min(self.initial * self.factor**unchanged, self.maximum)
+        except OverflowError:
+            delay = self.maximum
+        if self.jitter:
+            delay *= 1 + random.uniform(-self.jitter, self.jitter)  # noqa: S311
+        return delay
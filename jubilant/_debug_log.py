@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import collections
+import dataclasses
+import re
+import subprocess
+import tempfile
+import threading
+from collections.abc import Iterable, Iterator
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ._juju import Juju
+
+# For example: "unit-mysql-0: 12:34:56 INFO juju.worker.uniter.operation ran "start" hook"
+# (with "2006-01-02 " before the time if --date is used, and ".000" after it with --ms).
+_LINE_RE = re.compile(
+    r'(?P<entity>\S+): '
+    r'(?P<timestamp>(?:\d{4}-\d{2}-\d{2} )?\d{2}:\d{2}:\d{2}(?:\.\d+)?) '
+    r'(?P<level>[A-Z]+) '
+    r'(?P<module>\S+) ?'
+    r'(?P<message>.*)'
+)
+
+
+@dataclasses.dataclass(frozen=True)
+class DebugLogRecord:
+    """A single record from the debug log, as yielded by :meth:`Juju.debug_log_stream`."""
+
+    entity: str
+    """Entity that logged the record, for example ``unit-mysql-0`` or ``machine-0``."""
+
+    timestamp: str
+    """Time of the record as printed by Juju, for example ``12:34:56``."""
+
+    level: str
+    """Log level, for example ``INFO`` or ``ERROR``."""
+
+    module: str
+    """Module that logged the record, for example ``juju.worker.uniter.operation``."""
+
+    message: str
+    """The log message itself."""
+
+    def __str__(self) -> str:
+        if not self.entity:
+            return self.message
+        return f'{self.entity}: {self.timestamp} {self.level} {self.module} {self.message}'
+
+    @classmethod
+    def _from_line(cls, line: str) -> DebugLogRecord:
+        match = _LINE_RE.fullmatch(line)
+        if match is None:
+            # Continuation of a multi-line message, or a line Juju didn't format as a record.
+            return cls(entity='', timestamp='', level='', module='', message=line)
+        return cls(**match.groupdict())
+
+
+class DebugLogBuffer:
+    """Follows a model's debug log in a background thread, keeping the most recent records.
+
+    Memory use is bounded: only the last *maxlen* records are kept. This is useful for showing
+    the log leading up to a test failure without fetching the whole log.
+
+    For example, to create a pytest fixture which shows the last 1000 log lines if any tests
+    fail::
+
+        @pytest.fixture(scope='module')
+        def juju(request: pytest.FixtureRequest):
+            with jubilant.temp_model() as juju:
+                with jubilant.DebugLogBuffer(juju, maxlen=1000) as log:
+                    yield juju  # run the test
+                    if request.session.testsfailed:
+                        print(log.text(), end='')
+
+    Args:
+        juju: The :class:`Juju` instance for the model to follow.
+        maxlen: Maximum number of records to keep.
+        include: Only include records from these entities (for example ``mysql/0``).
+        exclude: Exclude records from these entities.
+        include_module: Only include records from these modules.
+        exclude_module: Exclude records from these modules.
+        level: Only include records at this level or above, for example ``WARNING``.
+        replay: If true, start from the beginning of the log instead of from the last *maxlen*
+            records.
+    """
+
+    def __init__(
+        self,
+        juju: Juju,
+        maxlen: int = 1000,
+        *,
+        include: Iterable[str] = (),
+        exclude: Iterable[str] = (),
+        include_module: Iterable[str] = (),
+        exclude_module: Iterable[str] = (),
+        level: str | None = None,
+        replay: bool = False,
+    ):
+        self._records: collections.deque[DebugLogRecord] = collections.deque(maxlen=maxlen)
+        args = debug_log_stream_args(
+            include=include,
+            exclude=exclude,
+            include_module=include_module,
+            exclude_module=exclude_module,
+            level=level,
+            replay=replay,
+            lines=maxlen,
+            tail=True,
+        )
+        self._process = DebugLogProcess(juju._cli_args(args, include_model=True, log=True))
+        self._thread = threading.Thread(target=self._read, daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> DebugLogBuffer:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def records(self) -> list[DebugLogRecord]:
+        """Return the most recent records, oldest first."""
+        # Copying a deque is atomic, so this is safe while the reader thread appends to it.
+        return list(self._records)
+
+    def text(self) -> str:
+        """Return the most recent records as log lines, oldest first."""
+        return ''.join(f'{record}\n' for record in self.records())
+
+    def close(self) -> None:
+        """Stop following the log. The records collected so far are kept."""
+        self._process.stop()
+        self._thread.join()
+        self._process.close()
+
+    def _read(self) -> None:
+        for line in self._process.lines():
+            self._records.append(DebugLogRecord._from_line(line))
+
+
+class DebugLogProcess:
+    """A "juju debug-log" process whose output is read line by line."""
+
+    def __init__(self, args: list[str]):
+        self.args = args
+        # Send stderr to a file rather than a pipe, as a pipe that's only read at the end could
+        # fill up and block the process (which, with --tail, may run indefinitely).
+        self._stderr = tempfile.TemporaryFile('w+', encoding='utf-8')  # noqa: SIM115
+        try:
+            self._process = subprocess.Popen(
+                args, stdout=subprocess.PIPE, stderr=self._stderr, encoding='utf-8'
+            )
+        except BaseException:
+            self._stderr.close()
+            raise
+
+    def lines(self) -> Iterator[str]:
+        """Yield lines of output (without the newline) until the process exits."""
+        assert self._process.stdout is not None
+        for line in self._process.stdout:
+            yield line.rstrip('\n')
+
+    def stderr(self) -> str:
+        """Wait for the process to exit, and return its standard error."""
+        self._process.wait()
+        self._stderr.seek(0)
+        return self._stderr.read()
+
+    @property
+    def returncode(self) -> int | None:
+        return self._process.returncode
+
+    def stop(self) -> None:
+        """Stop the process, if it's still running, which ends :meth:`lines`."""
+        if self._process.poll() is None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+                self._process.wait()
+
+    def close(self) -> None:
+        """Stop the process and close its output streams."""
+        self.stop()
+        if self._process.stdout is not None:
+            self._process.stdout.close()
+        self._stderr.close()
+
+
+def debug_log_stream_args(
+    *,
+    include: Iterable[str],
+    exclude: Iterable[str],
+    include_module: Iterable[str],
+    exclude_module: Iterable[str],
+    level: str | None,
+    replay: bool,
+    lines: int | None,
+    tail: bool,
+) -> tuple[str, ...]:
+    """Return the "juju debug-log" arguments for the given filters."""
+    args = ['debug-log', '--tail' if tail else '--no-tail']
+    if replay:
+        args.append('--replay')
+    elif lines is not None:
+        args.extend(['--lines', str(lines)])
+    if level is not None:
+        args.extend(['--level', level])
+    for entity in include:
+        args.extend(['--include', entity])
+    for entity in exclude:
+        args.extend(['--exclude', entity])
+    for module in include_module:
+        args.extend(['--include-module', module])
+    for module in exclude_module:
+        args.extend(['--exclude-module', module])
+    return tuple(args)
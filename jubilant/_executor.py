@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import functools
+import subprocess
+import threading
+from typing import Protocol
+
+from ._runner import Runner
+
+
+class CLIError(subprocess.CalledProcessError):
+    """Subclass of ``CalledProcessError`` that includes stdout and stderr in the ``__str__``."""
+
+    def __str__(self) -> str:
+        s = super().__str__()
+        if self.stdout:
+            s += '\nStdout:\n' + self.stdout
+        if self.stderr:
+            s += '\nStderr:\n' + self.stderr
+        return s
+
+
+class Executor(Protocol):
+    """Protocol for scheduling Juju CLI commands, for example to limit how many run at once.
+
+    Pass an object that implements this to :class:`Juju` (or :class:`AsyncJuju`) as *executor*,
+    and every CLI command will be submitted to it. An executor can be shared by several
+    :class:`Juju` instances, for example all the models on one controller, so that they share
+    one concurrency limit.
+
+    It's also a convenient place to fake the Juju CLI in unit tests.
+    """
+
+    def submit(
+        self, args: list[str], *, stdin: str | None, timeout: float | None
+    ) -> concurrent.futures.Future[tuple[str, str]]:
+        """Schedule a command to be run.
+
+        Args:
+            args: Full command line, including the Juju binary, for example
+                ``['juju', 'status', '--format', 'json']``.
+            stdin: Standard input to send to the command.
+            timeout: Timeout in seconds for the command.
+
+        Returns:
+            Future that resolves to the command's ``(stdout, stderr)``, or raises
+            :class:`CLIError` if the command fails, or :class:`subprocess.TimeoutExpired` if the
+            *timeout* is reached.
+        """
+        ...
+
+
+class SerialExecutor:
+    """Executor that runs each command immediately, in the thread that submits it.
+
+    This is what :class:`Juju` does if no executor is specified.
+
+    Args:
+        runner: Used to run each command; if not specified, uses :func:`subprocess.run`.
+    """
+
+    def __init__(self, runner: Runner | None = None):
+        self._runner = runner
+
+    def submit(
+        self, args: list[str], *, stdin: str | None, timeout: float | None
+    ) -> concurrent.futures.Future[tuple[str, str]]:
+        """Run a command and return a future that's already done."""
+        future: concurrent.futures.Future[tuple[str, str]] = concurrent.futures.Future()
+        try:
+            future.set_result(_run_cli(args, stdin=stdin, timeout=timeout, runner=self._runner))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
+class ThreadExecutor:
+    """Executor that runs commands in a pool of threads, at most *max_workers* at a time.
+
+    Call :meth:`close` (or use as a context manager) to shut down the threads.
+
+    Example::
+
+        with jubilant.ThreadExecutor(max_workers=4) as executor:
+            jujus = [jubilant.Juju(model=model, executor=executor) for model in models]
+            ...
+
+    Args:
+        max_workers: Maximum number of commands to run at once.
+        runner: Used to run each command; if not specified, uses :func:`subprocess.run`.
+    """
+
+    def __init__(self, max_workers: int = 8, *, runner: Runner | None = None):
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers)
+        self._runner = runner
+
+    def __enter__(self) -> ThreadExecutor:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def submit(
+        self, args: list[str], *, stdin: str | None, timeout: float | None
+    ) -> concurrent.futures.Future[tuple[str, str]]:
+        """Schedule a command to be run in the thread pool."""
+        return self._pool.submit(_run_cli, args, stdin=stdin, timeout=timeout, runner=self._runner)
+
+    def close(self) -> None:
+        """Wait for running commands to finish, and shut down the threads."""
+        self._pool.shutdown()
+
+
+class AsyncioExecutor:
+    """Executor that runs commands as asyncio subprocesses, at most *max_concurrent* at a time.
+
+    The commands are run by an event loop in a single background thread, so many commands can
+    run at once without a thread per command. Call :meth:`close` (or use as a context manager)
+    to stop the event loop.
+
+    Args:
+        max_concurrent: Maximum number of commands to run at once.
+    """
+
+    def __init__(self, max_concurrent: int = 32):
+        self._max_concurrent = max_concurrent
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        self._semaphore: asyncio.Semaphore | None = None
+
+    def __enter__(self) -> AsyncioExecutor:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def submit(
+        self, args: list[str], *, stdin: str | None, timeout: float | None
+    ) -> concurrent.futures.Future[tuple[str, str]]:
+        """Schedule a command to be run on the event loop."""
+        return asyncio.run_coroutine_threadsafe(self._run(args, stdin, timeout), self._loop)
+
+    def close(self) -> None:
+        """Stop the event loop. Commands that are still running are cancelled."""
+        if self._loop.is_closed():
+            return
+
+        async def cancel_all():
+            tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        asyncio.run_coroutine_threadsafe(cancel_all(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    async def _run(
+        self, args: list[str], stdin: str | None, timeout: float | None
+    ) -> tuple[str, str]:
+        if self._semaphore is None:
+            # Create this on the loop's thread, as Python 3.8 and 3.9 bind it to the current loop.
+            self._semaphore = asyncio.Semaphore(self._max_concurrent)
+        async with self._semaphore:
+            return await _run_cli_async(args, stdin=stdin, timeout=timeout)
+
+
+def _run_cli(
+    args: list[str], *, stdin: str | None, timeout: float | None, runner: Runner | None
+) -> tuple[str, str]:
+    """Run a Juju CLI command and return its standard output and standard error."""
+    if runner is not None:
+        process = runner.run(args, stdin=stdin, timeout=timeout)
+        if process.returncode:
+            raise CLIError(process.returncode, args, process.stdout, process.stderr)
+        return (process.stdout, process.stderr)
+    try:
+        process = subprocess.run(
+            args,
+            check=True,
+            capture_output=True,
+            encoding='utf-8',
+            input=stdin,
+            timeout=timeout,
+        )
+    except subprocess.CalledProcessError as e:
+        raise CLIError(e.returncode, e.cmd, e.stdout, e.stderr) from None
+    return (process.stdout, process.stderr)
+
+
+async def _run_cli_async(
+    args: list[str], *, stdin: str | None, timeout: float | None, runner: Runner | None = None
+) -> tuple[str, str]:
+    """Run a Juju CLI command with asyncio and return its standard output and standard error."""
+    if runner is not None:
+        # Runners are synchronous, so run in a thread to keep the event loop responsive.
+        run = functools.partial(_run_cli, args, stdin=stdin, timeout=timeout, runner=runner)
+        return await asyncio.get_running_loop().run_in_executor(None, run)
+
+    process = await asyncio.create_subprocess_exec(
+        *args,
+        stdin=subprocess.PIPE if stdin is not None else None,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    input = stdin.encode('utf-8') if stdin is not None else None
+    try:
+        communicate = process.communicate(input)
+        stdout_bytes, stderr_bytes = await asyncio.wait_for(communicate, timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        stdout_bytes, stderr_bytes = await process.communicate()
+        raise subprocess.TimeoutExpired(args, timeout or 0, stdout_bytes, stderr_bytes) from None
+    except BaseException:
+        # Cancelled (or otherwise interrupted): don't leave the process running or unreaped.
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        raise
+    stdout = stdout_bytes.decode('utf-8')
+    stderr = stderr_bytes.decode('utf-8')
+    if process.returncode:
+        raise CLIError(process.returncode, args, stdout, stderr)
+    return (stdout, stderr)
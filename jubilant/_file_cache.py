@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any
+
+from ._files import copy_file, reflink
+
+logger = logging.getLogger('jubilant')
+
+# Don't evict files used this recently, as a command may be about to read them.
+_EVICT_GRACE = 60.0
+
+
+class FileCache:
+    """Content-addressed cache of local files, so repeated copies of the same file are free.
+
+    Each file is stored once, named by the SHA-256 hash of its content. Looking up a source
+    file by its path, size, and modification time avoids hashing it again if it hasn't changed.
+    On a miss, the file is reflinked (copy-on-write) or hard-linked into the cache if the
+    filesystem supports it, and copied otherwise.
+
+    When the cache grows beyond *max_bytes*, the least recently used files are removed.
+
+    Args:
+        directory: Directory to store the cached files and the index in.
+        max_bytes: Approximate maximum total size of the cached files.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 2 * 1024**3):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._index_path = os.path.join(directory, 'index.json')
+        self._lock = threading.Lock()
+
+    def get(self, path: str) -> str:
+        """Return the path of a cached copy of the file at *path*, adding it if needed.
+
+        The cached copy must not be modified.
+        """
+        st = os.stat(path)
+        key = f'{os.path.abspath(path)}:{st.st_size}:{st.st_mtime_ns}'
+        with self._lock:
+            index = self._load_index()
+            digest = index['sources'].get(key)
+            if digest is not None and self._is_valid(digest, index['files'].get(digest)):
+                index['files'][digest]['used'] = time.time()
+                self._save_index(index)
+                return self._path(digest, index['files'][digest]['suffix'])
+
+        # Hash and store the file without holding the lock, as this can take a while.
+        digest = _hash_file(path)
+        suffix = os.path.splitext(path)[1]
+        cached = self._path(digest, suffix)
+        with self._lock:
+            index = self._load_index()
+            entry = index['files'].get(digest)
+            valid = self._is_valid(digest, entry)
+        if not valid:
+            _store_file(path, cached)
+            cached_st = os.stat(cached)
+            entry: dict[str, Any] = {
+                'suffix': suffix,
+                'size': cached_st.st_size,
+                'mtime_ns': cached_st.st_mtime_ns,
+            }
+        assert entry is not None
+
+        with self._lock:
+            index = self._load_index()
+            entry['used'] = time.time()
+            index['files'][digest] = entry
+            index['sources'][key] = digest
+            self._evict(index, keep=digest)
+            self._save_index(index)
+        return cached
+
+    def _path(self, digest: str, suffix: str) -> str:
+        return os.path.join(self.directory, digest + suffix)
+
+    def _is_valid(self, digest: str, entry: dict[str, Any] | None) -> bool:
+        """Report whether the cached file for *entry* exists and hasn't been changed."""
+        if entry is None:
+            return False
+        try:
+            st = os.stat(self._path(digest, entry['suffix']))
+        except OSError:
+            return False
+        # A hard-linked file could be changed in place through its original path.
+        return st.st_size == entry['size'] and st.st_mtime_ns == entry['mtime_ns']
+
+    def _evict(self, index: dict[str, Any], *, keep: str) -> None:
+        files: dict[str, dict[str, Any]] = index['files']
+        total = sum(entry['size'] for entry in files.values())
+        now = time.time()
+        for digest in sorted(files, key=lambda d: files[d]['used']):
+            if total <= self.max_bytes:
+                break
+            entry = files[digest]
+            if digest == keep or now - entry['used'] < _EVICT_GRACE:
+                continue
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(self._path(digest, entry['suffix']))
+            total -= entry['size']
+            del files[digest]
+        index['sources'] = {k: d for k, d in index['sources'].items() if d in files}
+
+    def _load_index(self) -> dict[str, Any]:
+        try:
+            with open(self._index_path) as f:
+                index = json.load(f)
+        except FileNotFoundError:
+            index = None
+        except (OSError, ValueError) as e:
+            logger.warning('ignoring invalid file cache index %s: %s', self._index_path, e)
+            index = None
+        if not isinstance(index, dict) or 'files' not in index or 'sources' not in index:
+            return {'files': {}, 'sources': {}}
+        return index  # type: ignore
+
+    def _save_index(self, index: dict[str, Any]) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        # Write and rename, so other processes never see a partially-written index.
+        temp = f'{self._index_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(temp, 'w') as f:
+            json.dump(index, f)
+        os.replace(temp, self._index_path)
+
+
+def _hash_file(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while chunk := f.read(1024 * 1024):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _store_file(source: str, destination: str) -> None:
+    """Reflink, hard-link, or copy *source* to *destination*, atomically."""
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    temp = f'{destination}.{os.getpid()}.{threading.get_ident()}.tmp'
+    try:
+        if not reflink(source, temp):
+            try:
+                os.link(source, temp)
+            except OSError:
+                copy_file(source, temp)
+        os.replace(temp, destination)
+    finally:
+        if os.path.exists(temp):
+            os.remove(temp)
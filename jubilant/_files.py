@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import os
+import shutil
+
+# ioctl request to clone a file's extents (copy-on-write), from <linux/fs.h>.
+_FICLONE = 0x40049409
+
+
+def reflink(source: str, destination: str) -> bool:
+    """Make *destination* a copy-on-write clone of *source*, and report whether that worked."""
+    try:
+        import fcntl
+    except ImportError:  # Not on Unix
+        return False
+    with open(source, 'rb') as src, open(destination, 'wb') as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+            return True
+        except OSError:
+            pass
+    os.remove(destination)
+    return False
+
+
+def copy_file(source: str, destination: str) -> None:
+    """Copy *source* to *destination*, in the kernel if possible, including permission bits."""
+    if not _copy_file_range(source, destination):
+        shutil.copyfile(source, destination)
+    shutil.copymode(source, destination)
+
+
+def stage_file(source: str, destination: str) -> None:
+    """Make *source* available at *destination*, as cheaply as possible.
+
+    Try a hard link first (no copying at all), then a reflink, then an in-kernel copy, and
+    finally a regular copy. As *destination* may be a hard link, it must not be modified.
+    """
+    try:
+        os.link(source, destination)
+        return
+    except OSError:
+        pass
+    if reflink(source, destination):
+        shutil.copymode(source, destination)
+        return
+    copy_file(source, destination)
+
+
+def stage_tree(source: str, destination: str) -> None:
+    """Like :func:`stage_file`, but for a directory tree."""
+    shutil.copytree(source, destination, copy_function=stage_file)
+
+
+def move(source: str, destination: str) -> None:
+    """Move a file or directory tree, renaming if possible rather than copying."""
+    try:
+        os.replace(source, destination)
+        return
+    except OSError:
+        # Different filesystems, or replacing a non-empty directory.
+        pass
+    if os.path.isdir(source):
+        shutil.copytree(source, destination, copy_function=copy_file, dirs_exist_ok=True)
+        shutil.rmtree(source)
+    else:
+        copy_file(source, destination)
+        os.remove(source)
+
+
+def _copy_file_range(source: str, destination: str) -> bool:
+    """Copy a file with os.copy_file_range, and report whether that worked."""
+    copy_file_range = getattr(os, 'copy_file_range', None)  # Linux and Python 3.8+ only
+    if copy_file_range is None:
+        return False
+    with open(source, 'rb') as src, open(destination, 'wb') as dst:
+        remaining = os.fstat(src.fileno()).st_size
+        try:
+            while remaining > 0:
+                copied = copy_file_range(src.fileno(), dst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+        except OSError:
+            # Not supported by this kernel or filesystem (or across filesystems).
+            return False
+    return remaining == 0
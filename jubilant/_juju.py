@@ -1,42 +1,38 @@
 from __future__ import annotations
 
+import concurrent.futures
 import contextlib
 import functools
-import json
 import logging
 import os
 import pathlib
+import re
 import shlex
 import shutil
 import subprocess
 import tempfile
+import threading
 import time
 from collections.abc import Callable, Iterable, Mapping
 from typing import Any, Generator, Literal, Union, overload
 
-from . import _pretty, _yaml
-from ._task import Task
+from . import _files, _json, _pretty, _yaml
+from ._backoff import Backoff
+from ._debug_log import DebugLogProcess, DebugLogRecord, debug_log_stream_args
+from ._executor import CLIError, Executor, _run_cli
+from ._file_cache import FileCache
+from ._limiter import limiter_for_model
+from ._runner import Runner
+from ._task import Task, TaskHandle
 from ._version import Version
 from .modeltypes import ModelInfo
 from .secrettypes import RevealedSecret, Secret, SecretURI
-from .statustypes import Status
+from .statustypes import Status, _StatusCache
 
 logger = logging.getLogger('jubilant')
 logger_wait = logging.getLogger('jubilant.wait')
 
 
-class CLIError(subprocess.CalledProcessError):
-    """Subclass of ``CalledProcessError`` that includes stdout and stderr in the ``__str__``."""
-
-    def __str__(self) -> str:
-        s = super().__str__()
-        if self.stdout:
-            s += '\nStdout:\n' + self.stdout
-        if self.stderr:
-            s += '\nStderr:\n' + self.stderr
-        return s
-
-
 class WaitError(Exception):
     """Raised when :meth:`Juju.wait`'s *error* callable returns ``True``."""
 
@@ -48,7 +44,141 @@ ConstraintValue = Union[bool, int, float, str]
 """The possible types a constraint value can be (model, bootstrap or deployment constraint)."""
 
 
-class Juju:
+class _BaseJuju:
+    """State and helpers shared by :class:`Juju` and :class:`AsyncJuju`."""
+
+    def __init__(
+        self,
+        *,
+        model: str | None = None,
+        wait_timeout: float = 3 * 60.0,
+        cli_binary: str | pathlib.Path | None = None,
+        json_loads: Callable[[str], Any] | None = None,
+        runner: Runner | None = None,
+        executor: Executor | None = None,
+    ):
+        self.model = model
+        self.wait_timeout = wait_timeout
+        self.cli_binary = str(cli_binary or 'juju')
+        self.json_loads = json_loads or _json.loads
+        self.runner = runner
+        self.executor = executor
+
+    def __repr__(self) -> str:
+        args = [
+            f'model={self.model!r}',
+            f'wait_timeout={self.wait_timeout}',
+            f'cli_binary={self.cli_binary!r}',
+        ]
+        return f'{self.__class__.__name__}({", ".join(args)})'
+
+    def _cli_args(self, args: tuple[str, ...], *, include_model: bool, log: bool) -> list[str]:
+        """Return the full command line (including the Juju binary) for a CLI command."""
+        if include_model and self.model is not None:
+            args = (args[0], '--model', self.model, *args[1:])
+        if log:
+            logger.info('cli: juju %s', shlex.join(args))
+        return [self.cli_binary, *args]
+
+    @functools.cached_property
+    def _juju_is_snap(self) -> bool:
+        which = shutil.which(self.cli_binary)
+        return which is not None and '/snap/' in which
+
+    @functools.cached_property
+    def _temp_dir(self) -> str:
+        if self._juju_is_snap:
+            # If Juju is running as a snap, we can't use /tmp, so put temp files here instead.
+            temp_dir = os.path.expanduser('~/snap/juju/common')
+            os.makedirs(temp_dir, exist_ok=True)
+            return temp_dir
+        else:
+            return tempfile.gettempdir()
+
+    @functools.cached_property
+    def _file_cache(self) -> FileCache:
+        return FileCache(os.path.join(self._temp_dir, 'jubilant-cache'))
+
+    # This context manager is for deploy() and refresh(), and automatically copies
+    # a local charm file and local resource files into a cache directory if Juju
+    # is running as a snap (in which case /tmp is not accessible). The cache is
+    # content-addressed, so deploying the same file again doesn't copy it again.
+    @contextlib.contextmanager
+    def _deploy_tempdir(
+        self,
+        charm: str | pathlib.Path | None,
+        resources: Mapping[str, str] | None,
+    ) -> Generator[tuple[str | None, Mapping[str, str] | None]]:
+        if charm is not None:
+            charm = str(charm)
+        charm_needs_temp = charm is not None and charm.startswith(('.', '/'))
+        resources_needs_temp = resources is not None and any(
+            v.startswith(('.', '/')) for v in resources.values()
+        )
+        needs_temp = self._juju_is_snap and (charm_needs_temp or resources_needs_temp)
+        if not needs_temp:
+            yield charm, resources
+            return
+
+        if charm_needs_temp:
+            assert charm is not None
+            charm = self._file_cache.get(charm)
+
+        if resources_needs_temp:
+            assert resources is not None
+            resources = {
+                k: self._file_cache.get(v) if v.startswith(('.', '/')) else v
+                for k, v in resources.items()
+            }
+
+        yield charm, resources
+
+    # This context manager is for run(), and writes the action parameters (if any) to a
+    # temporary YAML file, yielding the CLI arguments that pass that file to Juju.
+    @contextlib.contextmanager
+    def _params_file(self, params: Mapping[str, Any] | None) -> Generator[list[str]]:
+        if params is None:
+            yield []
+            return
+
+        with tempfile.NamedTemporaryFile('w+', dir=self._temp_dir) as params_file:
+            _yaml.safe_dump(params, params_file)
+            params_file.flush()
+            yield ['--params', params_file.name]
+
+    # This context manager is for scp(), and stages the local file or directory in a
+    # temporary directory if Juju is running as a snap (in which case /tmp and most of
+    # $HOME are not accessible). A local source is hard-linked there if possible, and
+    # a local destination is moved (renamed, if possible) from there after the transfer.
+    @contextlib.contextmanager
+    def _scp_staging(self, source: str, destination: str) -> Generator[tuple[str, str]]:
+        temp_needed = (':' not in source) != (':' not in destination) and self._juju_is_snap
+        if not temp_needed:
+            # Simple cases: juju not snap, or local->local, or remote->remote
+            yield source, destination
+            return
+
+        with tempfile.TemporaryDirectory(dir=self._temp_dir) as temp_dir:
+            if ':' not in source:
+                # Local source, remote destination. Keep the same name, in case the
+                # destination is a directory.
+                staged = os.path.join(temp_dir, os.path.basename(os.path.abspath(source)))
+                if os.path.isdir(source):
+                    _files.stage_tree(source, staged)
+                else:
+                    _files.stage_file(source, staged)
+                yield staged, destination
+            else:
+                # Remote source, local destination
+                name = os.path.basename(source.partition(':')[2].rstrip('/')) or 'scp'
+                staged = os.path.join(temp_dir, name)
+                yield source, staged
+                if os.path.isdir(destination):
+                    destination = os.path.join(destination, name)
+                _files.move(staged, destination)
+
+
+class Juju(_BaseJuju):
     """Instantiate this class to run Juju commands.
 
     Most methods directly call a single Juju CLI command. If a CLI command doesn't yet exist as a
@@ -66,6 +196,14 @@ class Juju:
             parameter is not specified.
         cli_binary: Path to the Juju CLI binary. If not specified, uses ``juju`` and assumes it is
             in the PATH.
+        json_loads: Function used to decode the JSON output of Juju commands. If not specified,
+            uses ``orjson.loads`` or ``msgspec.json.decode`` if one of those is installed, as
+            they're several times faster than :func:`json.loads` (which is used otherwise).
+        runner: Object used to run Juju CLI commands, such as a :class:`WorkerRunner`. If not
+            specified, each command is run in a new ``juju`` process.
+        executor: Object that schedules Juju CLI commands, such as a :class:`ThreadExecutor`
+            shared with other instances. If specified, *runner* is not used (the executor
+            has its own). If not specified, each command is run when it's called.
     """
 
     model: str | None
@@ -83,24 +221,14 @@ class Juju:
     cli_binary: str
     """Path to the Juju CLI binary. If None, uses ``juju`` and assumes it is in the PATH."""
 
-    def __init__(
-        self,
-        *,
-        model: str | None = None,
-        wait_timeout: float = 3 * 60.0,
-        cli_binary: str | pathlib.Path | None = None,
-    ):
-        self.model = model
-        self.wait_timeout = wait_timeout
-        self.cli_binary = str(cli_binary or 'juju')
+    json_loads: Callable[[str], Any]
+    """Function used to decode the JSON output of Juju commands."""
 
-    def __repr__(self) -> str:
-        args = [
-            f'model={self.model!r}',
-            f'wait_timeout={self.wait_timeout}',
-            f'cli_binary={self.cli_binary!r}',
-        ]
-        return f'Juju({", ".join(args)})'
+    runner: Runner | None
+    """Object used to run Juju CLI commands, or None to run each in a new ``juju`` process."""
+
+    executor: Executor | None
+    """Object that schedules Juju CLI commands, or None to run each when it's called."""
 
     # Keep the public methods in alphabetical order, so we don't have to think
     # about where to put each new method.
@@ -148,18 +276,7 @@ class Juju:
             controller: If specified, save credentials to the named controller.
             region: Cloud region that the credential is valid for.
         """
-        if not client and controller is None:
-            raise TypeError('"client" must be true or "controller" must be specified (or both)')
-
-        args = ['add-credential', cloud]
-
-        if client:
-            args.append('--client')
-        if controller is not None:
-            args.extend(['--controller', controller])
-        if region is not None:
-            args.extend(['--region', region])
-
+        args = _add_credential_args(cloud, client=client, controller=controller, region=region)
         if isinstance(credential, (str, pathlib.Path)):
             args.extend(['--file', str(credential)])
             self.cli(*args, include_model=False)
@@ -194,24 +311,11 @@ class Juju:
                 ``{'image-stream': 'daily'}``.
             credential: Name of cloud credential to use for the model.
         """
-        args = ['add-model', '--no-switch', model]
-
-        if cloud is not None:
-            args.append(cloud)
-
-        if controller is None:
-            model_name = model
-        else:
-            args.extend(['--controller', controller])
-            model_name = f'{controller}:{model}'
-        if config is not None:
-            for k, v in config.items():
-                args.extend(['--config', _format_config(k, v)])
-        if credential is not None:
-            args.extend(['--credential', credential])
-
+        args = _add_model_args(
+            model, cloud, controller=controller, config=config, credential=credential
+        )
         self.cli(*args, include_model=False)
-        self.model = model_name
+        self.model = model if controller is None else f'{controller}:{model}'
 
     def add_secret(
         self,
@@ -228,10 +332,7 @@ class Juju:
                 ``{'password': 'hunter2'}``.
             info: Description for the secret.
         """
-        args = ['add-secret', name]
-        if info is not None:
-            args.extend(['--info', info])
-
+        args = _add_secret_args(name, info=info)
         with tempfile.NamedTemporaryFile('w+', dir=self._temp_dir) as file:
             _yaml.safe_dump(content, file)
             file.flush()
@@ -269,21 +370,7 @@ class Juju:
             to: Machine or container to deploy the unit in (bypasses constraints). For example,
                 to deploy to a new LXD container on machine 25, use ``lxd:25``.
         """
-        args = ['add-unit', app]
-
-        if attach_storage:
-            if isinstance(attach_storage, str):
-                args.extend(['--attach-storage', attach_storage])
-            else:
-                args.extend(['--attach-storage', ','.join(attach_storage)])
-        if num_units != 1:
-            args.extend(['--num-units', str(num_units)])
-        if to:
-            if isinstance(to, str):
-                args.extend(['--to', to])
-            else:
-                args.extend(['--to', ','.join(to)])
-
+        args = _add_unit_args(app, attach_storage=attach_storage, num_units=num_units, to=to)
         self.cli(*args)
 
     def bootstrap(
@@ -336,34 +423,19 @@ class Juju:
                 and ``type`` are required, plus any additional attributes.
             to: Placement directive indicating an instance to bootstrap.
         """
-        args = ['bootstrap', cloud, controller, '--no-switch']
-        if bootstrap_base is not None:
-            args.extend(['--bootstrap-base', bootstrap_base])
-        if bootstrap_constraints is not None:
-            for k, v in bootstrap_constraints.items():
-                args.extend(['--bootstrap-constraints', f'{k}={v}'])
-        if config is not None:
-            for k, v in config.items():
-                args.extend(['--config', _format_config(k, v)])
-        if constraints is not None:
-            for k, v in constraints.items():
-                args.extend(['--constraints', f'{k}={v}'])
-        if credential is not None:
-            args.extend(['--credential', credential])
-        if force:
-            args.append('--force')
-        if model_defaults is not None:
-            for k, v in model_defaults.items():
-                args.extend(['--model-default', _format_config(k, v)])
-        if storage_pool is not None:
-            for k, v in storage_pool.items():
-                args.extend(['--storage-pool', f'{k}={v}'])
-        if to is not None:
-            if isinstance(to, str):
-                args.extend(['--to', to])
-            else:
-                args.extend(['--to', ','.join(to)])
-
+        args = _bootstrap_args(
+            cloud,
+            controller,
+            bootstrap_base=bootstrap_base,
+            bootstrap_constraints=bootstrap_constraints,
+            config=config,
+            constraints=constraints,
+            credential=credential,
+            force=force,
+            model_defaults=model_defaults,
+            storage_pool=storage_pool,
+            to=to,
+        )
         _, stderr = self._cli(*args, include_model=False)
         logger.info('bootstrap output:\n%s', stderr)
 
@@ -388,22 +460,12 @@ class Juju:
         timeout: float | None = None,
     ) -> tuple[str, str]:
         """Run a Juju CLI command and return its standard output and standard error."""
-        if include_model and self.model is not None:
-            args = (args[0], '--model', self.model, *args[1:])
-        if log:
-            logger.info('cli: juju %s', shlex.join(args))
-        try:
-            process = subprocess.run(
-                [self.cli_binary, *args],
-                check=True,
-                capture_output=True,
-                encoding='utf-8',
-                input=stdin,
-                timeout=timeout,
-            )
-        except subprocess.CalledProcessError as e:
-            raise CLIError(e.returncode, e.cmd, e.stdout, e.stderr) from None
-        return (process.stdout, process.stderr)
+        cli_args = self._cli_args(args, include_model=include_model, log=log)
+        limiter = limiter_for_model(self.model)
+        with limiter.acquire() if limiter is not None else contextlib.nullcontext():
+            if self.executor is not None:
+                return self.executor.submit(cli_args, stdin=stdin, timeout=timeout).result()
+            return _run_cli(cli_args, stdin=stdin, timeout=timeout, runner=self.runner)
 
     @overload
     def config(self, app: str, *, app_config: bool = False) -> Mapping[str, ConfigValue]: ...
@@ -444,23 +506,9 @@ class Juju:
         """
         if values is None and not reset:
             stdout = self.cli('config', '--format', 'json', app)
-            outer = json.loads(stdout)
-            inner = outer['application-config'] if app_config else outer['settings']
-            result = {
-                k: SecretURI(v['value']) if v['type'] == 'secret' else v['value']
-                for k, v in inner.items()
-                if 'value' in v
-            }
-            return result
-
-        args = ['config', app]
-        if values:
-            args.extend(_format_config(k, v) for k, v in values.items())
-        if reset:
-            if not isinstance(reset, str):
-                reset = ','.join(reset)
-            args.extend(['--reset', reset])
+            return _config_output(stdout, app_config=app_config, loads=self.json_loads)
 
+        args = _config_args(app, values, reset=reset)
         self.cli(*args)
 
     def consume(
@@ -487,15 +535,7 @@ class Juju:
             owner: Remote model's owner. Defaults to the user that is currently logged in to the
                 controller providing the offer.
         """
-        offer_path = model_and_app
-        if owner is not None:
-            offer_path = f'{owner}/{offer_path}'
-        if controller is not None:
-            offer_path = f'{controller}:{offer_path}'
-        args = ['consume', offer_path]
-        if alias is not None:
-            args.append(alias)
-
+        args = _consume_args(model_and_app, alias, controller=controller, owner=owner)
         self.cli(*args)
 
     def debug_log(self, *, limit: int = 0) -> str:
@@ -512,6 +552,9 @@ class Juju:
                         log = juju.debug_log(limit=1000)
                         print(log, end='')
 
+        This returns the whole log as one string, so for busy models, prefer
+        :meth:`debug_log_stream` or :class:`DebugLogBuffer`, which use bounded memory.
+
         Args:
             limit: Limit the result to the most recent *limit* lines. Defaults to 0, meaning
                 return all lines in the log.
@@ -519,6 +562,71 @@ class Juju:
         args = ['debug-log', '--limit', str(limit)]
         return self.cli(*args)
 
+    def debug_log_stream(
+        self,
+        *,
+        include: Iterable[str] = (),
+        exclude: Iterable[str] = (),
+        include_module: Iterable[str] = (),
+        exclude_module: Iterable[str] = (),
+        level: str | None = None,
+        replay: bool = False,
+        lines: int | None = None,
+        tail: bool = True,
+    ) -> Generator[DebugLogRecord]:
+        """Follow a model's debug log, yielding each record as it's logged.
+
+        Records are read from "juju debug-log" one line at a time, so memory use stays bounded
+        however large the log is. Filtering is done by the controller, so records that are
+        filtered out aren't sent to the client at all.
+
+        The "juju debug-log" process is stopped when the generator is closed (for example, when
+        a ``for`` loop over it ends with ``break``). For example::
+
+            for record in juju.debug_log_stream(include=['mysql/0'], level='ERROR'):
+                print(record.message)
+                if 'database is ready' in record.message:
+                    break
+
+        To keep the most recent records in the background, use :class:`DebugLogBuffer`.
+
+        Args:
+            include: Only include records from these entities, for example ``mysql/0``,
+                ``unit-mysql-0``, or ``mysql`` for all units of an application.
+            exclude: Exclude records from these entities.
+            include_module: Only include records from these modules, for example
+                ``juju.worker.uniter``.
+            exclude_module: Exclude records from these modules.
+            level: Only include records at this level or above, for example ``WARNING``.
+            replay: If true, start from the beginning of the log.
+            lines: Start this many records from the end of the log. Defaults to Juju's default
+                (10 records). Ignored if *replay* is true.
+            tail: If true (the default), keep waiting for new records; if false, stop at the
+                end of the log.
+
+        Raises:
+            CLIError: If the "juju debug-log" command fails.
+        """
+        args = debug_log_stream_args(
+            include=include,
+            exclude=exclude,
+            include_module=include_module,
+            exclude_module=exclude_module,
+            level=level,
+            replay=replay,
+            lines=lines,
+            tail=tail,
+        )
+        process = DebugLogProcess(self._cli_args(args, include_model=True, log=True))
+        try:
+            for line in process.lines():
+                yield DebugLogRecord._from_line(line)
+            stderr = process.stderr()
+            if process.returncode:
+                raise CLIError(process.returncode, process.args, '', stderr)
+        finally:
+            process.close()
+
     def deploy(
         self,
         charm: str | pathlib.Path,
@@ -572,52 +680,24 @@ class Juju:
 
         with self._deploy_tempdir(charm, resources) as (_charm, resources):
             assert _charm is not None
-            args = ['deploy', _charm]
-
-            if app is not None:
-                args.append(app)
-
-            if attach_storage:
-                if isinstance(attach_storage, str):
-                    args.extend(['--attach-storage', attach_storage])
-                else:
-                    args.extend(['--attach-storage', ','.join(attach_storage)])
-            if base is not None:
-                args.extend(['--base', base])
-            if bind is not None:
-                if not isinstance(bind, str):
-                    bind = ' '.join(f'{k}={v}' for k, v in bind.items())
-                args.extend(['--bind', bind])
-            if channel is not None:
-                args.extend(['--channel', channel])
-            if config is not None:
-                for k, v in config.items():
-                    args.extend(['--config', _format_config(k, v)])
-            if constraints is not None:
-                for k, v in constraints.items():
-                    args.extend(['--constraints', f'{k}={v}'])
-            if force:
-                args.append('--force')
-            if num_units != 1:
-                args.extend(['--num-units', str(num_units)])
-            for overlay in overlays:
-                args.extend(['--overlay', str(overlay)])
-            if resources is not None:
-                for k, v in resources.items():
-                    args.extend(['--resource', f'{k}={v}'])
-            if revision is not None:
-                args.extend(['--revision', str(revision)])
-            if storage is not None:
-                for k, v in storage.items():
-                    args.extend(['--storage', f'{k}={v}'])
-            if to:
-                if isinstance(to, str):
-                    args.extend(['--to', to])
-                else:
-                    args.extend(['--to', ','.join(to)])
-            if trust:
-                args.append('--trust')
-
+            args = _deploy_args(
+                _charm,
+                app,
+                attach_storage=attach_storage,
+                base=base,
+                bind=bind,
+                channel=channel,
+                config=config,
+                constraints=constraints,
+                force=force,
+                num_units=num_units,
+                overlays=overlays,
+                resources=resources,
+                revision=revision,
+                storage=storage,
+                to=to,
+                trust=trust,
+            )
             self.cli(*args)
 
     def destroy_model(
@@ -646,17 +726,14 @@ class Juju:
             timeout: Maximum time (in seconds) to wait for each step in the model destruction.
                 This option can only be used with *force*.
         """
-        args = ['destroy-model', model, '--no-prompt']
-        if destroy_storage:
-            args.append('--destroy-storage')
-        if force:
-            args.append('--force')
-        if no_wait:
-            args.append('--no-wait')
-        if release_storage:
-            args.append('--release-storage')
-        if timeout is not None:
-            args.extend(['--timeout', f'{timeout}s'])
+        args = _destroy_model_args(
+            model,
+            destroy_storage=destroy_storage,
+            force=force,
+            no_wait=no_wait,
+            release_storage=release_storage,
+            timeout=timeout,
+        )
         self.cli(*args, include_model=False)
         if model == self.model:
             self.model = None
@@ -681,9 +758,7 @@ class Juju:
 
         You must specify either *machine* or *unit*, but not both.
 
-        Note: this method does not support running a command on multiple units
-        at once. If you need that, let us know, and we'll consider adding it
-        with a new ``exec_multiple`` method or similar.
+        To run a command on multiple units or machines at once, use :meth:`exec_multiple`.
 
         Args:
             command: Command to run. Because the command is executed using the shell,
@@ -704,43 +779,102 @@ class Juju:
             TaskError: if the command failed.
             TimeoutError: if *wait* was specified and the wait time was reached.
         """
-        if (machine is not None and unit is not None) or (machine is None and unit is None):
-            raise TypeError('must specify "machine" or "unit", but not both')
+        cli_args = _exec_args(command, args, machine=machine, unit=unit, wait=wait)
+        try:
+            stdout, stderr = self._cli(*cli_args)
+        except CLIError as exc:
+            stdout, stderr = _task_failed_output(exc)
+        return _task_from_output(stdout, stderr, 'error running command', loads=self.json_loads)
 
-        cli_args = ['exec', '--format', 'json']
-        if machine is not None:
-            cli_args.extend(['--machine', str(machine)])
-        else:
-            assert unit is not None
-            cli_args.extend(['--unit', unit])
-        if wait is not None:
-            cli_args.extend(['--wait', f'{wait}s'])
-        cli_args.append('--')
-        cli_args.append(command)
-        cli_args.extend(args)
+    @overload
+    def exec_background(self, command: str, *args: str, machine: int | str) -> TaskHandle: ...
 
+    @overload
+    def exec_background(self, command: str, *args: str, unit: str) -> TaskHandle: ...
+
+    def exec_background(
+        self,
+        command: str,
+        *args: str,
+        machine: int | str | None = None,
+        unit: str | None = None,
+    ) -> TaskHandle:
+        """Start running the command on the remote target specified, without waiting for it.
+
+        You must specify either *machine* or *unit*, but not both. Use :meth:`wait_tasks` to
+        wait for the command to finish and get its result.
+
+        Args:
+            command: Command to run. Because the command is executed using the shell,
+                arguments may also be included here as a single string.
+            args: Arguments of the command.
+            machine: ID of machine to run the command on.
+            unit: Name of unit to run the command on.
+
+        Returns:
+            A handle to the task created to run the command.
+        """
+        cli_args = _exec_args(
+            command, args, machine=machine, unit=unit, wait=None, background=True
+        )
+        stdout, stderr = self._cli(*cli_args)
+        target = str(machine) if machine is not None else unit
+        assert target is not None
+        return _task_handle_from_output(stdout, stderr, target)
+
+    def exec_multiple(
+        self,
+        command: str,
+        *args: str,
+        all: bool = False,
+        app: str | Iterable[str] | None = None,
+        machine: int | str | Iterable[int | str] | None = None,
+        unit: str | Iterable[str] | None = None,
+        wait: float | None = None,
+    ) -> dict[str, Task]:
+        """Run the command on multiple remote targets at once.
+
+        The command is run on all targets using a single ``juju exec`` call, and Juju runs the
+        command on the targets concurrently. Unlike :meth:`exec`, this doesn't raise
+        :class:`TaskError` if the command fails on one or more targets; check
+        :attr:`Task.success` on each of the returned tasks instead.
+
+        You must specify at least one of *all*, *app*, *machine*, or *unit*. They may be combined.
+
+        Example::
+
+            tasks = juju.exec_multiple('cat /etc/hostname', app='mysql')
+            failed = [unit for unit, task in tasks.items() if not task.success]
+
+        Args:
+            command: Command to run. Because the command is executed using the shell,
+                arguments may also be included here as a single string.
+            args: Arguments of the command.
+            all: If true, run the command on all machines in the model.
+            app: Name of application or applications to run the command on (on all of
+                their units).
+            machine: ID or IDs of machines to run the command on.
+            unit: Name or names of units to run the command on.
+            wait: Maximum time to wait for the command to finish on all targets;
+                :class:`TimeoutError` is raised if this is reached. Juju's default is to wait
+                5 minutes.
+
+        Returns:
+            Mapping of target (unit name, or machine ID for machine targets) to the task created
+            to run the command on that target.
+
+        Raises:
+            ValueError: if none of the machines or units exist.
+            TimeoutError: if *wait* was specified and the wait time was reached.
+        """
+        cli_args = _exec_multiple_args(
+            command, args, all=all, app=app, machine=machine, unit=unit, wait=wait
+        )
         try:
             stdout, stderr = self._cli(*cli_args)
         except CLIError as exc:
-            if 'timed out' in exc.stderr:
-                msg = f'timed out waiting for command, stderr:\n{exc.stderr}'
-                raise TimeoutError(msg) from None
-            # The "juju exec" CLI command itself fails if the exec'd command fails.
-            if 'task failed' not in exc.stderr:
-                raise
-            stdout = exc.stdout
-            stderr = exc.stderr
-
-        # Command doesn't return any stdout if no units exist.
-        results: dict[str, Any] = json.loads(stdout) if stdout.strip() else {}
-        if not results:
-            raise ValueError(f'error running command, stderr:\n{stderr}')
-        # Don't look up results[unit] directly, because if the caller specifies
-        # app/leader it is returned as app/N, for example app/0.
-        task_dict = next(iter(results.values()))
-        task = Task._from_dict(task_dict)
-        task.raise_on_failure()
-        return task
+            stdout, stderr = _task_failed_output(exc)
+        return _tasks_from_output(stdout, stderr, 'error running command', loads=self.json_loads)
 
     def grant_secret(self, identifier: str | SecretURI, app: str | Iterable[str]) -> None:
         """Grant access to a secret for one or more applications.
@@ -749,9 +883,7 @@ class Juju:
             identifier: The name or URI of the secret to grant access to.
             app: Name or names of applications to grant access to.
         """
-        if not isinstance(app, str):
-            app = ','.join(app)
-        args = ['grant-secret', identifier, app]
+        args = _grant_secret_args(identifier, app)
         self.cli(*args)
 
     def integrate(self, app1: str, app2: str, *, via: str | Iterable[str] | None = None) -> None:
@@ -774,12 +906,7 @@ class Juju:
                 source of traffic, to enable network ports to be opened. This
                 is in CIDR notation, for example ``192.0.2.0/24``.
         """
-        args = ['integrate', app1, app2]
-        if via:
-            if isinstance(via, str):
-                args.extend(['--via', via])
-            else:
-                args.extend(['--via', ','.join(via)])
+        args = _integrate_args(app1, app2, via=via)
         self.cli(*args)
 
     @overload
@@ -810,17 +937,9 @@ class Juju:
         """
         if values is None and not reset:
             stdout = self.cli('model-config', '--format', 'json')
-            result = json.loads(stdout)
-            return {k: v['Value'] for k, v in result.items() if 'Value' in v}
-
-        args = ['model-config']
-        if values:
-            args.extend(_format_config(k, v) for k, v in values.items())
-        if reset:
-            if not isinstance(reset, str):
-                reset = ','.join(reset)
-            args.extend(['--reset', reset])
+            return _model_config_output(stdout, loads=self.json_loads)
 
+        args = _model_config_args(values, reset=reset)
         self.cli(*args)
 
     @overload
@@ -843,10 +962,9 @@ class Juju:
         """
         if constraints is None:
             stdout = self.cli('model-constraints', '--format', 'json')
-            return json.loads(stdout)
+            return self.json_loads(stdout)
 
-        args = ['set-model-constraints']
-        args.extend(_format_config(k, v) for k, v in constraints.items())
+        args = _set_model_constraints_args(constraints)
         self.cli(*args)
 
     def offer(
@@ -872,15 +990,7 @@ class Juju:
             endpoint: Endpoint or endpoints to offer.
             name: Name of the offer. By default, the offer is named after the application.
         """
-        if not isinstance(endpoint, str):
-            endpoint = ','.join(endpoint)
-        app_endpoint = f'{app}:{endpoint}'
-        args = ['offer', app_endpoint]
-        if controller:
-            args.extend(['--controller', controller])
-        if name is not None:
-            args.append(name)
-
+        args = _offer_args(app, controller=controller, endpoint=endpoint, name=name)
         self.cli(*args, include_model=False)
 
     def refresh(
@@ -912,31 +1022,19 @@ class Juju:
             storage: Constraints for named storage(s), for example, ``{'data': 'tmpfs,1G'}``.
             trust: If true, allows charm to run hooks that require access to cloud credentials.
         """
-        args = ['refresh', app]
-
         with self._deploy_tempdir(path, resources) as (path, resources):
-            if base is not None:
-                args.extend(['--base', base])
-            if channel is not None:
-                args.extend(['--channel', channel])
-            if config is not None:
-                for k, v in config.items():
-                    args.extend(['--config', _format_config(k, v)])
-            if force:
-                args.extend(['--force', '--force-base', '--force-units'])
-            if path is not None:
-                args.extend(['--path', path])
-            if resources is not None:
-                for k, v in resources.items():
-                    args.extend(['--resource', f'{k}={v}'])
-            if revision is not None:
-                args.extend(['--revision', str(revision)])
-            if storage is not None:
-                for k, v in storage.items():
-                    args.extend(['--storage', f'{k}={v}'])
-            if trust:
-                args.append('--trust')
-
+            args = _refresh_args(
+                app,
+                base=base,
+                channel=channel,
+                config=config,
+                force=force,
+                path=path,
+                resources=resources,
+                revision=revision,
+                storage=storage,
+                trust=trust,
+            )
             self.cli(*args)
 
     def remove_application(
@@ -952,13 +1050,7 @@ class Juju:
             destroy_storage: If true, also destroy storage attached to application units.
             force: Force removal even if an application is in an error state.
         """
-        args = ['remove-application', '--no-prompt', *app]
-
-        if destroy_storage:
-            args.append('--destroy-storage')
-        if force:
-            args.append('--force')
-
+        args = _remove_application_args(app, destroy_storage=destroy_storage, force=force)
         self.cli(*args)
 
     def remove_relation(self, app1: str, app2: str, *, force: bool = False) -> None:
@@ -974,9 +1066,7 @@ class Juju:
             app2: The other of the applications (and endpoints) to integrate.
             force: Force removal, ignoring operational errors.
         """
-        args = ['remove-relation', app1, app2]
-        if force:
-            args.append('--force')
+        args = _remove_relation_args(app1, app2, force=force)
         self.cli(*args)
 
     def remove_secret(self, identifier: str | SecretURI, *, revision: int | None = None) -> None:
@@ -986,9 +1076,7 @@ class Juju:
             identifier: The name or URI of the secret to remove.
             revision: The revision of the secret to remove. If not specified, remove all revisions.
         """
-        args = ['remove-secret', identifier]
-        if revision is not None:
-            args.extend(['--revision', str(revision)])
+        args = _remove_secret_args(identifier, revision=revision)
         self.cli(*args)
 
     def remove_ssh_key(self, *ids: str) -> None:
@@ -1031,17 +1119,9 @@ class Juju:
             force: Force removal even if a unit is in an error state.
             num_units: Number of units to remove (Kubernetes models only).
         """
-        args = ['remove-unit', '--no-prompt', *app_or_unit]
-
-        if destroy_storage:
-            args.append('--destroy-storage')
-        if force:
-            args.append('--force')
-        if num_units:
-            if len(app_or_unit) > 1:
-                raise TypeError('"app_or_unit" must be a single app name if num_units specified')
-            args.extend(['--num-units', str(num_units)])
-
+        args = _remove_unit_args(
+            app_or_unit, destroy_storage=destroy_storage, force=force, num_units=num_units
+        )
         self.cli(*args)
 
     def run(
@@ -1054,9 +1134,7 @@ class Juju:
     ) -> Task:
         """Run an action on the given unit and wait for the result.
 
-        Note: this method does not support running an action on multiple units
-        at once. If you need that, let us know, and we'll consider adding it
-        with a new ``run_multiple`` method or similar.
+        To run an action on multiple units at once, use :meth:`run_multiple`.
 
         Example::
 
@@ -1080,48 +1158,112 @@ class Juju:
             TaskError: if the action failed.
             TimeoutError: if *wait* was specified and the wait time was reached.
         """
-        args = ['run', '--format', 'json', unit, action]
-        if wait is not None:
-            args.extend(['--wait', f'{wait}s'])
-
-        with (
-            tempfile.NamedTemporaryFile('w+', dir=self._temp_dir)
-            if params is not None
-            else contextlib.nullcontext()
-        ) as params_file:
-            # params_file is defined when params is not None
-            if params_file is not None:
-                _yaml.safe_dump(params, params_file)
-                params_file.flush()
-                args.extend(['--params', params_file.name])
+        with self._params_file(params) as params_args:
+            _, task = self._run_unit(unit, action, params_args, wait=wait)
+        task.raise_on_failure()
+        return task
+
+    def run_background(
+        self,
+        unit: str,
+        action: str,
+        params: Mapping[str, Any] | None = None,
+    ) -> TaskHandle:
+        """Start running an action on the given unit, without waiting for it to finish.
+
+        Use :meth:`wait_tasks` to wait for one or more background actions to finish and get
+        their results, for example::
+
+            handles = [juju.run_background(unit, 'create-backup') for unit in units]
+            tasks = juju.wait_tasks(handles)
+
+        Args:
+            unit: Name of unit to run the action on, for example ``mysql/0`` or
+                ``mysql/leader``.
+            action: Name of action to run.
+            params: Named parameters to pass to the action.
+
+        Returns:
+            A handle to the task created to run the action.
+        """
+        with self._params_file(params) as params_args:
+            args = _run_args(unit, action, params_args, wait=None, background=True)
+            stdout, stderr = self._cli(*args)
+        return _task_handle_from_output(stdout, stderr, unit)
+
+    def run_multiple(
+        self,
+        units: Iterable[str],
+        action: str,
+        params: Mapping[str, Any] | None = None,
+        *,
+        max_workers: int = 8,
+        wait: float | None = None,
+    ) -> Generator[tuple[str, Task]]:
+        """Run an action on multiple units, yielding each result as soon as it's available.
+
+        The action is run on up to *max_workers* units concurrently, and ``(unit, task)`` pairs
+        are yielded in the order the actions finish, so callers can start processing results
+        from fast units while slow units are still running. The actions are started when
+        iteration begins.
+
+        Unlike :meth:`run`, this doesn't raise :class:`TaskError` if the action fails on a
+        unit; check :attr:`Task.success` on each task instead.
+
+        Example::
+
+            for unit, task in juju.run_multiple(status.get_units('mysql'), 'create-backup'):
+                assert task.success, f'backup failed on {unit}: {task}'
+
+        Args:
+            units: Names of the units to run the action on.
+            action: Name of action to run.
+            params: Named parameters to pass to the action (the same for every unit).
+            max_workers: Maximum number of actions to run at once. The limits of this
+                instance's *executor* and of :func:`limit_controller` also apply.
+            wait: Maximum time to wait for the action to finish on each unit;
+                :class:`TimeoutError` is raised if this is reached. Juju's default is to wait
+                60 seconds.
+
+        Yields:
+            Pairs of unit name and the task created to run the action on that unit. If the caller
+            specifies ``app/leader``, the unit is returned as ``app/N``, for example ``app/0``.
+
+        Raises:
+            ValueError: if the action or a unit doesn't exist.
+            TimeoutError: if *wait* was specified and the wait time was reached.
+        """
+        # Need this check because str is also an iterable of str.
+        if isinstance(units, str):
+            raise TypeError('units must be an iterable of str, not str')
+
+        with contextlib.ExitStack() as stack:
+            params_args = stack.enter_context(self._params_file(params))
+            # Each worker runs its command with _cli, so it goes through this instance's
+            # executor or runner, and the controller's limiter, like any other command.
+            pool = stack.enter_context(concurrent.futures.ThreadPoolExecutor(max_workers))
+            futures = [
+                pool.submit(self._run_unit, unit, action, params_args, wait=wait) for unit in units
+            ]
             try:
-                stdout, stderr = self._cli(*args)
-            except CLIError as exc:
-                if 'timed out' in exc.stderr:
-                    msg = f'timed out waiting for action, stderr:\n{exc.stderr}'
-                    raise TimeoutError(msg) from None
-                # With Juju 4, trying to run an action that is not defined gives an error like:
-                # ERROR action "not-defined-action" not defined for unit "unit/0". (not found)
-                if '(not found)' in exc.stderr:
-                    raise ValueError(
-                        f'error running action {action!r}, stderr:\n{exc.stderr}'
-                    ) from None
-                # The "juju run" CLI command fails if the action has an uncaught exception.
-                if 'task failed' not in exc.stderr:
-                    raise
-                stdout = exc.stdout
-                stderr = exc.stderr
-
-            # Command doesn't return any stdout if no units exist.
-            results: dict[str, Any] = json.loads(stdout) if stdout.strip() else {}
-            if not results:
-                raise ValueError(f'error running action {action!r}, stderr:\n{stderr}')
-            # Don't look up results[unit] directly, because if the caller specifies
-            # app/leader it is returned as app/N, for example app/0.
-            task_dict = next(iter(results.values()))
-            task = Task._from_dict(task_dict)
-            task.raise_on_failure()
-            return task
+                for future in concurrent.futures.as_completed(futures):
+                    yield future.result()
+            finally:
+                # Don't start actions on the remaining units if we're exiting early, and wait
+                # for the running ones before the params file is removed.
+                for future in futures:
+                    future.cancel()
+                concurrent.futures.wait(futures)
+
+    def _run_unit(
+        self, unit: str, action: str, params_args: list[str], *, wait: float | None
+    ) -> tuple[str, Task]:
+        args = _run_args(unit, action, params_args, wait=wait)
+        try:
+            stdout, stderr = self._cli(*args)
+        except CLIError as exc:
+            stdout, stderr = _task_failed_output(exc, action=action)
+        return _run_output(stdout, stderr, action, loads=self.json_loads)
 
     def scp(
         self,
@@ -1141,41 +1283,81 @@ class Juju:
             host_key_checks: Set to false to disable host key checking (insecure).
             scp_options: ``scp`` client options, for example ``['-r', '-C']``.
         """
-        # Need this check because str is also an iterable of str.
-        if isinstance(scp_options, str):
-            raise TypeError('scp_options must be an iterable of str, not str')
-
-        args = ['scp']
-        if container is not None:
-            args.extend(['--container', container])
-        if not host_key_checks:
-            args.append('--no-host-key-checks')
-        args.append('--')
-        args.extend(scp_options)
-
-        source = str(source)
-        destination = str(destination)
-        temp_needed = (':' not in source) != (':' not in destination) and self._juju_is_snap
-        if not temp_needed:
-            # Simple cases: juju not snap, or local->local, or remote->remote
-            args.append(source)
-            args.append(destination)
-            self.cli(*args)
-            return
+        args = _scp_args(
+            container=container, host_key_checks=host_key_checks, scp_options=scp_options
+        )
+        with self._scp_staging(str(source), str(destination)) as (source, destination):
+            self.cli(*args, source, destination)
 
-        with tempfile.NamedTemporaryFile('w+', dir=self._temp_dir) as file_temp:
-            if ':' not in source:
-                # Local source, remote destination
-                shutil.copy(source, file_temp.name)
-                args.append(file_temp.name)
-                args.append(destination)
-                self.cli(*args)
-            else:
-                # Remote source, local destination
-                args.append(source)
-                args.append(file_temp.name)
-                self.cli(*args)
-                shutil.copy(file_temp.name, destination)
+    def scp_multiple(
+        self,
+        source: str | pathlib.Path,
+        destinations: Iterable[str],
+        *,
+        container: str | None = None,
+        host_key_checks: bool = True,
+        scp_options: Iterable[str] = (),
+        max_workers: int = 8,
+    ) -> dict[str, CLIError | None]:
+        """Securely transfer a local file (or directory) to multiple targets at once.
+
+        The source is staged once (if Juju is running as a snap), and then transferred to up to
+        *max_workers* targets concurrently, so pushing to many units takes little longer than
+        pushing to one. Unlike :meth:`scp`, this doesn't raise if a transfer fails; check the
+        returned errors instead.
+
+        Example::
+
+            units = juju.status().get_units('mysql')
+            errors = juju.scp_multiple('config.tar', [f'{unit}:/tmp/' for unit in units])
+            failed = {dest: err for dest, err in errors.items() if err is not None}
+
+        Args:
+            source: Local path of the file (or directory, with ``-r`` in *scp_options*).
+            destinations: Destinations for the file, each in format
+                ``[<user>@]<target>:[<path>]``, for example ``mysql/0:/tmp/``.
+            container: Name of container for Kubernetes charms. Defaults to the charm container.
+            host_key_checks: Set to false to disable host key checking (insecure).
+            scp_options: ``scp`` client options, for example ``['-r', '-C']``.
+            max_workers: Maximum number of transfers to run at once. The limits of this
+                instance's *executor* and of :func:`limit_controller` also apply.
+
+        Returns:
+            Mapping of each destination to None if the transfer succeeded, or the
+            :class:`CLIError` it failed with.
+
+        Raises:
+            ValueError: if *source* is remote or a destination is local.
+        """
+        args = _scp_args(
+            container=container, host_key_checks=host_key_checks, scp_options=scp_options
+        )
+        source, destinations = _scp_multiple_check(source, destinations)
+        if not destinations:
+            return {}
+
+        with contextlib.ExitStack() as stack:
+            staged, _ = stack.enter_context(self._scp_staging(source, destinations[0]))
+            # Each worker runs its transfer with _cli, so it goes through this instance's
+            # executor or runner, and the controller's limiter, like any other command.
+            pool = stack.enter_context(concurrent.futures.ThreadPoolExecutor(max_workers))
+            futures = {
+                destination: pool.submit(self._cli, *args, staged, destination)
+                for destination in destinations
+            }
+            try:
+                results: dict[str, CLIError | None] = {}
+                for destination, future in futures.items():
+                    exc = future.exception()
+                    if exc is not None and not isinstance(exc, CLIError):
+                        raise exc
+                    results[destination] = exc
+                return results
+            finally:
+                # Wait for the running transfers before the staged file is removed.
+                for future in futures.values():
+                    future.cancel()
+                concurrent.futures.wait(futures.values())
 
     def secrets(self, *, owner: str | None = None) -> list[Secret]:
         """Get all secrets in the model.
@@ -1190,11 +1372,7 @@ class Juju:
         if owner is not None:
             args.extend(['--owner', owner])
         stdout = self.cli(*args, '--format', 'json')
-        output = json.loads(stdout)
-        return [
-            Secret._from_dict({'uri': uri_from_juju, **obj})
-            for uri_from_juju, obj in output.items()
-        ]
+        return _secrets_from_output(stdout, loads=self.json_loads)
 
     def show_model(self, model: str | None = None) -> ModelInfo:
         """Get information about the current model (or another model).
@@ -1203,16 +1381,10 @@ class Juju:
             model: Name of the model or ``controller:model``. If omitted,
                 return details about the current model.
         """
-        args = ['show-model', '--format', 'json']
-        if model is not None:
-            args.append(model)
-        elif self.model is not None:
-            # Use this instance's model if set.
-            args.append(self.model)
+        # Use this instance's model if set.
+        args = _show_model_args(model if model is not None else self.model)
         stdout = self.cli(*args, include_model=False)
-        results = json.loads(stdout)
-        info_dict = next(iter(results.values()))
-        return ModelInfo._from_dict(info_dict)
+        return _model_info_from_output(stdout, loads=self.json_loads)
 
     @overload
     def show_secret(
@@ -1262,20 +1434,9 @@ class Juju:
             revisions: Whether to include all revisions of the secret. Mutually
                 exclusive with *reveal* and *revision*.
         """
-        args = ['show-secret', identifier, '--format', 'json']
-        if reveal:
-            args.append('--reveal')
-        if revisions:
-            args.append('--revisions')
-        if revision is not None:
-            args.extend(['--revision', str(revision)])
+        args = _show_secret_args(identifier, reveal=reveal, revision=revision, revisions=revisions)
         stdout = self.cli(*args)
-        output = json.loads(stdout)
-        uri_from_juju, obj = next(iter(output.items()))
-        secret = {'uri': uri_from_juju, **obj}
-        if reveal:
-            return RevealedSecret._from_dict(secret)
-        return Secret._from_dict(secret)
+        return _secret_from_output(stdout, reveal=reveal, loads=self.json_loads)
 
     def ssh(
         self,
@@ -1301,30 +1462,42 @@ class Juju:
             ssh_options: OpenSSH client options, for example ``['-i', '/path/to/private.key']``.
             user: User account to make connection with. Defaults to ``ubuntu`` account.
         """
-        # Need this check because str is also an iterable of str.
-        if isinstance(ssh_options, str):
-            raise TypeError('ssh_options must be an iterable of str, not str')
-
-        cli_args = ['ssh']
-        if container is not None:
-            cli_args.extend(['--container', container])
-        if not host_key_checks:
-            cli_args.append('--no-host-key-checks')
-        if user is not None:
-            cli_args.append(f'{user}@{target}')
-        else:
-            cli_args.append(str(target))
-        cli_args.extend(ssh_options)
-        cli_args.append(command)
-        cli_args.extend(args)
-
+        cli_args = _ssh_args(
+            target,
+            command,
+            args,
+            container=container,
+            host_key_checks=host_key_checks,
+            ssh_options=ssh_options,
+            user=user,
+        )
         return self.cli(*cli_args)
 
-    def status(self) -> Status:
-        """Fetch the status of the current model, including its applications and units."""
-        stdout = self.cli('status', '--format', 'json')
-        result = json.loads(stdout)
-        return Status._from_dict(result)
+    def status(self, *apps: str) -> Status:
+        """Fetch the status of the current model, including its applications and units.
+
+        Args:
+            apps: If provided, only fetch the status of these applications (and their units
+                and machines). These are passed to ``juju status`` as filter patterns, so the
+                controller does less work and the output is smaller. Patterns such as
+                ``mysql*`` are also supported.
+        """
+        stdout = self.cli(*_status_args(apps))
+        return Status._from_dict(self.json_loads(stdout))
+
+    def status_raw(self, *apps: str) -> dict[str, Any]:
+        """Fetch the status of the current model as the dict decoded from ``juju status`` JSON.
+
+        This skips building the :class:`Status` object, which is a significant part of the cost
+        of fetching the status of a large model. The keys are those output by Juju, for example
+        ``status['applications']['mysql']['units']['mysql/0']['workload-status']['current']``.
+
+        Args:
+            apps: If provided, only fetch the status of these applications, as with
+                :meth:`status`.
+        """
+        stdout = self.cli(*_status_args(apps))
+        return self.json_loads(stdout)
 
     def trust(
         self, app: str, *, remove: bool = False, scope: Literal['cluster'] | None = None
@@ -1337,12 +1510,7 @@ class Juju:
             scope: On Kubernetes models, this must be set to "cluster", as the trust operation
                 grants the charm full access to the cluster.
         """
-        args = ['trust', app]
-        if remove:
-            args.append('--remove')
-        if scope is not None:
-            args.extend(['--scope', scope])
-
+        args = _trust_args(app, remove=remove, scope=scope)
         self.cli(*args)
 
     def update_secret(
@@ -1364,14 +1532,7 @@ class Juju:
             name: New name for the secret.
             auto_prune: automatically remove revisions that are no longer tracked by any observers.
         """
-        args = ['update-secret', identifier]
-        if info is not None:
-            args.extend(['--info', info])
-        if name is not None:
-            args.extend(['--name', name])
-        if auto_prune:
-            args.append('--auto-prune')
-
+        args = _update_secret_args(identifier, info=info, name=name, auto_prune=auto_prune)
         with tempfile.NamedTemporaryFile('w+', dir=self._temp_dir) as file:
             _yaml.safe_dump(content, file)
             file.flush()
@@ -1380,10 +1541,10 @@ class Juju:
 
     def version(self) -> Version:
         """Return the parsed Juju CLI version."""
-        stdout = self.cli('version', '--format', 'json', '--all', include_model=False)
-        version_dict = json.loads(stdout)
-        return Version._from_dict(version_dict)
+        stdout = self.cli(*_VERSION_ARGS, include_model=False)
+        return Version._from_dict(self.json_loads(stdout))
 
+    @overload
     def wait(
         self,
         ready: Callable[[Status], bool],
@@ -1392,13 +1553,58 @@ class Juju:
         delay: float = 1.0,
         timeout: float | None = None,
         successes: int = 3,
-    ) -> Status:
+        backoff: Backoff | None = None,
+        debug_log_interval: float | None = None,
+        apps: Iterable[str] = (),
+        raw: Literal[False] = False,
+    ) -> Status: ...
+
+    @overload
+    def wait(
+        self,
+        ready: Callable[[dict[str, Any]], bool],
+        *,
+        error: Callable[[dict[str, Any]], bool] | None = None,
+        delay: float = 1.0,
+        timeout: float | None = None,
+        successes: int = 3,
+        backoff: Backoff | None = None,
+        debug_log_interval: float | None = None,
+        apps: Iterable[str] = (),
+        raw: Literal[True],
+    ) -> dict[str, Any]: ...
+
+    def wait(
+        self,
+        ready: Callable[[Any], bool],
+        *,
+        error: Callable[[Any], bool] | None = None,
+        delay: float = 1.0,
+        timeout: float | None = None,
+        successes: int = 3,
+        backoff: Backoff | None = None,
+        debug_log_interval: float | None = None,
+        apps: Iterable[str] = (),
+        raw: bool = False,
+    ) -> Any:
         """Wait until ``ready(status)`` returns ``True``.
 
         This fetches the Juju status repeatedly (waiting *delay* seconds between each call),
         and returns the last status after the *ready* callable returns ``True`` for *successes*
         times in a row.
 
+        To poll quickly after the status changes and less often while it's stable, pass a
+        :class:`Backoff` policy instead of a fixed *delay*::
+
+            juju.wait(jubilant.all_active, backoff=jubilant.Backoff(initial=1, maximum=30))
+
+        For long waits on a shared controller, *debug_log_interval* makes the wait driven by
+        hook activity instead: while the status is unchanged, ``juju debug-log`` is followed in
+        the background and the status is only fetched again after a hook runs, or after
+        *debug_log_interval* seconds without one::
+
+            juju.wait(jubilant.all_active, debug_log_interval=60)
+
         Example::
 
             juju = jubilant.Juju()
@@ -1421,6 +1627,8 @@ class Juju:
 
             logging.getLogger('jubilant.wait').setLevel('WARNING')
 
+        When the wait succeeds, the number of status calls made is logged at DEBUG level.
+
         Args:
             ready: Callable that takes a :class:`Status` object and returns ``True`` when the wait
                 should be considered ready. It needs to return ``True`` *successes* times in a row
@@ -1432,6 +1640,19 @@ class Juju:
                 is reached. If not specified, uses the *wait_timeout* specified when the
                 instance was created.
             successes: Number of times *ready* must return ``True`` for the wait to succeed.
+            backoff: Policy for the delay between status calls, based on whether the status
+                has changed. If specified, *delay* is ignored.
+            debug_log_interval: If specified, follow the debug log while the status is
+                unchanged, and only fetch the status again after a hook runs or this many
+                seconds have passed. The debug log is checked every *delay* seconds.
+            apps: If provided, only fetch the status of these applications, as with
+                :meth:`status`. The *ready* and *error* callables only see these applications,
+                so this is useful with conditions like ``jubilant.all_active(status, *apps)``.
+            raw: If true, pass the dict decoded from ``juju status`` JSON (as returned by
+                :meth:`status_raw`) to *ready* and *error* instead of a :class:`Status`, and
+                return it. This avoids building a :class:`Status` object on every poll, so uses
+                less CPU when waiting on large models, but the helpers like
+                :func:`all_active` can't be used.
 
         Raises:
             TimeoutError: If the *timeout* is reached. A string representation
@@ -1441,91 +1662,107 @@ class Juju:
         """
         if timeout is None:
             timeout = self.wait_timeout
-
-        status = None
-        success_count = 0
+        # Need this check because str is also an iterable of str.
+        if isinstance(apps, str):
+            raise TypeError('apps must be an iterable of str, not str')
+        status_args = _status_args(apps)
+
+        waiter = _Waiter(
+            ready,
+            error=error,
+            successes=successes,
+            delay=delay,
+            backoff=backoff,
+            loads=self.json_loads,
+            raw=raw,
+        )
+        watcher = None
+        if debug_log_interval is not None:
+            watcher = _LogWatcher(self._cli_args(_HOOK_LOG_ARGS, include_model=True, log=True))
         start = time.monotonic()
 
-        while time.monotonic() - start < timeout:
-            prev_status = status
+        try:
+            while time.monotonic() - start < timeout:
+                stdout, _ = self._cli(*status_args, log=False)
+                status = waiter.update(stdout)
+                if status is not None:
+                    return status
 
-            stdout, _ = self._cli('status', '--format', 'json', log=False)
-            result = json.loads(stdout)
-            status = Status._from_dict(result)
+                if watcher is None or not waiter.idle:
+                    time.sleep(waiter.next_delay())
+                    continue
+
+                # Nothing is changing, so check the debug log (cheaply) rather than the status.
+                assert debug_log_interval is not None
+                idle_start = time.monotonic()
+                while (
+                    time.monotonic() - idle_start < debug_log_interval
+                    and time.monotonic() - start < timeout
+                ):
+                    time.sleep(delay)
+                    if watcher.activity():
+                        break
+        finally:
+            if watcher is not None:
+                watcher.close()
+
+        raise waiter.timeout_error(timeout)
+
+    def wait_tasks(
+        self,
+        handles: Iterable[TaskHandle],
+        *,
+        delay: float = 1.0,
+        max_delay: float = 10.0,
+        timeout: float | None = None,
+    ) -> list[Task]:
+        """Wait for background tasks to finish and return their results.
 
-            if status != prev_status:
-                diff = _status_diff(prev_status, status)
-                if diff:
-                    logger_wait.info('wait: status changed:\n%s', diff)
+        This polls ``juju show-task`` for each task that hasn't finished yet (up to 8 at once),
+        waiting *delay* seconds between polls. While no task finishes, the delay between polls
+        doubles (up to *max_delay*); it's reset to *delay* whenever a task finishes.
 
-            if error is not None and error(status):
-                name = getattr(error, '__qualname__', repr(error))
-                raise WaitError(f'error function {name} returned true\n{status}')
+        Unlike :meth:`run` and :meth:`exec`, this doesn't raise :class:`TaskError` if a task
+        failed; check :attr:`Task.success` on each task instead.
 
-            if ready(status):
-                success_count += 1
-                if success_count >= successes:
-                    return status
-            else:
-                success_count = 0
+        Args:
+            handles: Handles of the tasks to wait for, as returned by :meth:`run_background` or
+                :meth:`exec_background`.
+            delay: Initial delay in seconds between polls.
+            max_delay: Maximum delay in seconds between polls.
+            timeout: Overall timeout in seconds; :class:`TimeoutError` is raised if this
+                is reached. If not specified, uses the *wait_timeout* specified when the
+                instance was created.
 
-            time.sleep(delay)
+        Returns:
+            The finished tasks, in the same order as *handles*.
 
-        if status is None:
-            raise TimeoutError(f'wait timed out after {timeout}s')
-        raise TimeoutError(f'wait timed out after {timeout}s\n{status}')
+        Raises:
+            TimeoutError: If the *timeout* is reached before all tasks finish.
+        """
+        if timeout is None:
+            timeout = self.wait_timeout
 
-    @functools.cached_property
-    def _juju_is_snap(self) -> bool:
-        which = shutil.which(self.cli_binary)
-        return which is not None and '/snap/' in which
+        poller = _TaskPoller(handles, delay=delay, max_delay=max_delay, loads=self.json_loads)
+        start = time.monotonic()
 
-    @functools.cached_property
-    def _temp_dir(self) -> str:
-        if self._juju_is_snap:
-            # If Juju is running as a snap, we can't use /tmp, so put temp files here instead.
-            temp_dir = os.path.expanduser('~/snap/juju/common')
-            os.makedirs(temp_dir, exist_ok=True)
-            return temp_dir
-        else:
-            return tempfile.gettempdir()
+        def poll(handle: TaskHandle) -> str:
+            stdout, _ = self._cli('show-task', handle.id, '--format', 'json', log=False)
+            return stdout
 
-    # This context manager is for deploy() and refresh(), and automatically copies
-    # a local charm file and local resource files into a temporary directory if Juju
-    # is running as a snap (in which case /tmp is not accessible).
-    @contextlib.contextmanager
-    def _deploy_tempdir(
-        self,
-        charm: str | pathlib.Path | None,
-        resources: Mapping[str, str] | None,
-    ) -> Generator[tuple[str | None, Mapping[str, str] | None]]:
-        if charm is not None:
-            charm = str(charm)
-        charm_needs_temp = charm is not None and charm.startswith(('.', '/'))
-        resources_needs_temp = resources is not None and any(
-            v.startswith(('.', '/')) for v in resources.values()
-        )
-        needs_temp = self._juju_is_snap and (charm_needs_temp or resources_needs_temp)
-        if not needs_temp:
-            yield charm, resources
-            return
+        # Each worker polls with _cli, so it goes through this instance's executor or runner,
+        # and the controller's limiter, like any other command.
+        with concurrent.futures.ThreadPoolExecutor(8) as pool:
+            while time.monotonic() - start < timeout:
+                pending = poller.pending()
+                for handle, stdout in zip(pending, pool.map(poll, pending)):
+                    poller.update(handle, stdout)
+                if not poller.pending():
+                    return poller.results()
 
-        with tempfile.TemporaryDirectory(dir=self._temp_dir) as temp_dir:
-            if charm_needs_temp:
-                assert charm is not None
-                temp = os.path.join(temp_dir, '_temp.charm')
-                shutil.copy(charm, temp)
-                charm = temp
-
-            if resources_needs_temp:
-                assert resources is not None
-                resources = dict(resources)
-                for k, v in resources.items():
-                    if v.startswith(('.', '/')):
-                        resources[k] = os.path.join(temp_dir, k)
-                        shutil.copy(v, resources[k])
+                time.sleep(poller.next_delay())
 
-            yield charm, resources
+        raise poller.timeout_error(timeout)
 
 
 def _format_config(k: str, v: ConfigValue) -> str:
@@ -1534,24 +1771,868 @@ def _format_config(k: str, v: ConfigValue) -> str:
     return f'{k}={v}'
 
 
-def _status_diff(old: Status | None, new: Status) -> str:
-    """Return a line-based diff of two status objects."""
-    if old is None:
-        old_lines = []
+# The functions below build CLI arguments and parse CLI output for the methods that both
+# Juju and AsyncJuju provide, so that the sync and async versions can't drift apart.
+
+
+def _add_credential_args(
+    cloud: str, *, client: bool, controller: str | None, region: str | None
+) -> list[str]:
+    if not client and controller is None:
+        raise TypeError('"client" must be true or "controller" must be specified (or both)')
+
+    args = ['add-credential', cloud]
+    if client:
+        args.append('--client')
+    if controller is not None:
+        args.extend(['--controller', controller])
+    if region is not None:
+        args.extend(['--region', region])
+    return args
+
+
+def _add_model_args(
+    model: str,
+    cloud: str | None,
+    *,
+    controller: str | None,
+    config: Mapping[str, ConfigValue] | None,
+    credential: str | None,
+) -> list[str]:
+    args = ['add-model', '--no-switch', model]
+    if cloud is not None:
+        args.append(cloud)
+    if controller is not None:
+        args.extend(['--controller', controller])
+    if config is not None:
+        for k, v in config.items():
+            args.extend(['--config', _format_config(k, v)])
+    if credential is not None:
+        args.extend(['--credential', credential])
+    return args
+
+
+def _add_secret_args(name: str, *, info: str | None) -> list[str]:
+    args = ['add-secret', name]
+    if info is not None:
+        args.extend(['--info', info])
+    return args
+
+
+def _add_unit_args(
+    app: str,
+    *,
+    attach_storage: str | Iterable[str] | None,
+    num_units: int,
+    to: str | Iterable[str] | None,
+) -> list[str]:
+    args = ['add-unit', app]
+    if attach_storage:
+        if isinstance(attach_storage, str):
+            args.extend(['--attach-storage', attach_storage])
+        else:
+            args.extend(['--attach-storage', ','.join(attach_storage)])
+    if num_units != 1:
+        args.extend(['--num-units', str(num_units)])
+    if to:
+        if isinstance(to, str):
+            args.extend(['--to', to])
+        else:
+            args.extend(['--to', ','.join(to)])
+    return args
+
+
+def _bootstrap_args(
+    cloud: str,
+    controller: str,
+    *,
+    bootstrap_base: str | None,
+    bootstrap_constraints: Mapping[str, str] | None,
+    config: Mapping[str, ConfigValue] | None,
+    constraints: Mapping[str, str] | None,
+    credential: str | None,
+    force: bool,
+    model_defaults: Mapping[str, ConfigValue] | None,
+    storage_pool: Mapping[str, str] | None,
+    to: str | Iterable[str] | None,
+) -> list[str]:
+    args = ['bootstrap', cloud, controller, '--no-switch']
+    if bootstrap_base is not None:
+        args.extend(['--bootstrap-base', bootstrap_base])
+    if bootstrap_constraints is not None:
+        for k, v in bootstrap_constraints.items():
+            args.extend(['--bootstrap-constraints', f'{k}={v}'])
+    if config is not None:
+        for k, v in config.items():
+            args.extend(['--config', _format_config(k, v)])
+    if constraints is not None:
+        for k, v in constraints.items():
+            args.extend(['--constraints', f'{k}={v}'])
+    if credential is not None:
+        args.extend(['--credential', credential])
+    if force:
+        args.append('--force')
+    if model_defaults is not None:
+        for k, v in model_defaults.items():
+            args.extend(['--model-default', _format_config(k, v)])
+    if storage_pool is not None:
+        for k, v in storage_pool.items():
+            args.extend(['--storage-pool', f'{k}={v}'])
+    if to is not None:
+        if isinstance(to, str):
+            args.extend(['--to', to])
+        else:
+            args.extend(['--to', ','.join(to)])
+    return args
+
+
+def _config_args(
+    app: str, values: Mapping[str, ConfigValue] | None, *, reset: str | Iterable[str]
+) -> list[str]:
+    args = ['config', app]
+    if values:
+        args.extend(_format_config(k, v) for k, v in values.items())
+    if reset:
+        if not isinstance(reset, str):
+            reset = ','.join(reset)
+        args.extend(['--reset', reset])
+    return args
+
+
+def _config_output(
+    stdout: str, *, app_config: bool, loads: Callable[[str], Any]
+) -> dict[str, ConfigValue]:
+    outer = loads(stdout)
+    inner = outer['application-config'] if app_config else outer['settings']
+    return {
+        k: SecretURI(v['value']) if v['type'] == 'secret' else v['value']
+        for k, v in inner.items()
+        if 'value' in v
+    }
+
+
+def _consume_args(
+    model_and_app: str, alias: str | None, *, controller: str | None, owner: str | None
+) -> list[str]:
+    offer_path = model_and_app
+    if owner is not None:
+        offer_path = f'{owner}/{offer_path}'
+    if controller is not None:
+        offer_path = f'{controller}:{offer_path}'
+    args = ['consume', offer_path]
+    if alias is not None:
+        args.append(alias)
+    return args
+
+
+def _deploy_args(
+    charm: str,
+    app: str | None,
+    *,
+    attach_storage: str | Iterable[str] | None,
+    base: str | None,
+    bind: Mapping[str, str] | str | None,
+    channel: str | None,
+    config: Mapping[str, ConfigValue] | None,
+    constraints: Mapping[str, str] | None,
+    force: bool,
+    num_units: int,
+    overlays: Iterable[str | pathlib.Path],
+    resources: Mapping[str, str] | None,
+    revision: int | None,
+    storage: Mapping[str, str] | None,
+    to: str | Iterable[str] | None,
+    trust: bool,
+) -> list[str]:
+    args = ['deploy', charm]
+
+    if app is not None:
+        args.append(app)
+
+    if attach_storage:
+        if isinstance(attach_storage, str):
+            args.extend(['--attach-storage', attach_storage])
+        else:
+            args.extend(['--attach-storage', ','.join(attach_storage)])
+    if base is not None:
+        args.extend(['--base', base])
+    if bind is not None:
+        if not isinstance(bind, str):
+            bind = ' '.join(f'{k}={v}' for k, v in bind.items())
+        args.extend(['--bind', bind])
+    if channel is not None:
+        args.extend(['--channel', channel])
+    if config is not None:
+        for k, v in config.items():
+            args.extend(['--config', _format_config(k, v)])
+    if constraints is not None:
+        for k, v in constraints.items():
+            args.extend(['--constraints', f'{k}={v}'])
+    if force:
+        args.append('--force')
+    if num_units != 1:
+        args.extend(['--num-units', str(num_units)])
+    for overlay in overlays:
+        args.extend(['--overlay', str(overlay)])
+    if resources is not None:
+        for k, v in resources.items():
+            args.extend(['--resource', f'{k}={v}'])
+    if revision is not None:
+        args.extend(['--revision', str(revision)])
+    if storage is not None:
+        for k, v in storage.items():
+            args.extend(['--storage', f'{k}={v}'])
+    if to:
+        if isinstance(to, str):
+            args.extend(['--to', to])
+        else:
+            args.extend(['--to', ','.join(to)])
+    if trust:
+        args.append('--trust')
+
+    return args
+
+
+def _destroy_model_args(
+    model: str,
+    *,
+    destroy_storage: bool,
+    force: bool,
+    no_wait: bool,
+    release_storage: bool,
+    timeout: float | None,
+) -> list[str]:
+    args = ['destroy-model', model, '--no-prompt']
+    if destroy_storage:
+        args.append('--destroy-storage')
+    if force:
+        args.append('--force')
+    if no_wait:
+        args.append('--no-wait')
+    if release_storage:
+        args.append('--release-storage')
+    if timeout is not None:
+        args.extend(['--timeout', f'{timeout}s'])
+    return args
+
+
+def _exec_args(
+    command: str,
+    args: Iterable[str],
+    *,
+    machine: int | str | None,
+    unit: str | None,
+    wait: float | None,
+    background: bool = False,
+) -> list[str]:
+    if (machine is not None and unit is not None) or (machine is None and unit is None):
+        raise TypeError('must specify "machine" or "unit", but not both')
+
+    cli_args = ['exec', '--background'] if background else ['exec', '--format', 'json']
+    if machine is not None:
+        cli_args.extend(['--machine', str(machine)])
     else:
-        old_lines = [line for line in _pretty.gron(old) if _status_line_ok(line)]
-    new_lines = [line for line in _pretty.gron(new) if _status_line_ok(line)]
-    return '\n'.join(_pretty.diff(old_lines, new_lines))
+        assert unit is not None
+        cli_args.extend(['--unit', unit])
+    if wait is not None:
+        cli_args.extend(['--wait', f'{wait}s'])
+    cli_args.append('--')
+    cli_args.append(command)
+    cli_args.extend(args)
+    return cli_args
+
+
+def _exec_multiple_args(
+    command: str,
+    args: Iterable[str],
+    *,
+    all: bool,
+    app: str | Iterable[str] | None,
+    machine: int | str | Iterable[int | str] | None,
+    unit: str | Iterable[str] | None,
+    wait: float | None,
+) -> list[str]:
+    if machine is not None:
+        if isinstance(machine, int):
+            machine = str(machine)
+        elif not isinstance(machine, str):
+            machine = ','.join(str(m) for m in machine)
+    if app is not None and not isinstance(app, str):
+        app = ','.join(app)
+    if unit is not None and not isinstance(unit, str):
+        unit = ','.join(unit)
+    if not (all or app or machine or unit):
+        raise TypeError('must specify at least one of "all", "app", "machine", or "unit"')
+
+    cli_args = ['exec', '--format', 'json']
+    if all:
+        cli_args.append('--all')
+    if app:
+        cli_args.extend(['--application', app])
+    if machine:
+        cli_args.extend(['--machine', machine])
+    if unit:
+        cli_args.extend(['--unit', unit])
+    if wait is not None:
+        cli_args.extend(['--wait', f'{wait}s'])
+    cli_args.append('--')
+    cli_args.append(command)
+    cli_args.extend(args)
+    return cli_args
+
+
+def _grant_secret_args(identifier: str | SecretURI, app: str | Iterable[str]) -> list[str]:
+    if not isinstance(app, str):
+        app = ','.join(app)
+    return ['grant-secret', identifier, app]
+
+
+def _integrate_args(app1: str, app2: str, *, via: str | Iterable[str] | None) -> list[str]:
+    args = ['integrate', app1, app2]
+    if via:
+        if isinstance(via, str):
+            args.extend(['--via', via])
+        else:
+            args.extend(['--via', ','.join(via)])
+    return args
+
+
+def _model_config_args(
+    values: Mapping[str, ConfigValue] | None, *, reset: str | Iterable[str]
+) -> list[str]:
+    args = ['model-config']
+    if values:
+        args.extend(_format_config(k, v) for k, v in values.items())
+    if reset:
+        if not isinstance(reset, str):
+            reset = ','.join(reset)
+        args.extend(['--reset', reset])
+    return args
+
+
+def _model_config_output(stdout: str, *, loads: Callable[[str], Any]) -> dict[str, ConfigValue]:
+    result = loads(stdout)
+    return {k: v['Value'] for k, v in result.items() if 'Value' in v}
+
+
+def _model_info_from_output(stdout: str, *, loads: Callable[[str], Any]) -> ModelInfo:
+    results = loads(stdout)
+    info_dict = next(iter(results.values()))
+    return ModelInfo._from_dict(info_dict)
+
+
+def _offer_args(
+    app: str, *, controller: str | None, endpoint: str | Iterable[str], name: str | None
+) -> list[str]:
+    if not isinstance(endpoint, str):
+        endpoint = ','.join(endpoint)
+    args = ['offer', f'{app}:{endpoint}']
+    if controller:
+        args.extend(['--controller', controller])
+    if name is not None:
+        args.append(name)
+    return args
+
+
+def _refresh_args(
+    app: str,
+    *,
+    base: str | None,
+    channel: str | None,
+    config: Mapping[str, ConfigValue] | None,
+    force: bool,
+    path: str | None,
+    resources: Mapping[str, str] | None,
+    revision: int | None,
+    storage: Mapping[str, str] | None,
+    trust: bool,
+) -> list[str]:
+    args = ['refresh', app]
+    if base is not None:
+        args.extend(['--base', base])
+    if channel is not None:
+        args.extend(['--channel', channel])
+    if config is not None:
+        for k, v in config.items():
+            args.extend(['--config', _format_config(k, v)])
+    if force:
+        args.extend(['--force', '--force-base', '--force-units'])
+    if path is not None:
+        args.extend(['--path', path])
+    if resources is not None:
+        for k, v in resources.items():
+            args.extend(['--resource', f'{k}={v}'])
+    if revision is not None:
+        args.extend(['--revision', str(revision)])
+    if storage is not None:
+        for k, v in storage.items():
+            args.extend(['--storage', f'{k}={v}'])
+    if trust:
+        args.append('--trust')
+    return args
+
+
+def _remove_application_args(
+    app: Iterable[str], *, destroy_storage: bool, force: bool
+) -> list[str]:
+    args = ['remove-application', '--no-prompt', *app]
+    if destroy_storage:
+        args.append('--destroy-storage')
+    if force:
+        args.append('--force')
+    return args
+
+
+def _remove_secret_args(identifier: str | SecretURI, *, revision: int | None) -> list[str]:
+    args = ['remove-secret', identifier]
+    if revision is not None:
+        args.extend(['--revision', str(revision)])
+    return args
+
+
+def _remove_relation_args(app1: str, app2: str, *, force: bool) -> list[str]:
+    args = ['remove-relation', app1, app2]
+    if force:
+        args.append('--force')
+    return args
+
+
+def _remove_unit_args(
+    app_or_unit: tuple[str, ...], *, destroy_storage: bool, force: bool, num_units: int
+) -> list[str]:
+    args = ['remove-unit', '--no-prompt', *app_or_unit]
+    if destroy_storage:
+        args.append('--destroy-storage')
+    if force:
+        args.append('--force')
+    if num_units:
+        if len(app_or_unit) > 1:
+            raise TypeError('"app_or_unit" must be a single app name if num_units specified')
+        args.extend(['--num-units', str(num_units)])
+    return args
+
+
+def _run_args(
+    unit: str,
+    action: str,
+    params_args: Iterable[str],
+    *,
+    wait: float | None,
+    background: bool = False,
+) -> list[str]:
+    args = ['run', '--background'] if background else ['run', '--format', 'json']
+    args.extend([unit, action])
+    if wait is not None:
+        args.extend(['--wait', f'{wait}s'])
+    args.extend(params_args)
+    return args
+
+
+def _run_output(
+    stdout: str, stderr: str, action: str, *, loads: Callable[[str], Any]
+) -> tuple[str, Task]:
+    tasks = _tasks_from_output(stdout, stderr, f'error running action {action!r}', loads=loads)
+    # Don't look up the unit the caller specified directly, because if the caller
+    # specifies app/leader it is returned as app/N, for example app/0.
+    return next(iter(tasks.items()))
+
+
+def _scp_args(
+    *, container: str | None, host_key_checks: bool, scp_options: Iterable[str]
+) -> list[str]:
+    # Need this check because str is also an iterable of str.
+    if isinstance(scp_options, str):
+        raise TypeError('scp_options must be an iterable of str, not str')
+
+    args = ['scp']
+    if container is not None:
+        args.extend(['--container', container])
+    if not host_key_checks:
+        args.append('--no-host-key-checks')
+    args.append('--')
+    args.extend(scp_options)
+    return args
+
+
+def _scp_multiple_check(
+    source: str | pathlib.Path, destinations: Iterable[str]
+) -> tuple[str, list[str]]:
+    # Need this check because str is also an iterable of str.
+    if isinstance(destinations, str):
+        raise TypeError('destinations must be an iterable of str, not str')
+    source = str(source)
+    if ':' in source:
+        raise ValueError(f'source must be a local path, not {source!r}')
+    destinations = list(dict.fromkeys(destinations))
+    for destination in destinations:
+        if ':' not in destination:
+            raise ValueError(f'destination must be remote (<target>:<path>), not {destination!r}')
+    return source, destinations
+
+
+def _secret_from_output(
+    stdout: str, *, reveal: bool, loads: Callable[[str], Any]
+) -> Secret | RevealedSecret:
+    output = loads(stdout)
+    uri_from_juju, obj = next(iter(output.items()))
+    secret = {'uri': uri_from_juju, **obj}
+    if reveal:
+        return RevealedSecret._from_dict(secret)
+    return Secret._from_dict(secret)
+
+
+def _secrets_from_output(stdout: str, *, loads: Callable[[str], Any]) -> list[Secret]:
+    output = loads(stdout)
+    return [
+        Secret._from_dict({'uri': uri_from_juju, **obj}) for uri_from_juju, obj in output.items()
+    ]
+
+
+def _set_model_constraints_args(constraints: Mapping[str, ConstraintValue]) -> list[str]:
+    args = ['set-model-constraints']
+    args.extend(_format_config(k, v) for k, v in constraints.items())
+    return args
+
+
+def _show_model_args(model: str | None) -> list[str]:
+    args = ['show-model', '--format', 'json']
+    if model is not None:
+        args.append(model)
+    return args
+
+
+def _show_secret_args(
+    identifier: str | SecretURI, *, reveal: bool, revision: int | None, revisions: bool
+) -> list[str]:
+    args = ['show-secret', identifier, '--format', 'json']
+    if reveal:
+        args.append('--reveal')
+    if revisions:
+        args.append('--revisions')
+    if revision is not None:
+        args.extend(['--revision', str(revision)])
+    return args
+
+
+def _ssh_args(
+    target: str | int,
+    command: str,
+    args: Iterable[str],
+    *,
+    container: str | None,
+    host_key_checks: bool,
+    ssh_options: Iterable[str],
+    user: str | None,
+) -> list[str]:
+    # Need this check because str is also an iterable of str.
+    if isinstance(ssh_options, str):
+        raise TypeError('ssh_options must be an iterable of str, not str')
+
+    cli_args = ['ssh']
+    if container is not None:
+        cli_args.extend(['--container', container])
+    if not host_key_checks:
+        cli_args.append('--no-host-key-checks')
+    if user is not None:
+        cli_args.append(f'{user}@{target}')
+    else:
+        cli_args.append(str(target))
+    cli_args.extend(ssh_options)
+    cli_args.append(command)
+    cli_args.extend(args)
+    return cli_args
+
+
+def _status_args(apps: Iterable[str]) -> list[str]:
+    return ['status', '--format', 'json', *apps]
+
+
+_TASK_FAILED_RE = re.compile(r'\btasks? failed\b')
+
+
+def _task_failed_output(exc: CLIError, *, action: str | None = None) -> tuple[str, str]:
+    """Return stdout and stderr of a failed "juju exec" or "juju run" (if *action* is set).
+
+    Those commands fail when the task itself fails, in which case the task's details are still
+    in the output. Raise a more specific exception for other errors.
+    """
+    what = 'command' if action is None else 'action'
+    if 'timed out' in exc.stderr:
+        msg = f'timed out waiting for {what}, stderr:\n{exc.stderr}'
+        raise TimeoutError(msg) from None
+    # With Juju 4, trying to run an action that is not defined gives an error like:
+    # ERROR action "not-defined-action" not defined for unit "unit/0". (not found)
+    if action is not None and '(not found)' in exc.stderr:
+        raise ValueError(f'error running action {action!r}, stderr:\n{exc.stderr}') from None
+    # Juju says "task failed" if one task failed, and "tasks failed" if several did.
+    if not _TASK_FAILED_RE.search(exc.stderr):
+        raise exc
+    return exc.stdout, exc.stderr
+
+
+def _task_from_output(
+    stdout: str, stderr: str, error_message: str, *, loads: Callable[[str], Any]
+) -> Task:
+    # Command doesn't return any stdout if no units exist.
+    results: dict[str, Any] = loads(stdout) if stdout.strip() else {}
+    if not results:
+        raise ValueError(f'{error_message}, stderr:\n{stderr}')
+    # Don't look up results[unit] directly, because if the caller specifies
+    # app/leader it is returned as app/N, for example app/0.
+    task_dict = next(iter(results.values()))
+    task = Task._from_dict(task_dict)
+    task.raise_on_failure()
+    return task
+
+
+def _tasks_from_output(
+    stdout: str, stderr: str, error_message: str, *, loads: Callable[[str], Any]
+) -> dict[str, Task]:
+    # Command doesn't return any stdout if no units exist.
+    results: dict[str, Any] = loads(stdout) if stdout.strip() else {}
+    if not results:
+        raise ValueError(f'{error_message}, stderr:\n{stderr}')
+    return {target: Task._from_dict(task_dict) for target, task_dict in results.items()}
+
+
+def _task_from_show_task(
+    stdout: str, handle: TaskHandle, *, loads: Callable[[str], Any]
+) -> Task | None:
+    """Return the task from "juju show-task" output, or None if it hasn't finished yet."""
+    task_dict = loads(stdout)
+    if task_dict.get('status') in {'pending', 'running', 'aborting'}:
+        return None
+    return Task._from_dict({'id': handle.id, **task_dict})
+
+
+def _task_handle_from_output(stdout: str, stderr: str, unit: str) -> TaskHandle:
+    # Juju outputs something like "Scheduled operation 1 with task 2" (on stderr).
+    match = re.search(r'\btask (\d+)', stderr + '\n' + stdout)
+    if match is None:
+        raise ValueError(f'task ID not found in output, stdout:\n{stdout}\nstderr:\n{stderr}')
+    return TaskHandle(id=match.group(1), unit=unit)
+
+
+def _trust_args(app: str, *, remove: bool, scope: Literal['cluster'] | None) -> list[str]:
+    args = ['trust', app]
+    if remove:
+        args.append('--remove')
+    if scope is not None:
+        args.extend(['--scope', scope])
+    return args
+
+
+def _update_secret_args(
+    identifier: str | SecretURI, *, info: str | None, name: str | None, auto_prune: bool
+) -> list[str]:
+    args = ['update-secret', identifier]
+    if info is not None:
+        args.extend(['--info', info])
+    if name is not None:
+        args.extend(['--name', name])
+    if auto_prune:
+        args.append('--auto-prune')
+    return args
+
+
+_VERSION_ARGS = ('version', '--format', 'json', '--all')
+
+
+class _Waiter:
+    """Per-poll logic of :meth:`Juju.wait`, shared with :meth:`AsyncJuju.wait`."""
+
+    def __init__(
+        self,
+        ready: Callable[[Any], bool],
+        *,
+        error: Callable[[Any], bool] | None,
+        successes: int,
+        delay: float,
+        backoff: Backoff | None,
+        loads: Callable[[str], Any],
+        raw: bool = False,
+    ):
+        self._ready = ready
+        self._error = error
+        self._successes = successes
+        self._success_count = 0
+        self._delay = delay
+        self._backoff = backoff
+        self._unchanged = 0
+        self._loads = loads
+        self._raw = raw
+        self._cache = _StatusCache()
+        self.polls = 0
+        # This is a Status, or the decoded "juju status" output if raw is true.
+        self.status: Any = None
+
+    def update(self, stdout: str) -> Any:
+        """Process the output of "juju status" and return the status if the wait is done.
+
+        Raises:
+            WaitError: If the *error* callable returns ``True``.
+        """
+        prev_status = self.status
+        output = self._loads(stdout)
+        status = output if self._raw else Status._from_dict(output, self._cache)
+        self.status = status
+        self.polls += 1
+
+        if status != prev_status:
+            self._unchanged = 0
+            # Computing the diff parses every field of the status, so only do it if it'll
+            # be logged.
+            if logger_wait.isEnabledFor(logging.INFO):
+                diff = _status_diff(prev_status, status)
+                if diff:
+                    logger_wait.info('wait: status changed:\n%s', diff)
+        else:
+            self._unchanged += 1
+
+        if self._error is not None and self._error(status):
+            name = getattr(self._error, '__qualname__', repr(self._error))
+            raise WaitError(f'error function {name} returned true\n{_pretty.dump(status)}')
+
+        if self._ready(status):
+            self._success_count += 1
+            if self._success_count >= self._successes:
+                logger_wait.debug('wait: ready after %d status polls', self.polls)
+                return status
+        else:
+            self._success_count = 0
+        return None
+
+    @property
+    def idle(self) -> bool:
+        """Report whether the status was unchanged on the last poll (outside a success streak)."""
+        return self._unchanged > 0 and not self._success_count
+
+    def next_delay(self) -> float:
+        """Return the delay in seconds before the next status poll."""
+        if self._backoff is None:
+            return self._delay
+        # Poll at the initial rate while waiting for successive successes, so that a ready
+        # status isn't delayed by a backoff built up earlier.
+        unchanged = 0 if self._success_count else self._unchanged
+        return self._backoff.delay(unchanged)
+
+    def timeout_error(self, timeout: float) -> TimeoutError:
+        """Return the exception to raise when the wait times out."""
+        message = f'wait timed out after {timeout}s ({self.polls} status polls)'
+        if self.status is None:
+            return TimeoutError(message)
+        return TimeoutError(f'{message}\n{_pretty.dump(self.status)}')
+
+
+# "ran <hook> hook" lines are logged by this module, so following it (rather than the whole log)
+# keeps the debug-log traffic down to roughly one line per hook execution.
+_HOOK_LOG_ARGS = (
+    'debug-log',
+    '--lines',
+    '0',
+    '--level',
+    'INFO',
+    '--include-module',
+    'juju.worker.uniter.operation',
+)
+
+
+class _LogWatcher:
+    """Follows "juju debug-log" in a background thread, noting when hooks run."""
+
+    def __init__(self, args: list[str]):
+        self._process = subprocess.Popen(
+            args, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, encoding='utf-8'
+        )
+        self._event = threading.Event()
+        self._thread = threading.Thread(target=self._read, daemon=True)
+        self._thread.start()
+
+    def _read(self) -> None:
+        assert self._process.stdout is not None
+        for _ in self._process.stdout:
+            self._event.set()
+
+    def activity(self) -> bool:
+        """Report whether a hook has run since the last call."""
+        if not self._event.is_set():
+            return False
+        self._event.clear()
+        return True
+
+    def close(self) -> None:
+        """Stop following the log."""
+        self._process.terminate()
+        try:
+            self._process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+            self._process.wait()
+        self._thread.join()
+
+
+class _TaskPoller:
+    """Per-poll logic of :meth:`Juju.wait_tasks`, shared with :meth:`AsyncJuju.wait_tasks`."""
+
+    def __init__(
+        self,
+        handles: Iterable[TaskHandle],
+        *,
+        delay: float,
+        max_delay: float,
+        loads: Callable[[str], Any],
+    ):
+        self._handles = list(handles)
+        self._loads = loads
+        self._tasks: dict[TaskHandle, Task] = {}
+        self._backoff = Backoff(initial=delay, maximum=max_delay)
+        self._unchanged = 0
+        self._progress = False
+
+    def pending(self) -> list[TaskHandle]:
+        """Return the handles of the tasks that haven't finished yet."""
+        return [h for h in dict.fromkeys(self._handles) if h not in self._tasks]
+
+    def update(self, handle: TaskHandle, stdout: str) -> None:
+        """Process the output of "juju show-task" for the given task."""
+        task = _task_from_show_task(stdout, handle, loads=self._loads)
+        if task is not None:
+            self._tasks[handle] = task
+            self._progress = True
+
+    def next_delay(self) -> float:
+        """Return the delay before the next poll, resetting it if any task has finished."""
+        if self._progress:
+            self._unchanged = 0
+            self._progress = False
+        delay = self._backoff.delay(self._unchanged)
+        self._unchanged += 1
+        return delay
+
+    def results(self) -> list[Task]:
+        """Return the finished tasks, in the same order as the handles."""
+        return [self._tasks[h] for h in self._handles]
+
+    def timeout_error(self, timeout: float) -> TimeoutError:
+        """Return the exception to raise when the wait times out."""
+        pending = ', '.join(f'{h.id} ({h.unit})' for h in self.pending())
+        return TimeoutError(f'wait_tasks timed out after {timeout}s, pending tasks: {pending}')
+
+
+def _status_diff(old: object, new: object) -> str:
+    """Return a line-based diff of two status objects (or two raw status dicts)."""
+    lines = ('+ ' + line for line in _pretty.gron(new)) if old is None else _pretty.diff(old, new)
+    return '\n'.join(line for line in lines if _status_line_ok(line[2:]))
 
 
 def _status_line_ok(line: str) -> bool:
     """Return whether the status line should be included in the diff."""
     # Exclude controller timestamp as it changes every update and is just noise.
     field, _, _ = line.partition(' = ')
-    if field == '.controller.timestamp':
+    if field in {'.controller.timestamp', "['controller']['timestamp']"}:
         return False
     # Exclude status-updated-since timestamps as they just add noise (and log lines already
     # include timestamps).
-    if field.endswith('.since'):
+    if field.endswith(('.since', "['since']")):
         return False
     return True
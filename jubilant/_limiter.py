@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import contextlib
+import dataclasses
+import os
+import threading
+import time
+from collections.abc import Generator
+from typing import Union
+
+import yaml
+
+from . import _yaml
+
+
+@dataclasses.dataclass(frozen=True)
+class LimiterStats:
+    """Metrics of a :class:`Limiter`, as returned by :meth:`Limiter.stats`."""
+
+    commands: int
+    """Number of commands that have acquired the limiter."""
+
+    delayed: int
+    """Number of commands that had to wait for the limiter."""
+
+    total_wait: float
+    """Total time in seconds that commands waited for the limiter."""
+
+    max_wait: float
+    """Longest time in seconds that a command waited for the limiter."""
+
+
+class Limiter:
+    """Limits how many Juju CLI commands run at once, and how often they start.
+
+    A limiter applies to all :class:`Juju` and :class:`AsyncJuju` instances in the process
+    whose model is on a given controller; see :func:`limit_controller`.
+
+    Args:
+        max_concurrent: Maximum number of commands to run at once, or None for no limit.
+        rate: Maximum number of commands to start per second (on average), or None for no limit.
+        burst: Number of commands that can start at once, without waiting, when the rate limit
+            hasn't been reached recently.
+    """
+
+    def __init__(
+        self, max_concurrent: int | None = None, *, rate: float | None = None, burst: int = 1
+    ):
+        self.max_concurrent = max_concurrent
+        self.rate = rate
+        self.burst = burst
+        self._lock = threading.Lock()
+        # Commands holding a place, and commands waiting for one (in order). A waiter is a
+        # threading.Event for a thread, or a (loop, future) pair for a coroutine, so that
+        # threads and event loops share the limit without polling.
+        self._running = 0
+        self._waiters: collections.deque[_Waiter] = collections.deque()
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._commands = 0
+        self._delayed = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def __repr__(self) -> str:
+        return f'Limiter({self.max_concurrent}, rate={self.rate}, burst={self.burst})'
+
+    @contextlib.contextmanager
+    def acquire(self) -> Generator[None]:
+        """Context manager that waits until a command can start, and holds its place till done."""
+        self._acquire()
+        try:
+            yield
+        finally:
+            self._release()
+
+    def stats(self) -> LimiterStats:
+        """Return metrics about how much commands have been delayed by this limiter."""
+        with self._lock:
+            return LimiterStats(
+                commands=self._commands,
+                delayed=self._delayed,
+                total_wait=self._total_wait,
+                max_wait=self._max_wait,
+            )
+
+    def _acquire(self) -> None:
+        start = time.monotonic()
+        with self._lock:
+            event = None
+            if not self._take_place():
+                event = threading.Event()
+                self._waiters.append(event)
+        if event is not None:
+            # _wake() hands the place to this thread before setting the event.
+            event.wait()
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+        self._record(time.monotonic() - start)
+
+    async def _acquire_async(self) -> None:
+        start = time.monotonic()
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            waiter = None
+            if not self._take_place():
+                waiter = (loop, loop.create_future())
+                self._waiters.append(waiter)
+        try:
+            if waiter is not None:
+                await waiter[1]
+            delay = self._reserve()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        except BaseException:
+            # Cancelled while waiting. If the place hasn't been handed over yet, stop waiting
+            # for it, otherwise give it back.
+            with self._lock:
+                if waiter is not None and waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                    raise
+            self._release()
+            raise
+        self._record(time.monotonic() - start)
+
+    def _configure(self, max_concurrent: int | None, rate: float | None, burst: int) -> None:
+        """Change the limits in place, keeping track of commands already running.
+
+        If *max_concurrent* is lowered below the number of commands running, those commands
+        finish, and new ones wait until fewer than *max_concurrent* are running.
+        """
+        with self._lock:
+            self.max_concurrent = max_concurrent
+            if rate != self.rate or burst != self.burst:
+                self._tokens = float(burst)
+                self._updated = time.monotonic()
+            self.rate = rate
+            self.burst = burst
+            self._wake()
+
+    def _take_place(self) -> bool:
+        """Take a place for a command if one is free and nobody is waiting (lock held)."""
+        if self._waiters or (
+            self.max_concurrent is not None and self._running >= self.max_concurrent
+        ):
+            return False
+        self._running += 1
+        return True
+
+    def _wake(self) -> None:
+        """Hand free places to waiters, in the order they started waiting (lock held)."""
+        while self._waiters and (
+            self.max_concurrent is None or self._running < self.max_concurrent
+        ):
+            waiter = self._waiters.popleft()
+            self._running += 1
+            if isinstance(waiter, threading.Event):
+                waiter.set()
+            else:
+                loop, future = waiter
+                loop.call_soon_threadsafe(_set_result, future)
+
+    def _reserve(self) -> float:
+        """Take a token for the rate limit, and return how long to wait before starting."""
+        if self.rate is None:
+            return 0.0
+        with self._lock:
+            # Token bucket: refill at *rate* tokens per second, up to *burst* tokens. Take a
+            # token even if there isn't one, and wait for it to be refilled.
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return -self._tokens / self.rate
+
+    def _record(self, wait: float) -> None:
+        with self._lock:
+            self._commands += 1
+            if wait > 0:
+                self._delayed += 1
+                self._total_wait += wait
+                self._max_wait = max(self._max_wait, wait)
+
+    def _release(self) -> None:
+        with self._lock:
+            self._running -= 1
+            self._wake()
+
+
+_Waiter = Union[threading.Event, 'tuple[asyncio.AbstractEventLoop, asyncio.Future[None]]']
+
+
+def _set_result(future: asyncio.Future[None]) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+_lock = threading.Lock()
+_settings: dict[str | None, tuple[int | None, float | None, int]] = {}
+_limiters: dict[str, Limiter] = {}
+_current: tuple[str, int, str] | None = None  # (path, mtime_ns, controller) of controllers.yaml
+
+
+def limit_controller(
+    controller: str | None = None,
+    *,
+    max_concurrent: int | None = None,
+    rate: float | None = None,
+    burst: int = 1,
+) -> None:
+    """Limit the Juju CLI commands run on a controller by this process.
+
+    This applies to all :class:`Juju` and :class:`AsyncJuju` instances whose model is on the
+    controller, which is taken from the ``<controller>:`` prefix of the model name, or is the
+    current controller if there's no prefix. It bounds the load on the controller when many
+    instances (for example, waiting on many models) use the same controller at once. Limits
+    are per process, so with several processes, divide the limits between them. Calling this
+    again changes the limits straight away, and commands already running count towards the
+    new limits.
+
+    Example::
+
+        # At most 4 commands at once, starting at most 2 per second, on any controller.
+        jubilant.limit_controller(max_concurrent=4, rate=2)
+
+    Args:
+        controller: Name of the controller, or None to set the limits for every controller that
+            doesn't have its own.
+        max_concurrent: Maximum number of commands to run at once, or None for no limit.
+        rate: Maximum number of commands to start per second, or None for no limit.
+        burst: Number of commands that can start at once when under the rate limit.
+    """
+    with _lock:
+        if max_concurrent is None and rate is None:
+            _settings.pop(controller, None)
+        else:
+            _settings[controller] = (max_concurrent, rate, burst)
+        # Update existing limiters in place, so commands already running under the old limits
+        # still count towards the new ones. Drop those for controllers no longer limited.
+        for name, limiter in list(_limiters.items()):
+            settings = _settings.get(name, _settings.get(None))
+            if settings is None:
+                del _limiters[name]
+            else:
+                limiter._configure(*settings)
+
+
+def controller_limiter(controller: str) -> Limiter | None:
+    """Return the :class:`Limiter` for the given controller, or None if it has no limits.
+
+    Use this to see how long commands are waiting for the limits (see :meth:`Limiter.stats`).
+    """
+    with _lock:
+        settings = _settings.get(controller, _settings.get(None))
+        if settings is None:
+            return None
+        limiter = _limiters.get(controller)
+        if limiter is not None:
+            return limiter
+        max_concurrent, rate, burst = settings
+        limiter = Limiter(max_concurrent, rate=rate, burst=burst)
+        _limiters[controller] = limiter
+        return limiter
+
+
+def limiter_for_model(model: str | None) -> Limiter | None:
+    """Return the limiter that applies to CLI commands on *model*, if any."""
+    if not _settings:
+        return None
+    if model is not None and ':' in model:
+        controller, _, _ = model.partition(':')
+    else:
+        controller = _current_controller()
+    return controller_limiter(controller)
+
+
+def _current_controller() -> str:
+    """Return the name of the current controller from the Juju client store, or '' if unknown.
+
+    The result is cached until controllers.yaml changes, as this is called for every command.
+    """
+    global _current
+
+    juju_data = os.environ.get('JUJU_DATA') or os.path.expanduser('~/.local/share/juju')
+    path = os.path.join(juju_data, 'controllers.yaml')
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return ''
+    current = _current
+    if current is not None and current[:2] == (path, mtime):
+        return current[2]
+    try:
+        with open(path) as f:
+            controllers = _yaml.safe_load(f)
+    except (OSError, yaml.YAMLError):
+        return ''
+    controller = ''
+    if isinstance(controllers, dict):
+        controller = str(controllers.get('current-controller') or '')  # type: ignore
+    _current = (path, mtime, controller)
+    return controller
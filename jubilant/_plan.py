@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import concurrent.futures
+import dataclasses
+import inspect
+import logging
+import pathlib
+from collections.abc import Callable, Iterable, Mapping
+from typing import Any
+
+from ._juju import ConfigValue, Juju
+
+logger = logging.getLogger('jubilant')
+
+
+@dataclasses.dataclass(frozen=True)
+class _Step:
+    description: str
+    call: Callable[[Juju], object]
+    apps: tuple[str, ...]
+    """Applications that must be deployed (if they're deployed by the plan) before this step."""
+    is_config: bool = False
+
+
+class DeploymentPlan:
+    """Builder for deploying and integrating several applications, as concurrently as possible.
+
+    Add steps with :meth:`deploy`, :meth:`integrate`, and :meth:`config`, then run them all with
+    :meth:`execute`. Deploys don't depend on each other, so they run concurrently. Each
+    integration runs as soon as both its applications have been deployed, and each config
+    change as soon as its application has been deployed. So setting up a model takes roughly as
+    long as its slowest chain of steps, rather than the sum of all the steps.
+
+    Config changes to an application are applied in the order they were added, and steps
+    added after a config change to an application (such as integrating it) wait for that
+    change, so the result doesn't depend on timing.
+
+    Steps that refer to applications not deployed by the plan (for example, ones already in the
+    model, or in another model) don't wait for anything.
+
+    Example::
+
+        plan = jubilant.DeploymentPlan()
+        plan.deploy('mysql-k8s', 'mysql', channel='8.0/stable', trust=True)
+        plan.deploy('wordpress-k8s', 'wordpress')
+        plan.deploy('traefik-k8s', 'ingress', trust=True)
+        plan.integrate('wordpress:database', 'mysql')
+        plan.integrate('wordpress', 'ingress')
+        plan.config('wordpress', {'initial_settings': 'user_name: admin'})
+        plan.execute(juju, max_workers=4)
+        juju.wait(jubilant.all_active)
+    """
+
+    def __init__(self):
+        self._steps: list[_Step] = []
+        self._deployed: dict[str, int] = {}  # application name to index of its deploy step
+
+    def __repr__(self) -> str:
+        return f'<DeploymentPlan: {", ".join(step.description for step in self._steps)}>'
+
+    def config(
+        self,
+        app: str,
+        values: Mapping[str, ConfigValue] | None = None,
+        *,
+        reset: str | Iterable[str] = (),
+    ) -> DeploymentPlan:
+        """Add a step that sets or resets config values of an application.
+
+        Args:
+            app: Application name to set config on.
+            values: Mapping of config names to values to set.
+            reset: Key or list of keys to reset to their defaults.
+
+        Returns:
+            The plan, so calls can be chained.
+        """
+        if values is None and not reset:
+            raise TypeError('config requires values or reset')
+        values = dict(values or {})
+
+        def call(juju: Juju) -> None:
+            juju.config(app, values, reset=reset)
+
+        self._steps.append(_Step(f'config {app}', call, (app,), is_config=True))
+        return self
+
+    def deploy(
+        self, charm: str | pathlib.Path, app: str | None = None, **kwargs: Any
+    ) -> DeploymentPlan:
+        """Add a step that deploys an application.
+
+        Args:
+            charm: Name of charm to deploy, or path to a local file (must start with ``/`` or
+                ``.``).
+            app: Application name within the model. Defaults to the charm name, so it's
+                required when deploying a local file.
+            kwargs: Other arguments to pass to :meth:`Juju.deploy`, for example *channel* or
+                *num_units*.
+
+        Returns:
+            The plan, so calls can be chained.
+        """
+        # Check the arguments now, rather than when the plan has been half executed.
+        inspect.signature(Juju.deploy).bind(None, charm, app, **kwargs)
+        if app is not None:
+            name = app
+        elif isinstance(charm, pathlib.Path) or charm.startswith(('.', '/')):
+            raise ValueError(f'app name is required to deploy local charm {charm}')
+        else:
+            name = charm
+        if name in self._deployed:
+            raise ValueError(f'application {name!r} is already deployed by this plan')
+
+        def call(juju: Juju) -> None:
+            juju.deploy(charm, app, **kwargs)
+
+        self._deployed[name] = len(self._steps)
+        self._steps.append(_Step(f'deploy {name}', call, ()))
+        return self
+
+    def integrate(
+        self, app1: str, app2: str, *, via: str | Iterable[str] | None = None
+    ) -> DeploymentPlan:
+        """Add a step that integrates two applications, once both have been deployed.
+
+        Args:
+            app1: One of the applications (and endpoints) to integrate, in the format
+                ``<application>[:<endpoint>]``.
+            app2: The other of the applications (and endpoints) to integrate.
+            via: Source of traffic for a cross-model integration, in CIDR notation.
+
+        Returns:
+            The plan, so calls can be chained.
+        """
+
+        def call(juju: Juju) -> None:
+            juju.integrate(app1, app2, via=via)
+
+        apps = (app1.partition(':')[0], app2.partition(':')[0])
+        self._steps.append(_Step(f'integrate {app1} {app2}', call, apps))
+        return self
+
+    def execute(self, juju: Juju, *, max_workers: int = 8) -> None:
+        """Run the plan's steps on the given model, as concurrently as their dependencies allow.
+
+        If a step fails, no more steps are started; the ones already running are allowed to
+        finish, and then the first error is raised.
+
+        Args:
+            juju: The :class:`Juju` instance for the model to deploy to.
+            max_workers: Maximum number of steps to run at once.
+
+        Raises:
+            CLIError: If a step's CLI command fails.
+        """
+        # Build the dependency graph: each step depends on the deploy steps of its apps, and on
+        # the most recent config step (before it in the plan) of each of its apps.
+        waiting_for = [0] * len(self._steps)
+        dependents: list[list[int]] = [[] for _ in self._steps]
+        last_config: dict[str, int] = {}  # application name to index of its latest config step
+        for i, step in enumerate(self._steps):
+            deploys = (self._deployed[app] for app in step.apps if app in self._deployed)
+            configs = (last_config[app] for app in step.apps if app in last_config)
+            for index in dict.fromkeys([*deploys, *configs]):
+                waiting_for[i] += 1
+                dependents[index].append(i)
+            if step.is_config:
+                last_config.update(dict.fromkeys(step.apps, i))
+
+        error: BaseException | None = None
+        with concurrent.futures.ThreadPoolExecutor(max_workers) as pool:
+            running: dict[concurrent.futures.Future[object], int] = {}
+
+            def start(index: int) -> None:
+                step = self._steps[index]
+                logger.info('plan: %s', step.description)
+                running[pool.submit(step.call, juju)] = index
+
+            for i, count in enumerate(waiting_for):
+                if count == 0:
+                    start(i)
+            while running:
+                done, _ = concurrent.futures.wait(
+                    running, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    index = running.pop(future)
+                    if future.cancelled():
+                        continue
+                    exc = future.exception()
+                    if exc is not None:
+                        if error is None:
+                            error = exc
+                            # Don't start steps that are queued but not yet running.
+                            for other in running:
+                                other.cancel()
+                        continue
+                    if error is not None:
+                        continue
+                    for dependent in dependents[index]:
+                        waiting_for[dependent] -= 1
+                        if waiting_for[dependent] == 0:
+                            start(dependent)
+
+        if error is not None:
+            raise error
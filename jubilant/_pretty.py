@@ -1,8 +1,7 @@
 from __future__ import annotations
 
 import dataclasses
-import difflib
-from collections.abc import Generator, Sequence
+from collections.abc import Generator
 from typing import cast
 
 _MAX_VALUE = 150
@@ -120,24 +119,74 @@ def gron(value: object, prefix: str = '') -> Generator[str]:
         yield f'{prefix} = {value!r}'
 
 
-def diff(seq1: Sequence[str], seq2: Sequence[str]) -> Generator[str]:
-    """Compare seq1 and seq1; yield lines that have been removed, changed, or added.
+def diff(old: object, new: object, prefix: str = '') -> Generator[str]:
+    """Compare two values; yield gron-style lines that have been removed, changed, or added.
+
+    Dataclasses, dicts, and lists are walked in parallel (dicts by key and lists by index), and
+    subtrees that are equal are skipped without being flattened, so the cost is proportional to
+    the size of the change rather than the size of the values.
 
     Example::
 
         - .apps['database'].app_status.current = 'active'
         + .apps['database'].app_status.current = 'waiting'
         - .apps['database'].relations['db'][0].scope = 'global'
+        + .apps['database'].relations['db'][0].scope = 'testy'
         - .apps['database'].relations['db'][1].related_app = 'dummy'
         - .apps['database'].relations['db'][1].interface = 'xyz'
         - .apps['database'].relations['db'][1].scope = 'foobar'
-        + .apps['database'].relations['db'][0].scope = 'testy'
     """
-    matcher = difflib.SequenceMatcher(None, seq1, seq2)
-    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
-        if tag in {'replace', 'delete'}:
-            for line in seq1[i1:i2]:
-                yield '- ' + line
-        if tag in {'replace', 'insert'}:
-            for line in seq2[j1:j2]:
-                yield '+ ' + line
+    if old is new:
+        return
+
+    if dataclasses.is_dataclass(old) and not isinstance(old, type) and type(old) is type(new):
+        for field in dataclasses.fields(old):
+            old_v = getattr(old, field.name)
+            new_v = getattr(new, field.name)
+            # Like gron, treat fields set to their default as absent.
+            old_present = not _is_default(field, old_v)
+            new_present = not _is_default(field, new_v)
+            sub_prefix = f'{prefix}.{field.name}'
+            if old_present and new_present:
+                if old_v is not new_v and old_v != new_v:
+                    yield from diff(old_v, new_v, sub_prefix)
+            elif old_present:
+                yield from ('- ' + line for line in gron(old_v, sub_prefix))
+            elif new_present:
+                yield from ('+ ' + line for line in gron(new_v, sub_prefix))
+
+    elif isinstance(old, list) and isinstance(new, list):
+        old_list = cast('list[object]', old)
+        new_list = cast('list[object]', new)
+        for i, (old_v, new_v) in enumerate(zip(old_list, new_list)):
+            if old_v is not new_v and old_v != new_v:
+                yield from diff(old_v, new_v, f'{prefix}[{i}]')
+        for i in range(len(new_list), len(old_list)):
+            yield from ('- ' + line for line in gron(old_list[i], f'{prefix}[{i}]'))
+        for i in range(len(old_list), len(new_list)):
+            yield from ('+ ' + line for line in gron(new_list[i], f'{prefix}[{i}]'))
+
+    elif isinstance(old, dict) and isinstance(new, dict):
+        old_dict = cast('dict[str, object]', old)
+        new_dict = cast('dict[str, object]', new)
+        for k in sorted(old_dict.keys() | new_dict.keys()):
+            sub_prefix = f'{prefix}[{k!r}]'
+            if k not in new_dict:
+                yield from ('- ' + line for line in gron(old_dict[k], sub_prefix))
+            elif k not in old_dict:
+                yield from ('+ ' + line for line in gron(new_dict[k], sub_prefix))
+            elif old_dict[k] is not new_dict[k] and old_dict[k] != new_dict[k]:
+                yield from diff(old_dict[k], new_dict[k], sub_prefix)
+
+    elif old != new:
+        # Scalars, or values of different types.
+        yield from ('- ' + line for line in gron(cast('object', old), prefix))
+        yield from ('+ ' + line for line in gron(new, prefix))
+
+
+def _is_default(field: dataclasses.Field[object], value: object) -> bool:
+    if field.default is not dataclasses.MISSING and value == field.default:
+        return True
+    if field.default_factory is not dataclasses.MISSING and value == field.default_factory():
+        return True
+    return False
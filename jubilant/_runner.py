@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import json
+import select
+import subprocess
+import threading
+from collections.abc import Sequence
+from typing import Protocol
+
+# How long past a command's timeout to wait for the worker's reply before giving up on it.
+_TIMEOUT_SLACK = 10.0
+
+
+class Runner(Protocol):
+    """Protocol for running Juju CLI commands, to replace starting a ``juju`` process per command.
+
+    Pass an object that implements this to :class:`Juju` (or :class:`AsyncJuju`) as *runner*.
+    If no runner is specified, each command is run using :func:`subprocess.run`.
+    """
+
+    def run(
+        self, args: list[str], *, stdin: str | None, timeout: float | None
+    ) -> subprocess.CompletedProcess[str]:
+        """Run a command and return its result.
+
+        Args:
+            args: Full command line, including the Juju binary, for example
+                ``['juju', 'status', '--format', 'json']``.
+            stdin: Standard input to send to the command.
+            timeout: Timeout in seconds for the command.
+
+        Returns:
+            The completed process, with its return code, stdout, and stderr. A nonzero return
+            code should be returned, not raised.
+
+        Raises:
+            subprocess.TimeoutExpired: If the *timeout* is reached.
+        """
+        ...
+
+
+class WorkerRunner:
+    """Runner that sends each command to a long-lived worker process.
+
+    Starting the ``juju`` binary takes a significant amount of time per command (for example,
+    loading the client store and connecting to the controller). A worker that stays running can
+    do that once, and then run many commands back to back without the startup cost.
+
+    The worker is started on the first command, and restarted if it exits. Commands are sent to
+    the worker's stdin and results read from its stdout, one JSON object per line. Each request
+    is like ``{"args": ["juju", "status", "--format", "json"], "stdin": null, "timeout": 60}``,
+    and the worker must reply with ``{"returncode": 0, "stdout": "...", "stderr": "..."}``. If
+    the command times out, the reply should include ``"timeout": true``. Commands are sent one
+    at a time, so a runner can be shared by threads.
+
+    If the worker doesn't reply within a command's timeout (plus some slack), the worker is
+    killed, :class:`subprocess.TimeoutExpired` is raised, and a new worker is started for the
+    next command.
+
+    Example::
+
+        with jubilant.WorkerRunner(['my-juju-worker']) as runner:
+            juju = jubilant.Juju(model='m', runner=runner)
+            juju.deploy('snappass-test')
+            juju.wait(jubilant.all_active)
+
+    Args:
+        command: Command line to start the worker.
+    """
+
+    def __init__(self, command: Sequence[str]):
+        self._command = list(command)
+        self._process: subprocess.Popen[str] | None = None
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> WorkerRunner:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def run(
+        self, args: list[str], *, stdin: str | None, timeout: float | None
+    ) -> subprocess.CompletedProcess[str]:
+        """Send a command to the worker and return its result."""
+        request = json.dumps({'args': args, 'stdin': stdin, 'timeout': timeout})
+        with self._lock:
+            process = self._start()
+            assert process.stdin is not None
+            assert process.stdout is not None
+            try:
+                process.stdin.write(request + '\n')
+                process.stdin.flush()
+                if timeout is not None:
+                    ready, _, _ = select.select([process.stdout], [], [], timeout + _TIMEOUT_SLACK)
+                    if not ready:
+                        # The worker is stuck, so don't let it block every later command.
+                        self._stop(kill=True)
+                        raise subprocess.TimeoutExpired(args, timeout)
+                line = process.stdout.readline()
+            except BrokenPipeError:
+                line = ''
+            if not line:
+                self._stop()
+                raise RuntimeError(f'worker {self._command[0]!r} exited unexpectedly')
+
+        response = json.loads(line)
+        stdout: str = response.get('stdout', '')
+        stderr: str = response.get('stderr', '')
+        if response.get('timeout'):
+            raise subprocess.TimeoutExpired(args, timeout or 0, stdout, stderr)
+        return subprocess.CompletedProcess(args, response['returncode'], stdout, stderr)
+
+    def close(self) -> None:
+        """Stop the worker process, if it's running."""
+        with self._lock:
+            self._stop()
+
+    def _start(self) -> subprocess.Popen[str]:
+        if self._process is None or self._process.poll() is not None:
+            self._process = subprocess.Popen(
+                self._command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                encoding='utf-8',
+            )
+        return self._process
+
+    def _stop(self, *, kill: bool = False) -> None:
+        process = self._process
+        if process is None:
+            return
+        self._process = None
+        assert process.stdin is not None
+        try:
+            if kill:
+                process.kill()
+            # Closing stdin tells the worker to exit.
+            process.stdin.close()
+            process.wait(timeout=5)
+        except (BrokenPipeError, subprocess.TimeoutExpired):
+            process.kill()
+            process.wait()
+        if process.stdout is not None:
+            process.stdout.close()
@@ -98,3 +98,17 @@ class Task:
         """If task was not successful, raise a :class:`TaskError`."""
         if not self.success:
             raise TaskError(self)
+
+
+@dataclasses.dataclass(frozen=True)
+class TaskHandle:
+    """A handle to an action or exec command that Juju is running in the background.
+
+    Use :meth:`Juju.wait_tasks` to wait for background tasks to finish and get their results.
+    """
+
+    id: str
+    """Task ID of the action, for use with ``juju show-task``."""
+
+    unit: str
+    """Name of the unit the task is running on (or the machine ID, for exec on a machine)."""
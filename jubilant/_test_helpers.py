@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import atexit
+import concurrent.futures
 import contextlib
 import logging
+import queue
 import secrets
 import subprocess
+import threading
 from collections.abc import Mapping
 from typing import Generator
 
@@ -19,6 +23,8 @@ def temp_model(
     cloud: str | None = None,
     config: Mapping[str, ConfigValue] | None = None,
     credential: str | None = None,
+    pool: ModelPool | None = None,
+    destroy_in_background: bool = False,
 ) -> Generator[Juju]:
     """Context manager to create a temporary model for running tests in.
 
@@ -47,25 +53,293 @@ def temp_model(
         config: Temporary model configuration as key-value pairs, for example,
             ``{'image-stream': 'daily'}``.
         credential: Name of cloud credential to use for the temporary model.
+        pool: If specified, take an empty model from this :class:`ModelPool` instead of creating
+            one, and give it back to the pool (which destroys it in the background) when the
+            context manager exits. The model parameters must be set on the pool instead.
+        destroy_in_background: If true, start destroying the model when the context manager
+            exits, but don't wait for it to be destroyed, so the next test can start straight
+            away. Use :func:`wait_model_teardowns` to wait for models being destroyed; this is
+            also done (with the default timeout) when the Python process exits.
     """
-    juju = Juju()
-    model = 'jubilant-' + secrets.token_hex(4)  # 4 bytes (8 hex digits) should be plenty
-    juju.add_model(model, cloud=cloud, controller=controller, config=config, credential=credential)
+    if pool is not None:
+        if (
+            controller is not None
+            or cloud is not None
+            or config is not None
+            or credential is not None
+        ):
+            raise TypeError('controller, cloud, config and credential must be set on the pool')
+        juju = pool.acquire()
+        try:
+            yield juju
+        finally:
+            pool.release(juju, keep=keep)
+        return
+
+    juju = _add_temp_model(
+        controller=controller, cloud=cloud, config=config, credential=credential
+    )
     try:
         yield juju
     finally:
         if not keep:
-            assert juju.model is not None
+            if destroy_in_background:
+                _reaper.destroy(juju)
+            else:
+                _destroy_temp_model(juju)
+
+
+def wait_model_teardowns(timeout: float | None = 10 * 60) -> list[str]:
+    """Wait for models that :func:`temp_model` is destroying in the background.
+
+    This is called automatically when the Python process exits, but can be called sooner, for
+    example at the end of a test session, to report failures while the session's output is
+    still being shown::
+
+        @pytest.fixture(scope='session', autouse=True)
+        def model_teardowns():
+            yield
+            failed = jubilant.wait_model_teardowns()
+            assert not failed, f'models not destroyed: {failed}'
+
+    Args:
+        timeout: Maximum time in seconds to wait for all the models (in total, not per model),
+            or None to wait indefinitely.
+
+    Returns:
+        Names of models whose destruction failed or didn't finish in time. An error is logged
+        for each of these.
+    """
+    return _reaper.wait(timeout)
+
+
+class ModelPool:
+    """Pool of empty models, created in the background, for :func:`temp_model` to hand out.
+
+    Creating and destroying a model can take a while, so making every test module wait for both
+    adds up across a large test suite. A pool creates *size* models ahead of time, so that
+    ``temp_model(pool=pool)`` gets one immediately. Each time a model is handed out, the pool
+    starts creating a replacement. When a model is given back, it's destroyed in the background,
+    so the test run doesn't wait for it either.
+
+    Models that have been handed out are never reused, as tests may change a model in ways
+    that are hard to undo. Call :meth:`close` (or use as a context manager) at the end of the
+    test run to destroy the models the pool is holding, and to wait for models being destroyed.
+    Models are destroyed the same way as with ``temp_model(destroy_in_background=True)``, so
+    failures are reported by :func:`wait_model_teardowns` (or by :meth:`close`).
+
+    For example, in ``conftest.py``::
+
+        @pytest.fixture(scope='session')
+        def model_pool():
+            with jubilant.ModelPool(size=2) as pool:
+                yield pool
+
+        @pytest.fixture(scope='module')
+        def juju(model_pool: jubilant.ModelPool):
+            with jubilant.temp_model(pool=model_pool) as juju:
+                yield juju
+
+    Args:
+        size: Number of empty models to keep ready.
+        controller: Name of controller where the models will be added.
+        cloud: Name of cloud or region (or cloud/region) to use for the models.
+        config: Model configuration as key-value pairs, for example,
+            ``{'image-stream': 'daily'}``.
+        credential: Name of cloud credential to use for the models.
+        max_workers: Maximum number of models to create at once. Defaults to *size* plus one.
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        *,
+        controller: str | None = None,
+        cloud: str | None = None,
+        config: Mapping[str, ConfigValue] | None = None,
+        credential: str | None = None,
+        max_workers: int | None = None,
+    ):
+        self.size = size
+        self._controller = controller
+        self._cloud = cloud
+        self._config = config
+        self._credential = credential
+        self._ready: queue.Queue[Juju | Exception] = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers or size + 1, thread_name_prefix='jubilant-model-pool'
+        )
+        for _ in range(size):
+            self._executor.submit(self._create)
+
+    def __enter__(self) -> ModelPool:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def acquire(self, timeout: float | None = None) -> Juju:
+        """Take an empty model from the pool, waiting for one to be created if necessary.
+
+        Prefer using ``temp_model(pool=pool)``, which gives the model back when done.
+
+        Args:
+            timeout: Maximum time in seconds to wait for a model; :class:`queue.Empty` is raised
+                if this is reached. The default is to wait indefinitely.
+
+        Raises:
+            CLIError: If creating the model failed.
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError('model pool is closed')
+            # Start creating a replacement straight away, to keep the pool full.
+            self._executor.submit(self._create)
+        item = self._ready.get(timeout=timeout)
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    def release(self, juju: Juju, *, keep: bool = False) -> None:
+        """Give back a model taken from the pool, destroying it in the background.
+
+        Args:
+            juju: The :class:`Juju` instance returned by :meth:`acquire`.
+            keep: If true, keep the model (and don't destroy it).
+        """
+        if not keep:
+            _reaper.destroy(juju)
+
+    def close(self) -> None:
+        """Destroy the models the pool is holding, and wait for models being destroyed.
+
+        This waits for models that are being created, too, and destroys them. Errors destroying
+        models, including ``destroy-model`` timing out, are logged, as with
+        :func:`wait_model_teardowns`.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            while True:
+                try:
+                    item = self._ready.get_nowait()
+                except queue.Empty:
+                    break
+                if isinstance(item, Juju):
+                    _reaper.destroy(item)
+        self._executor.shutdown(wait=True)
+        _reaper.wait()
+
+    def _create(self) -> None:
+        try:
+            juju = _add_temp_model(
+                controller=self._controller,
+                cloud=self._cloud,
+                config=self._config,
+                credential=self._credential,
+            )
+        except Exception as e:
+            self._ready.put(e)
+            return
+        with self._lock:
+            if not self._closed:
+                self._ready.put(juju)
+                return
+        _reaper.destroy(juju)
+
+
+class _Reaper:
+    """Registry of models being destroyed in background threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: dict[str, concurrent.futures.Future[None]] = {}
+        self._atexit_registered = False
+
+    def destroy(self, juju: Juju) -> None:
+        """Start destroying a model in a background thread."""
+        assert juju.model is not None
+        future: concurrent.futures.Future[None] = concurrent.futures.Future()
+
+        def run():
             try:
-                # We're not using juju.destroy_model() here, as Juju doesn't provide a way
-                # to specify the timeout for the entire model destruction operation.
-                args = ['destroy-model', juju.model, '--no-prompt', '--destroy-storage', '--force']
-                juju._cli(*args, include_model=False, timeout=10 * 60)
-                juju.model = None
-            except subprocess.TimeoutExpired as exc:
-                logger.error(
-                    'timeout destroying model: %s\nStdout:\n%s\nStderr:\n%s',
-                    exc,
-                    exc.stdout,
-                    exc.stderr,
-                )
+                _destroy_temp_model(juju, raise_timeout=True)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(None)
+
+        with self._lock:
+            self._pending[juju.model] = future
+            if not self._atexit_registered:
+                atexit.register(self.wait)
+                self._atexit_registered = True
+        # A daemon thread, rather than a thread pool, so that exiting doesn't wait for it
+        # longer than the timeout in wait(). The "juju destroy-model" process keeps running.
+        threading.Thread(target=run, daemon=True).start()
+
+    def wait(self, timeout: float | None = 10 * 60) -> list[str]:
+        """Wait for models being destroyed, and return the names of those that weren't."""
+        with self._lock:
+            pending = dict(self._pending)
+        if not pending:
+            return []
+        logger.info('waiting for %d model(s) to be destroyed', len(pending))
+        done, _ = concurrent.futures.wait(pending.values(), timeout=timeout)
+
+        failed: list[str] = []
+        for model, future in pending.items():
+            if future not in done:
+                logger.error('timeout waiting for model %s to be destroyed', model)
+                failed.append(model)
+                continue
+            with self._lock:
+                del self._pending[model]
+            exc = future.exception()
+            if exc is not None:
+                logger.error('error destroying model %s: %s', model, exc)
+                failed.append(model)
+        return failed
+
+
+_reaper = _Reaper()
+
+
+def _add_temp_model(
+    *,
+    controller: str | None,
+    cloud: str | None,
+    config: Mapping[str, ConfigValue] | None,
+    credential: str | None,
+) -> Juju:
+    juju = Juju()
+    model = 'jubilant-' + secrets.token_hex(4)  # 4 bytes (8 hex digits) should be plenty
+    juju.add_model(model, cloud=cloud, controller=controller, config=config, credential=credential)
+    return juju
+
+
+def _destroy_temp_model(juju: Juju, *, raise_timeout: bool = False) -> None:
+    """Destroy a temporary model, logging an error if that takes longer than 10 minutes.
+
+    If *raise_timeout* is true, re-raise the timeout after logging it, so that the reaper
+    reports the model as not destroyed.
+    """
+    assert juju.model is not None
+    try:
+        # We're not using juju.destroy_model() here, as Juju doesn't provide a way
+        # to specify the timeout for the entire model destruction operation.
+        args = ['destroy-model', juju.model, '--no-prompt', '--destroy-storage', '--force']
+        juju._cli(*args, include_model=False, timeout=10 * 60)
+        juju.model = None
+    except subprocess.TimeoutExpired as exc:
+        logger.error(
+            'timeout destroying model: %s\nStdout:\n%s\nStderr:\n%s',
+            exc,
+            exc.stdout,
+            exc.stderr,
+        )
+        if raise_timeout:
+            raise
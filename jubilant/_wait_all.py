@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import concurrent.futures
+import time
+from collections.abc import Callable, Mapping
+
+from ._juju import Juju, _status_args, _Waiter
+from .statustypes import Status
+
+
+def wait_all(
+    ready: Mapping[Juju, Callable[[Status], bool]],
+    *,
+    error: Callable[[Status], bool] | None = None,
+    delay: float = 1.0,
+    timeout: float | None = None,
+    successes: int = 3,
+    max_concurrent: int = 4,
+) -> dict[Juju, Status | Exception]:
+    """Wait for several models at once, until each ``ready(status)`` returns ``True``.
+
+    This is like calling :meth:`Juju.wait` for each model in its own thread, but all the models
+    are polled by one scheduler: every *delay* seconds, the status of each model that's still
+    being waited for is fetched, with at most *max_concurrent* ``juju status`` commands running
+    at a time. This bounds the load on the controller, however many models are being waited for.
+
+    Example::
+
+        results = jubilant.wait_all({
+            juju1: jubilant.all_active,
+            juju2: lambda status: jubilant.all_blocked(status, 'app'),
+        })
+        for juju, result in results.items():
+            if isinstance(result, Exception):
+                raise result
+
+    Args:
+        ready: Mapping of :class:`Juju` instance (one per model) to the callable that reports
+            whether that model is ready. See the *ready* argument of :meth:`Juju.wait`.
+        error: Callable that takes a :class:`Status` object and returns ``True`` when waiting
+            for that model should fail with :class:`WaitError`.
+        delay: Delay in seconds between rounds of status calls.
+        timeout: Timeout in seconds for each model; if not specified, uses the *wait_timeout*
+            of each :class:`Juju` instance.
+        successes: Number of times *ready* must return ``True`` (in a row) for a model.
+        max_concurrent: Maximum number of ``juju status`` commands to run at once.
+
+    Returns:
+        Mapping of each :class:`Juju` instance, in the same order as *ready*, to either its last
+        status (if it became ready), or the exception raised while waiting for it, for example
+        :class:`TimeoutError`, :class:`WaitError`, or :class:`CLIError`.
+    """
+    waiters = {
+        juju: _Waiter(
+            is_ready,
+            error=error,
+            successes=successes,
+            delay=delay,
+            backoff=None,
+            loads=juju.json_loads,
+        )
+        for juju, is_ready in ready.items()
+    }
+    results: dict[Juju, Status | Exception] = {}
+    start = time.monotonic()
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_concurrent) as pool:
+        while True:
+            futures: dict[concurrent.futures.Future[Status | None], Juju] = {}
+            for juju, waiter in waiters.items():
+                if juju in results:
+                    continue
+                juju_timeout = timeout if timeout is not None else juju.wait_timeout
+                if time.monotonic() - start >= juju_timeout:
+                    results[juju] = waiter.timeout_error(juju_timeout)
+                    continue
+                futures[pool.submit(_poll, juju, waiter)] = juju
+
+            if not futures:
+                break
+
+            for future in concurrent.futures.as_completed(futures):
+                juju = futures[future]
+                try:
+                    status = future.result()
+                except Exception as e:
+                    results[juju] = e
+                    continue
+                if status is not None:
+                    results[juju] = status
+
+            if len(results) < len(waiters):
+                time.sleep(delay)
+
+    return {juju: results[juju] for juju in ready}
+
+
+def _poll(juju: Juju, waiter: _Waiter) -> Status | None:
+    stdout, _ = juju._cli(*_status_args(()), log=False)
+    return waiter.update(stdout)
@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import abc
+import dataclasses
+from collections.abc import Iterable, Mapping
+from typing import Callable, Literal
+
+from . import _all_any
+from .statustypes import Status
+
+# This is evaluated at runtime, so it uses typing.Callable (collections.abc.Callable isn't
+# subscriptable on Python 3.8).
+_Predicate = Callable[[Status], bool]
+
+
+class Condition(abc.ABC):
+    """Condition on a :class:`Status`, created by :func:`when`.
+
+    Conditions can be combined with ``&`` (and), ``|`` (or), and ``~`` (not), and called with a
+    :class:`Status` to test it, so they can be passed to :meth:`Juju.wait` as *ready* or *error*.
+
+    When a condition is called, all the ``all_*`` and ``any_*`` helpers in it are evaluated
+    together, in a single pass over the status. The pass stops as soon as the result of the whole
+    condition is known, for example at the first unit in error for ``~when(jubilant.any_error)``.
+    """
+
+    _checks: tuple[_StatusCheck, ...]
+
+    def __call__(self, status: Status) -> bool:
+        """Report whether *status* satisfies the condition."""
+        results: dict[_StatusCheck, bool] = {}
+        if self._checks:
+            _run_checks(self, status, results)
+        for check in self._checks:
+            # Checks not decided during the pass have their "nothing found" value.
+            results.setdefault(check, check.all)
+        value = self._evaluate(results, status)
+        assert value is not None
+        return value
+
+    def __and__(self, other: Condition | _Predicate) -> Condition:
+        return _And(self, _as_condition(other))
+
+    def __rand__(self, other: Condition | _Predicate) -> Condition:
+        return _And(_as_condition(other), self)
+
+    def __or__(self, other: Condition | _Predicate) -> Condition:
+        return _Or(self, _as_condition(other))
+
+    def __ror__(self, other: Condition | _Predicate) -> Condition:
+        return _Or(_as_condition(other), self)
+
+    def __invert__(self) -> Condition:
+        return _Not(self)
+
+    @abc.abstractmethod
+    def _evaluate(
+        self, results: Mapping[_StatusCheck, bool], status: Status | None
+    ) -> bool | None:
+        """Return the condition's value, or None if it's not known yet.
+
+        Checks that are missing from *results* are unknown. If *status* is None, the status is
+        still being walked, so other predicates are unknown too.
+        """
+
+
+def when(predicate: Callable[..., bool], *apps: str) -> Condition:
+    """Create a :class:`Condition` from a status predicate, to combine with other conditions.
+
+    Examples::
+
+        # Wait for blog and mysql to be active, failing if any app or unit goes into error.
+        juju.wait(
+            jubilant.when(jubilant.all_active, 'blog', 'mysql'),
+            error=jubilant.when(jubilant.any_error),
+        )
+
+        # Conditions can be combined with &, |, and ~.
+        juju.wait(
+            jubilant.when(jubilant.all_active) & jubilant.when(jubilant.all_agents_idle)
+            | jubilant.when(jubilant.all_blocked, 'mysql')
+        )
+
+    Args:
+        predicate: One of the ``all_*`` or ``any_*`` helpers, such as :func:`all_active`, or any
+            other callable that takes a :class:`Status` (and then *apps*) and returns a bool.
+        apps: If provided, these are passed to *predicate* after the status. For the ``all_*``
+            and ``any_*`` helpers, only these applications (and their units) are tested.
+    """
+    spec = _STATUS_CHECKS.get(predicate)
+    if spec is not None:
+        attr, all_, expected = spec
+        return _StatusCheck(predicate.__name__, attr, all_, expected, frozenset(apps))
+    return _PredicateCondition(predicate, apps)
+
+
+_Attr = Literal['workload', 'agent']
+
+_STATUS_CHECKS: dict[Callable[..., bool], tuple[_Attr, bool, str]] = {
+    _all_any.all_active: ('workload', True, 'active'),
+    _all_any.all_blocked: ('workload', True, 'blocked'),
+    _all_any.all_error: ('workload', True, 'error'),
+    _all_any.all_maintenance: ('workload', True, 'maintenance'),
+    _all_any.all_waiting: ('workload', True, 'waiting'),
+    _all_any.any_active: ('workload', False, 'active'),
+    _all_any.any_blocked: ('workload', False, 'blocked'),
+    _all_any.any_error: ('workload', False, 'error'),
+    _all_any.any_maintenance: ('workload', False, 'maintenance'),
+    _all_any.any_waiting: ('workload', False, 'waiting'),
+    _all_any.all_agents_idle: ('agent', True, 'idle'),
+}
+
+
+def _as_condition(value: Condition | _Predicate) -> Condition:
+    return value if isinstance(value, Condition) else when(value)
+
+
+def _merge_checks(*conditions: Condition) -> tuple[_StatusCheck, ...]:
+    return tuple(dict.fromkeys(check for c in conditions for check in c._checks))
+
+
+@dataclasses.dataclass(frozen=True)
+class _StatusCheck(Condition):
+    """One of the all_* or any_* helpers, with its arguments."""
+
+    name: str = dataclasses.field(compare=False)
+    attr: _Attr
+    all: bool
+    """True for all_* (all apps and units must match), False for any_* (any must match)."""
+    expected: str
+    apps: frozenset[str]
+
+    def __post_init__(self):
+        object.__setattr__(self, '_checks', (self,))
+
+    def __repr__(self) -> str:
+        args = ''.join(f', {app!r}' for app in sorted(self.apps))
+        return f'when({self.name}{args})'
+
+    def _evaluate(
+        self, results: Mapping[_StatusCheck, bool], status: Status | None
+    ) -> bool | None:
+        return results.get(self)
+
+    def _decides(self, currents: set[str]) -> bool:
+        """Report whether the given status values decide this check (as ``not self.all``)."""
+        if self.all:
+            return bool(currents - {self.expected})
+        return self.expected in currents
+
+
+class _PredicateCondition(Condition):
+    def __init__(self, predicate: Callable[..., bool], apps: Iterable[str]):
+        self._predicate = predicate
+        self._apps = tuple(apps)
+        self._checks = ()
+
+    def __repr__(self) -> str:
+        name = getattr(self._predicate, '__qualname__', repr(self._predicate))
+        args = ''.join(f', {app!r}' for app in self._apps)
+        return f'when({name}{args})'
+
+    def _evaluate(
+        self, results: Mapping[_StatusCheck, bool], status: Status | None
+    ) -> bool | None:
+        if status is None:
+            return None
+        return bool(self._predicate(status, *self._apps))
+
+
+class _And(Condition):
+    def __init__(self, left: Condition, right: Condition):
+        self._left = left
+        self._right = right
+        self._checks = _merge_checks(left, right)
+
+    def __repr__(self) -> str:
+        return f'({self._left!r} & {self._right!r})'
+
+    def _evaluate(
+        self, results: Mapping[_StatusCheck, bool], status: Status | None
+    ) -> bool | None:
+        left = self._left._evaluate(results, status)
+        if left is False:
+            return False
+        right = self._right._evaluate(results, status)
+        if right is False:
+            return False
+        if left is None or right is None:
+            return None
+        return True
+
+
+class _Or(Condition):
+    def __init__(self, left: Condition, right: Condition):
+        self._left = left
+        self._right = right
+        self._checks = _merge_checks(left, right)
+
+    def __repr__(self) -> str:
+        return f'({self._left!r} | {self._right!r})'
+
+    def _evaluate(
+        self, results: Mapping[_StatusCheck, bool], status: Status | None
+    ) -> bool | None:
+        left = self._left._evaluate(results, status)
+        if left is True:
+            return True
+        right = self._right._evaluate(results, status)
+        if right is True:
+            return True
+        if left is None or right is None:
+            return None
+        return False
+
+
+class _Not(Condition):
+    def __init__(self, condition: Condition):
+        self._condition = condition
+        self._checks = condition._checks
+
+    def __repr__(self) -> str:
+        return f'~{self._condition!r}'
+
+    def _evaluate(
+        self, results: Mapping[_StatusCheck, bool], status: Status | None
+    ) -> bool | None:
+        value = self._condition._evaluate(results, status)
+        return None if value is None else not value
+
+
+def _run_checks(condition: Condition, status: Status, results: dict[_StatusCheck, bool]) -> None:
+    """Walk *status* once, recording in *results* each check that's decided along the way.
+
+    Return early once the value of *condition* is known (after the app that decides it).
+    """
+    pending = list(condition._checks)
+
+    def decide(check: _StatusCheck) -> bool:
+        """Record *check* as decided and report whether the whole condition is now known."""
+        results[check] = not check.all
+        pending.remove(check)
+        return condition._evaluate(results, None) is not None
+
+    # As with the helpers, an all_* check fails if one of its apps isn't present.
+    for check in list(pending):
+        if check.all and not check.apps.issubset(status.apps) and decide(check):
+            return
+
+    for app, app_info in status.apps.items():
+        checks = [c for c in pending if not c.apps or app in c.apps]
+        if not checks:
+            continue
+        units = status.get_units(app)
+
+        # Collect the status values of the app and its units once, for all the checks.
+        workload: set[str] | None = None
+        agent: set[str] | None = None
+        for check in checks:
+            if check.attr == 'workload':
+                if workload is None:
+                    workload = {u.workload_status.current for u in units.values()}
+                    workload.add(app_info.app_status.current)
+                currents = workload
+            else:
+                if agent is None:
+                    agent = {u.juju_status.current for u in units.values()}
+                currents = agent
+            if check._decides(currents) and decide(check):
+                return
@@ -10,7 +10,9 @@ throughout, for brevity (and "application" to "app").
 from __future__ import annotations
 
 import dataclasses
-from typing import Any
+import sys
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any, NamedTuple, TypeVar
 
 from . import _pretty
 
@@ -42,7 +44,39 @@ __all__ = [
     'VolumeInfo',
 ]
 
+_T = TypeVar('_T')
 
+
+def _add_slots(cls: type[_T]) -> type[_T]:
+    """Recreate a frozen dataclass with ``__slots__``, to reduce its memory use.
+
+    This is what ``@dataclass(slots=True)`` does, but that's only available on Python 3.10+.
+    """
+    field_names = tuple(f.name for f in dataclasses.fields(cls))  # type: ignore
+    cls_dict = dict(cls.__dict__)
+    cls_dict['__slots__'] = field_names
+    for name in field_names:
+        # Remove default values, which would otherwise conflict with the slot descriptors.
+        cls_dict.pop(name, None)
+    cls_dict.pop('__dict__', None)
+    cls_dict.pop('__weakref__', None)
+    # Frozen dataclasses raise FrozenInstanceError on setattr, which breaks the default
+    # pickle and copy support for slots, so set the state directly instead.
+    cls_dict['__getstate__'] = _slots_getstate
+    cls_dict['__setstate__'] = _slots_setstate
+    return type(cls)(cls.__name__, cls.__bases__, cls_dict)
+
+
+def _slots_getstate(self: Any) -> list[Any]:
+    return [getattr(self, f.name) for f in dataclasses.fields(self)]
+
+
+def _slots_setstate(self: Any, state: list[Any]) -> None:
+    for field, value in zip(dataclasses.fields(self), state):
+        object.__setattr__(self, field.name, value)
+
+
+@_add_slots
 @dataclasses.dataclass(frozen=True)
 class FormattedBase:
     name: str
@@ -51,11 +85,12 @@ class FormattedBase:
     @classmethod
     def _from_dict(cls, d: dict[str, Any]) -> FormattedBase:
         return cls(
-            name=d['name'],
-            channel=d['channel'],
+            name=sys.intern(d['name']),
+            channel=sys.intern(d['channel']),
         )
 
 
+@_add_slots
 @dataclasses.dataclass(frozen=True)
 class StatusInfo:
     """The main status class used for application, unit, and machine status."""
@@ -72,15 +107,16 @@ class StatusInfo:
         if 'status-error' in d:
             return cls(current='failed', message=d['status-error'])
         return cls(
-            current=d.get('current') or '',
+            current=sys.intern(d.get('current') or ''),
             message=d.get('message') or '',
             reason=d.get('reason') or '',
             since=d.get('since') or '',
-            version=d.get('version') or '',
-            life=d.get('life') or '',
+            version=sys.intern(d.get('version') or ''),
+            life=sys.intern(d.get('life') or ''),
         )
 
 
+@_add_slots
 @dataclasses.dataclass(frozen=True)
 class AppStatusRelation:
     related_app: str = ''
@@ -96,6 +132,7 @@ class AppStatusRelation:
         )
 
 
+@_add_slots
 @dataclasses.dataclass(frozen=True)
 class UnitStatus:
     """Status of a single unit."""
@@ -165,6 +202,7 @@ class UnitStatus:
         return self.workload_status.current == 'waiting'
 
 
+@_add_slots
 @dataclasses.dataclass(frozen=True)
 class AppStatus:
     """Status of a single application."""
@@ -203,13 +241,13 @@ class AppStatus:
                 app_status=StatusInfo(current='failed', message=d['status-error']),
             )
         return cls(
-            charm=d['charm'],
-            charm_origin=d['charm-origin'],
-            charm_name=d['charm-name'],
+            charm=sys.intern(d['charm']),
+            charm_origin=sys.intern(d['charm-origin']),
+            charm_name=sys.intern(d['charm-name']),
             charm_rev=d['charm-rev'],
             exposed=d['exposed'],
             base=FormattedBase._from_dict(d['base']) if 'base' in d else None,
-            charm_channel=d.get('charm-channel') or '',
+            charm_channel=sys.intern(d.get('charm-channel') or ''),
             charm_version=d.get('charm-version') or '',
             charm_profile=d.get('charm-profile') or '',
             can_upgrade_to=d.get('can-upgrade-to') or '',
@@ -258,6 +296,7 @@ class AppStatus:
         return self.app_status.current == 'waiting'
 
 
+@_add_slots
 @dataclasses.dataclass(frozen=True)
 class EntityStatus:
     """Status class used for storage status. See :class:`StatusInfo` for the main status class."""
@@ -269,12 +308,13 @@ class EntityStatus:
     @classmethod
     def _from_dict(cls, d: dict[str, Any]) -> EntityStatus:
         return cls(
-            current=d.get('current') or '',
+            current=sys.intern(d.get('current') or ''),
             message=d.get('message') or '',
             since=d.get('since') or '',
         )
 
 
+@_add_slots
 @dataclasses.dataclass(frozen=True)
 class UnitStorageAttachment:
     machine: str = ''
@@ -290,6 +330,7 @@ class UnitStorageAttachment:
         )
 
 
+@_add_slots
 @dataclasses.dataclass(frozen=True)
 class StorageAttachments:
     units: dict[str, UnitStorageAttachment]
@@ -301,6 +342,7 @@ class StorageAttachments:
         )
 
 
+@_add_slots
 @dataclasses.dataclass(frozen=True)
 class StorageInfo:
     kind: str
@@ -323,6 +365,7 @@ class StorageInfo:
         )
 
 
+@_add_slots
 @dataclasses.dataclass(frozen=True)
 class FilesystemAttachment:
     mount_point: str
@@ -339,6 +382,7 @@ class FilesystemAttachment:
         )
 
 
+@_add_slots
 @dataclasses.dataclass(frozen=True)
 class FilesystemAttachments:
     machines: dict[str, FilesystemAttachment] = dataclasses.field(default_factory=dict)  # type: ignore
@@ -358,6 +402,7 @@ class FilesystemAttachments:
         )
 
 
+@_add_slots
 @dataclasses.dataclass(frozen=True)
 class FilesystemInfo:
     size: int
@@ -388,6 +433,7 @@ class FilesystemInfo:
         )
 
 
+@_add_slots
 @dataclasses.dataclass(frozen=True)
 class VolumeAttachment:
     read_only: bool
@@ -408,6 +454,7 @@ class VolumeAttachment:
         )
 
 
+@_add_slots
 @dataclasses.dataclass(frozen=True)
 class VolumeAttachments:
     machines: dict[str, VolumeAttachment] = dataclasses.field(default_factory=dict)  # type: ignore
@@ -425,6 +472,7 @@ class VolumeAttachments:
         )
 
 
+@_add_slots
 @dataclasses.dataclass(frozen=True)
 class VolumeInfo:
     size: int
@@ -459,6 +507,7 @@ class VolumeInfo:
         )
 
 
+@_add_slots
 @dataclasses.dataclass(frozen=True)
 class CombinedStorage:
     """Storage information."""
@@ -478,6 +527,7 @@ class CombinedStorage:
         )
 
 
+@_add_slots
 @dataclasses.dataclass(frozen=True)
 class ControllerStatus:
     """Basic controller information."""
@@ -491,6 +541,7 @@ class ControllerStatus:
         )
 
 
+@_add_slots
 @dataclasses.dataclass(frozen=True)
 class LxdProfileContents:
     config: dict[str, str]
@@ -506,6 +557,7 @@ class LxdProfileContents:
         )
 
 
+@_add_slots
 @dataclasses.dataclass(frozen=True)
 class NetworkInterface:
     ip_addresses: list[str]
@@ -528,6 +580,7 @@ class NetworkInterface:
         )
 
 
+@_add_slots
 @dataclasses.dataclass(frozen=True)
 class MachineStatus:
     """Status of a single machine."""
@@ -593,6 +646,7 @@ class MachineStatus:
         )
 
 
+@_add_slots
 @dataclasses.dataclass(frozen=True)
 class ModelStatus:
     """Status and basic information about the model."""
@@ -637,6 +691,7 @@ class ModelStatus:
         )
 
 
+@_add_slots
 @dataclasses.dataclass(frozen=True)
 class RemoteEndpoint:
     interface: str
@@ -650,6 +705,7 @@ class RemoteEndpoint:
         )
 
 
+@_add_slots
 @dataclasses.dataclass(frozen=True)
 class OfferStatus:
     app: str
@@ -672,6 +728,7 @@ class OfferStatus:
         )
 
 
+@_add_slots
 @dataclasses.dataclass(frozen=True)
 class RemoteAppStatus:
     url: str
@@ -727,25 +784,44 @@ class Status:
     """Controller information."""
 
     @classmethod
-    def _from_dict(cls, d: dict[str, Any]) -> Status:
-        return cls(
-            model=ModelStatus._from_dict(d['model']),
-            machines={k: MachineStatus._from_dict(v) for k, v in d['machines'].items()},
-            apps={k: AppStatus._from_dict(v) for k, v in d['applications'].items()},
-            app_endpoints={
-                k: RemoteAppStatus._from_dict(v)
-                for k, v in d.get('application-endpoints', {}).items()
-            },
-            offers={k: OfferStatus._from_dict(v) for k, v in d.get('offers', {}).items()},
-            storage=(
-                CombinedStorage._from_dict(d['storage']) if 'storage' in d else CombinedStorage()
-            ),
-            controller=(
+    def _from_dict(cls, d: dict[str, Any], cache: _StatusCache | None = None) -> Status:
+        # Only parse the cheap fields now. The others (machines, apps, and so on) are parsed
+        # from the raw dict on first access by __getattr__, so a wait predicate that only looks
+        # at apps doesn't pay for parsing machines and storage on every poll.
+        if cache is None:
+            cache = _StatusCache()
+        status = cls.__new__(cls)
+        object.__setattr__(status, '_raw', d)
+        object.__setattr__(status, '_cache', cache)
+        object.__setattr__(
+            status, 'model', cache.parse('model', d['model'], ModelStatus._from_dict)
+        )
+        object.__setattr__(
+            status,
+            'controller',
+            (
                 ControllerStatus._from_dict(d['controller'])
                 if 'controller' in d
                 else ControllerStatus()
             ),
         )
+        return status
+
+    if not TYPE_CHECKING:
+        # Hidden from type checkers, otherwise they'd allow access to any attribute.
+        def __getattr__(self, name: str) -> Any:
+            """Parse a lazy field from the raw dict on first access."""
+            lazy_field = _STATUS_LAZY_FIELDS.get(name)
+            raw = self.__dict__.get('_raw')
+            if lazy_field is None or raw is None:
+                raise AttributeError(f'{type(self).__name__!r} object has no attribute {name!r}')
+            value = lazy_field.parse(raw, self.__dict__['_cache'])
+            object.__setattr__(self, name, value)
+            if all(n in self.__dict__ for n in _STATUS_LAZY_FIELDS):
+                # Everything has been parsed, so the raw dict is no longer needed.
+                del self.__dict__['_raw']
+                del self.__dict__['_cache']
+            return value
 
     def __repr__(self) -> str:
         """Return a pretty-printed version of the status."""
@@ -766,32 +842,190 @@ class Status:
         for field in dataclasses.fields(self):
             if field.name == 'controller':
                 continue
+            if _raw_fields_equal(self, other, field.name):
+                continue
             if getattr(self, field.name) != getattr(other, field.name):
                 return False
         return True
 
+    def get_machine_units(self, machine: str) -> dict[str, UnitStatus]:
+        """Get all units on the given *machine*, including subordinate units.
+
+        Args:
+            machine: Machine ID, for example ``"0"``, or ``"0/lxd/1"`` for a container.
+
+        Returns:
+            Dict of units where the key is the unit name and the value is the :class:`UnitStatus`.
+            If there are no units on *machine*, return an empty dict.
+        """
+        return self._index.machine_units.get(machine, {})
+
+    def get_unit_machine(self, unit: str) -> str | None:
+        """Get the ID of the machine the given *unit* is on.
+
+        This also works for subordinate units, which are on the machine of their principal unit.
+
+        Returns:
+            Machine ID, for example ``"0"``, or None if *unit* is not found or isn't on a machine
+            (for example, on Kubernetes).
+        """
+        return self._index.unit_machines.get(unit)
+
     def get_units(self, app: str) -> dict[str, UnitStatus]:
         """Get all units of the given *app*, including units of subordinate apps.
 
-        For subordinate apps, this finds and returns the subordinate units using the app's
-        ``subordinate_to`` list. For principal (non-subordinate) apps, this is equivalent to
-        ``status.apps[app].units``.
+        For subordinate apps, this returns the subordinate units found under the principal units
+        of the apps in the app's ``subordinate_to`` list. For principal (non-subordinate) apps,
+        this is equivalent to ``status.apps[app].units``.
 
         Returns:
             Dict of units where the key is the unit name and the value is the :class:`UnitStatus`.
             If *app* is not found, return an empty dict.
         """
-        app_info = self.apps.get(app)
-        if app_info is None:
-            return {}
-        if not app_info.subordinate_to:
-            return app_info.units
-
-        units: dict[str, UnitStatus] = {}
-        app_prefix = app + '/'
-        for principal in app_info.subordinate_to:
-            for unit_info in self.apps[principal].units.values():
-                for sub_name, sub in unit_info.subordinates.items():
-                    if sub_name.startswith(app_prefix):
-                        units[sub_name] = sub  # noqa: PERF403
-        return units
+        return self._index.app_units.get(app, {})
+
+    @property
+    def _index(self) -> _StatusIndex:
+        # Build the index on first use, so that each query is a dict lookup rather than a
+        # scan of all units. Status objects are immutable, so it never needs updating.
+        index = self.__dict__.get('_status_index')
+        if index is None:
+            index = _StatusIndex.build(self.apps)
+            object.__setattr__(self, '_status_index', index)
+        return index
+
+
+class _StatusIndex(NamedTuple):
+    app_units: dict[str, dict[str, UnitStatus]]
+    """Mapping of app name to its units, including subordinate units for subordinate apps."""
+
+    unit_machines: dict[str, str]
+    """Mapping of unit name (including subordinate units) to machine ID."""
+
+    machine_units: dict[str, dict[str, UnitStatus]]
+    """Mapping of machine ID to the units on it, including subordinate units."""
+
+    @classmethod
+    def build(cls, apps: dict[str, AppStatus]) -> _StatusIndex:
+        app_units: dict[str, dict[str, UnitStatus]] = {}
+        for app, app_info in apps.items():
+            app_units[app] = {} if app_info.subordinate_to else app_info.units
+        unit_machines: dict[str, str] = {}
+        machine_units: dict[str, dict[str, UnitStatus]] = {}
+
+        for app, app_info in apps.items():
+            for unit, unit_info in app_info.units.items():
+                machine = unit_info.machine
+                if machine:
+                    unit_machines[unit] = machine
+                    machine_units.setdefault(machine, {})[unit] = unit_info
+                for sub, sub_info in unit_info.subordinates.items():
+                    sub_app, _, _ = sub.partition('/')
+                    sub_app_info = apps.get(sub_app)
+                    if sub_app_info is not None and app in sub_app_info.subordinate_to:
+                        app_units[sub_app][sub] = sub_info
+                    if machine:
+                        unit_machines[sub] = machine
+                        machine_units[machine][sub] = sub_info
+
+        return cls(app_units, unit_machines, machine_units)
+
+
+class _LazyField(NamedTuple):
+    key: str
+    """Key of the field in the raw ``juju status`` dict."""
+
+    parse: Callable[[dict[str, Any], _StatusCache], Any]
+    """Function to parse the field's value from the raw dict."""
+
+
+def _parse_machines(d: dict[str, Any], cache: _StatusCache) -> dict[str, MachineStatus]:
+    return cache.parse_dict('machines', d['machines'], MachineStatus._from_dict)
+
+
+def _parse_apps(d: dict[str, Any], cache: _StatusCache) -> dict[str, AppStatus]:
+    return cache.parse_dict('apps', d['applications'], AppStatus._from_dict)
+
+
+def _parse_app_endpoints(d: dict[str, Any], cache: _StatusCache) -> dict[str, RemoteAppStatus]:
+    raw = d.get('application-endpoints', {})
+    return cache.parse_dict('app_endpoints', raw, RemoteAppStatus._from_dict)
+
+
+def _parse_offers(d: dict[str, Any], cache: _StatusCache) -> dict[str, OfferStatus]:
+    return cache.parse_dict('offers', d.get('offers', {}), OfferStatus._from_dict)
+
+
+def _parse_storage(d: dict[str, Any], cache: _StatusCache) -> CombinedStorage:
+    if 'storage' not in d:
+        return CombinedStorage()
+    return cache.parse('storage', d['storage'], CombinedStorage._from_dict)
+
+
+_STATUS_LAZY_FIELDS = {
+    'machines': _LazyField('machines', _parse_machines),
+    'apps': _LazyField('applications', _parse_apps),
+    'app_endpoints': _LazyField('application-endpoints', _parse_app_endpoints),
+    'offers': _LazyField('offers', _parse_offers),
+    'storage': _LazyField('storage', _parse_storage),
+}
+
+
+def _raw_fields_equal(a: Status, b: Status, name: str) -> bool:
+    """Report whether a lazy field is unparsed in both statuses and its raw values are equal.
+
+    Equal raw values always parse to equal objects, so this lets :meth:`Status.__eq__` skip
+    parsing fields that haven't been accessed yet.
+    """
+    lazy_field = _STATUS_LAZY_FIELDS.get(name)
+    a_raw = a.__dict__.get('_raw')
+    b_raw = b.__dict__.get('_raw')
+    if lazy_field is None or a_raw is None or b_raw is None:
+        return False
+    if name in a.__dict__ or name in b.__dict__:
+        return False
+    return a_raw.get(lazy_field.key) == b_raw.get(lazy_field.key)
+
+
+class _StatusCache:
+    """Parsed parts of previous statuses, reused when their raw JSON hasn't changed.
+
+    Passing the same cache when parsing successive statuses (as :meth:`Juju.wait` does) means
+    that unchanged apps, machines, and so on are the same objects in each status. Comparing
+    the statuses then short-circuits on identity, and memory use stays flat across polls. This
+    is safe because equal raw dicts always parse to equal objects.
+    """
+
+    def __init__(self):
+        self._values: dict[str, tuple[Any, Any]] = {}
+        self._items: dict[str, dict[str, tuple[Any, Any]]] = {}
+
+    def parse(self, name: str, raw: Any, parse: Callable[[Any], _T]) -> _T:
+        """Parse *raw*, or return the previous value of field *name* if *raw* is unchanged."""
+        prev = self._values.get(name)
+        if prev is not None and prev[0] == raw:
+            return prev[1]
+        value = parse(raw)
+        self._values[name] = (raw, value)
+        return value
+
+    def parse_dict(
+        self, name: str, raw: dict[str, Any], parse: Callable[[Any], _T]
+    ) -> dict[str, _T]:
+        """Like :meth:`parse`, but for a dict field, reusing each unchanged item in the dict."""
+        prev = self._values.get(name)
+        if prev is not None and prev[0] == raw:
+            return prev[1]
+
+        prev_items = self._items.get(name, {})
+        items: dict[str, tuple[Any, _T]] = {}
+        for k, v in raw.items():
+            item = prev_items.get(k)
+            if item is None or item[0] != v:
+                item = (v, parse(v))
+            items[k] = item
+        value = {k: item[1] for k, item in items.items()}
+
+        self._values[name] = (raw, value)
+        self._items[name] = items  # only keep current items, so the cache doesn't grow
+        return value
@@ -16,12 +16,22 @@ def run(monkeypatch: pytest.MonkeyPatch) -> Generator[mocks.Run]:
     assert len(run_mock.calls) >= 1, 'subprocess.run not called'
 
 
+@pytest.fixture
+def async_run(monkeypatch: pytest.MonkeyPatch) -> Generator[mocks.Run]:
+    """Pytest fixture that patches asyncio.create_subprocess_exec with mocks.Run."""
+    run_mock = mocks.Run()
+    monkeypatch.setattr('asyncio.create_subprocess_exec', run_mock.create_subprocess_exec)
+    yield run_mock
+    assert len(run_mock.calls) >= 1, 'asyncio.create_subprocess_exec not called'
+
+
 @pytest.fixture
 def time(monkeypatch: pytest.MonkeyPatch) -> Generator[mocks.Time]:
-    """Pytest fixture that patches time.monotonic and time.sleep with mocks.Time."""
+    """Pytest fixture that patches time.monotonic, time.sleep and asyncio.sleep with mocks.Time."""
     time_mock = mocks.Time()
     monkeypatch.setattr('time.monotonic', time_mock.monotonic)
     monkeypatch.setattr('time.sleep', time_mock.sleep)
+    monkeypatch.setattr('asyncio.sleep', time_mock.async_sleep)
     yield time_mock
 
 
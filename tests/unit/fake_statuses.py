@@ -1,3 +1,7 @@
+from __future__ import annotations
+
+from typing import Any
+
 import jubilant
 
 MINIMAL_JSON = """
@@ -539,3 +543,68 @@ SUBORDINATES_JSON = """
     }
 }
 """
+
+
+def large_status_dict(num_apps: int = 10, units_per_app: int = 100) -> dict[str, Any]:
+    """Return a synthetic "juju status" dict with one machine per unit, for benchmarks."""
+    since = '09 Jun 2025 11:17:02+12:00'
+    machines: dict[str, Any] = {}
+    apps: dict[str, Any] = {}
+    for a in range(num_apps):
+        units: dict[str, Any] = {}
+        for u in range(units_per_app):
+            machine = str(len(machines))
+            address = f'10.0.{len(machines) // 250}.{len(machines) % 250}'
+            machines[machine] = {
+                'juju-status': {'current': 'started', 'since': since, 'version': '3.6.4'},
+                'hostname': f'juju-{machine}',
+                'dns-name': address,
+                'ip-addresses': [address],
+                'instance-id': f'juju-{machine}',
+                'machine-status': {'current': 'running', 'message': 'Running', 'since': since},
+                'modification-status': {'current': 'idle', 'since': since},
+                'base': {'name': 'ubuntu', 'channel': '24.04'},
+                'network-interfaces': {
+                    'eth0': {
+                        'ip-addresses': [address],
+                        'mac-address': '00:16:3e:00:00:00',
+                        'gateway': '10.0.0.1',
+                        'space': 'alpha',
+                        'is-up': True,
+                    },
+                },
+                'constraints': 'arch=amd64',
+                'hardware': 'arch=amd64 cores=2 mem=4096M',
+            }
+            units[f'app{a}/{u}'] = {
+                'workload-status': {'current': 'active', 'message': 'ready', 'since': since},
+                'juju-status': {'current': 'idle', 'since': since, 'version': '3.6.4'},
+                'leader': u == 0,
+                'machine': machine,
+                'public-address': address,
+            }
+        apps[f'app{a}'] = {
+            'charm': f'app{a}',
+            'charm-origin': 'charmhub',
+            'charm-name': f'app{a}',
+            'charm-rev': 1,
+            'exposed': False,
+            'base': {'name': 'ubuntu', 'channel': '24.04'},
+            'charm-channel': 'latest/stable',
+            'application-status': {'current': 'active', 'since': since},
+            'units': units,
+            'endpoint-bindings': {'': 'alpha'},
+        }
+    return {
+        'model': {
+            'name': 'big',
+            'type': 'iaas',
+            'controller': 'lxd',
+            'cloud': 'localhost',
+            'version': '3.6.4',
+            'model-status': {'current': 'available', 'since': since},
+        },
+        'machines': machines,
+        'applications': apps,
+        'controller': {'timestamp': '12:11:53+12:00'},
+    }
@@ -0,0 +1,36 @@
+"""Fake worker for WorkerRunner tests: runs "commands" in-process, one JSON request per line."""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+
+
+def handle(args: list[str], stdin: str | None) -> dict[str, object]:
+    command = args[1:]
+    if command == ['pid']:
+        return {'returncode': 0, 'stdout': str(os.getpid()), 'stderr': ''}
+    if command == ['cat']:
+        return {'returncode': 0, 'stdout': stdin or '', 'stderr': ''}
+    if command == ['fail']:
+        return {'returncode': 2, 'stdout': 'OUT', 'stderr': 'ERR'}
+    if command == ['slow']:
+        return {'timeout': True, 'stdout': 'partial', 'stderr': ''}
+    if command == ['hang']:
+        time.sleep(60)
+    if command == ['exit']:
+        sys.exit(1)
+    return {'returncode': 0, 'stdout': ' '.join(command) + '\n', 'stderr': ''}
+
+
+def main():
+    for line in sys.stdin:
+        request = json.loads(line)
+        response = handle(request['args'], request['stdin'])
+        print(json.dumps(response), flush=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -74,12 +74,51 @@ class Run:
             stderr=stderr,
         )
 
+    async def create_subprocess_exec(
+        self,
+        *args: str,
+        stdin: int | None = None,
+        stdout: int | None = None,
+        stderr: int | None = None,
+    ) -> Process:
+        """Mock for asyncio.create_subprocess_exec, using the same handled commands."""
+        assert stdout == subprocess.PIPE
+        assert stderr == subprocess.PIPE
+        return Process(self, list(args))
+
+
+class Process:
+    """Mock for asyncio.subprocess.Process, as returned by Run.create_subprocess_exec."""
+
+    def __init__(self, run: Run, args: list[str]):
+        self._run = run
+        self._args = args
+        self.returncode: int | None = None
+
+    async def communicate(self, input: bytes | None = None) -> tuple[bytes, bytes]:
+        try:
+            process = self._run(
+                self._args,
+                check=True,
+                capture_output=True,
+                encoding='utf-8',
+                input=input.decode('utf-8') if input is not None else None,
+            )
+        except subprocess.CalledProcessError as e:
+            self.returncode = e.returncode
+            return e.stdout.encode('utf-8'), e.stderr.encode('utf-8')
+        self.returncode = process.returncode
+        return process.stdout.encode('utf-8'), process.stderr.encode('utf-8')
+
+    def kill(self):
+        pass
+
 
 class Time:
-    """Mock for time.monotonic and time.sleep.
+    """Mock for time.monotonic, time.sleep, and asyncio.sleep.
 
     This is very simplistic: time.monotonic() starts out at 0, and every time
-    time.sleep(x) is called, it increases by x.
+    time.sleep(x) or asyncio.sleep(x) is called, it increases by x.
     """
 
     def __init__(self):
@@ -91,6 +130,9 @@ class Time:
     def sleep(self, seconds: float):
         self._monotonic += seconds
 
+    async def async_sleep(self, seconds: float):
+        self._monotonic += seconds
+
 
 class NamedTemporaryFile:
     """Mock for tempfile.NamedTemporaryFile.
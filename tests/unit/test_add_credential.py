@@ -1,3 +1,4 @@
+import asyncio
 import pathlib
 
 import pytest
@@ -63,3 +64,13 @@ def test_neither_client_nor_controller():
 
     with pytest.raises(TypeError):
         juju.add_credential('aws', '/path/to/creds.yaml')  # type: ignore
+
+
+def test_async(async_run: mocks.Run, mock_file: mocks.NamedTemporaryFile):
+    async_run.handle(
+        ['juju', 'add-credential', 'aws', '--controller', 'cc', '--file', mock_file.name]
+    )
+    juju = jubilant.AsyncJuju()
+
+    credential = {'credentials': {'aws': {'mycred': {'auth-type': 'access-key'}}}}
+    asyncio.run(juju.add_credential('aws', credential, controller='cc'))
@@ -1,3 +1,5 @@
+import asyncio
+
 import jubilant
 
 from . import mocks
@@ -39,3 +41,12 @@ def test_all_args(run: mocks.Run):
     )
 
     assert juju.model == 'c:m'
+
+
+def test_async(async_run: mocks.Run):
+    async_run.handle(['juju', 'add-model', '--no-switch', 'm', '--controller', 'c'])
+    juju = jubilant.AsyncJuju(model='initial')
+
+    asyncio.run(juju.add_model('m', controller='c'))
+
+    assert juju.model == 'c:m'
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+
 import jubilant
 from tests.unit import mocks
 
@@ -28,3 +30,10 @@ def test_multiple(run: mocks.Run):
         'ssh-rsa AAAAB3NzaC1yc2EAAAADAQABAAAB user1@host',
         'ssh-rsa AAAAB3NzaC1yc2EAAAADAQABAAAC user2@host',
     )
+
+
+def test_async(async_run: mocks.Run):
+    async_run.handle(['juju', 'add-ssh-key', 'ssh-rsa AAAAB3NzaC1yc2EAAAADAQABAAAB user@host'])
+    juju = jubilant.AsyncJuju()
+
+    asyncio.run(juju.add_ssh_key('ssh-rsa AAAAB3NzaC1yc2EAAAADAQABAAAB user@host'))
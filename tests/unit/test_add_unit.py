@@ -1,3 +1,5 @@
+import asyncio
+
 import jubilant
 
 from . import mocks
@@ -41,3 +43,10 @@ def test_list_args(run: mocks.Run):
     juju = jubilant.Juju()
 
     juju.add_unit('app1', attach_storage=['stg1', 'stg2'], to=['to1', 'to2'])
+
+
+def test_async(async_run: mocks.Run):
+    async_run.handle(['juju', 'add-unit', '--model', 'mdl', 'app1', '--num-units', '2'])
+    juju = jubilant.AsyncJuju(model='mdl')
+
+    asyncio.run(juju.add_unit('app1', num_units=2))
@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+
+import pytest
+
+import jubilant
+
+from . import mocks
+from .fake_secrets import MULTIPLE_SECRETS
+from .fake_statuses import MINIMAL_JSON, MINIMAL_STATUS
+
+
+def test_repr():
+    juju = jubilant.AsyncJuju(model='mdl', cli_binary='/bin/juju')
+
+    assert repr(juju) == "AsyncJuju(model='mdl', wait_timeout=180.0, cli_binary='/bin/juju')"
+
+
+def test_same_methods_as_juju():
+    def public_methods(cls: type) -> list[str]:
+        return [name for name in cls.__dict__ if not name.startswith('_')]
+
+    async_methods = public_methods(jubilant.AsyncJuju)
+    assert set(async_methods) == set(public_methods(jubilant.Juju))
+    assert async_methods == sorted(async_methods)
+
+
+def test_cli(async_run: mocks.Run):
+    async_run.handle(['juju', 'foo', '--model', 'mdl', 'bar'], stdout='OUT')
+    juju = jubilant.AsyncJuju(model='mdl')
+
+    stdout = asyncio.run(juju.cli('foo', 'bar'))
+
+    assert stdout == 'OUT'
+
+
+def test_cli_stdin(async_run: mocks.Run):
+    async_run.handle(['juju', 'foo'], stdout='OUT')
+    juju = jubilant.AsyncJuju()
+
+    asyncio.run(juju.cli('foo', stdin='IN'))
+
+    assert async_run.calls[0].stdin == 'IN'
+
+
+def test_cli_error(async_run: mocks.Run):
+    async_run.handle(['juju', 'foo'], returncode=3, stdout='OUT', stderr='ERR')
+    juju = jubilant.AsyncJuju()
+
+    with pytest.raises(jubilant.CLIError) as excinfo:
+        asyncio.run(juju.cli('foo'))
+
+    assert excinfo.value.returncode == 3
+    assert excinfo.value.cmd == ['juju', 'foo']
+    assert excinfo.value.stdout == 'OUT'
+    assert excinfo.value.stderr == 'ERR'
+
+
+def test_concurrent(async_run: mocks.Run):
+    async_run.handle(['juju', 'deploy', '--model', 'mdl', 'app1'])
+    async_run.handle(['juju', 'deploy', '--model', 'mdl', 'app2', '--num-units', '2'])
+    async_run.handle(['juju', 'integrate', '--model', 'mdl', 'app1', 'app2'])
+    juju = jubilant.AsyncJuju(model='mdl')
+
+    async def deploy():
+        await asyncio.gather(juju.deploy('app1'), juju.deploy('app2', num_units=2))
+        await juju.integrate('app1', 'app2')
+
+    asyncio.run(deploy())
+
+    assert len(async_run.calls) == 3
+    assert async_run.calls[2].args[1] == 'integrate'
+
+
+def test_exec(async_run: mocks.Run):
+    out_json = """
+{
+  "ubuntu/0": {
+    "id": "28",
+    "results": {
+      "return-code": 0,
+      "stdout": "foo\\n"
+    },
+    "status": "completed",
+    "unit": "ubuntu/0"
+  }
+}
+"""
+    async_run.handle(
+        ['juju', 'exec', '--format', 'json', '--unit', 'ubuntu/0', '--', 'echo', 'foo'],
+        stdout=out_json,
+    )
+    juju = jubilant.AsyncJuju()
+
+    task = asyncio.run(juju.exec('echo', 'foo', unit='ubuntu/0'))
+
+    assert task == jubilant.Task(id='28', status='completed', stdout='foo\n')
+
+
+def test_run_failure(async_run: mocks.Run):
+    out_json = """
+{
+  "mysql/0": {
+    "id": "42",
+    "message": "failed!",
+    "results": {
+      "return-code": 1
+    },
+    "status": "failed"
+  }
+}
+"""
+    async_run.handle(
+        ['juju', 'run', '--format', 'json', 'mysql/0', 'get-password'],
+        returncode=1,
+        stdout=out_json,
+        stderr='task failed',
+    )
+    juju = jubilant.AsyncJuju()
+
+    with pytest.raises(jubilant.TaskError) as excinfo:
+        asyncio.run(juju.run('mysql/0', 'get-password'))
+
+    assert excinfo.value.task.message == 'failed!'
+
+
+def test_run_timeout(async_run: mocks.Run):
+    async_run.handle(
+        ['juju', 'run', '--format', 'json', 'mysql/0', 'get-password', '--wait', '0.001s'],
+        returncode=1,
+        stderr='timed out',
+    )
+    juju = jubilant.AsyncJuju()
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(juju.run('mysql/0', 'get-password', wait=0.001))
+
+
+def test_secrets(async_run: mocks.Run):
+    async_run.handle(['juju', 'secrets', '--format', 'json'], stdout=json.dumps(MULTIPLE_SECRETS))
+    juju = jubilant.AsyncJuju()
+
+    secrets = asyncio.run(juju.secrets())
+
+    assert [s.name for s in secrets] == ['admin-account', 'admin-password']
+
+
+def test_status(async_run: mocks.Run):
+    async_run.handle(['juju', 'status', '--format', 'json'], stdout=MINIMAL_JSON)
+    juju = jubilant.AsyncJuju()
+
+    status = asyncio.run(juju.status())
+
+    assert status == MINIMAL_STATUS
+
+
+def test_wait(async_run: mocks.Run, time: mocks.Time):
+    async_run.handle(['juju', 'status', '--format', 'json'], stdout=MINIMAL_JSON)
+    juju = jubilant.AsyncJuju()
+
+    status = asyncio.run(juju.wait(lambda _: True))
+
+    assert len(async_run.calls) == 3
+    assert time.monotonic() == 2
+    assert status == MINIMAL_STATUS
+
+
+def test_wait_timeout(async_run: mocks.Run, time: mocks.Time):
+    async_run.handle(['juju', 'status', '--format', 'json'], stdout=MINIMAL_JSON)
+    juju = jubilant.AsyncJuju()
+
+    with pytest.raises(TimeoutError) as excinfo:
+        asyncio.run(juju.wait(lambda _: False, timeout=5))
+
+    assert len(async_run.calls) == 5
+    assert 'mdl' in str(excinfo.value)
+
+
+def test_wait_error(async_run: mocks.Run, time: mocks.Time):
+    async_run.handle(['juju', 'status', '--format', 'json'], stdout=MINIMAL_JSON)
+    juju = jubilant.AsyncJuju()
+
+    with pytest.raises(jubilant.WaitError):
+        asyncio.run(juju.wait(lambda _: True, error=lambda _: True))
+
+    assert len(async_run.calls) == 1
+
+
+def test_wait_debug_log_interval(
+    async_run: mocks.Run, time: mocks.Time, monkeypatch: pytest.MonkeyPatch
+):
+    async_run.handle(['juju', 'status', '--format', 'json'], stdout=MINIMAL_JSON)
+    closed: list[bool] = []
+
+    class FakeLogWatcher:
+        @classmethod
+        async def start(cls, args: list[str]) -> FakeLogWatcher:
+            assert args[:2] == ['juju', 'debug-log']
+            return cls()
+
+        def activity(self) -> bool:
+            return time.monotonic() == 5
+
+        async def close(self):
+            closed.append(True)
+
+    monkeypatch.setattr(jubilant._async_juju, '_LogWatcher', FakeLogWatcher)
+    juju = jubilant.AsyncJuju()
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(juju.wait(lambda _: False, debug_log_interval=10, timeout=30))
+
+    # Polls at 0, 1 (status unchanged, so follow the log), 5 (hook ran), 15, and 25.
+    assert len(async_run.calls) == 5
+    assert closed == [True]
+
+
+def test_log_watcher():
+    script = 'print("ran hook", flush=True); import time; time.sleep(60)'
+
+    async def watch() -> list[bool]:
+        watcher = await jubilant._async_juju._LogWatcher.start([sys.executable, '-c', script])
+        try:
+            seen = False
+            for _ in range(500):
+                seen = watcher.activity()
+                if seen:
+                    break
+                await asyncio.sleep(0.01)
+            return [seen, watcher.activity()]
+        finally:
+            await watcher.close()
+
+    assert asyncio.run(watch()) == [True, False]
+
+
+def test_status_apps(async_run: mocks.Run, time: mocks.Time):
+    async_run.handle(['juju', 'status', '--format', 'json', 'blog'], stdout=MINIMAL_JSON)
+    juju = jubilant.AsyncJuju()
+
+    assert asyncio.run(juju.status('blog')) == MINIMAL_STATUS
+    assert asyncio.run(juju.wait(lambda _: True, apps=['blog'])) == MINIMAL_STATUS
+
+
+def test_status_raw(async_run: mocks.Run, time: mocks.Time):
+    async_run.handle(['juju', 'status', '--format', 'json'], stdout=MINIMAL_JSON)
+    juju = jubilant.AsyncJuju()
+
+    assert asyncio.run(juju.status_raw()) == json.loads(MINIMAL_JSON)
+    assert asyncio.run(juju.wait(lambda _: True, raw=True)) == json.loads(MINIMAL_JSON)
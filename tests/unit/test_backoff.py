@@ -0,0 +1,22 @@
+import jubilant
+
+
+def test_delay():
+    backoff = jubilant.Backoff(initial=0.5, maximum=3, factor=3)
+
+    assert [backoff.delay(n) for n in range(4)] == [0.5, 1.5, 3, 3]
+
+
+def test_overflow():
+    backoff = jubilant.Backoff()
+
+    assert backoff.delay(100_000) == backoff.maximum
+
+
+def test_jitter():
+    backoff = jubilant.Backoff(initial=10, jitter=0.1)
+
+    delays = [backoff.delay(0) for _ in range(100)]
+
+    assert all(9 <= d <= 11 for d in delays)
+    assert len(set(delays)) > 1
@@ -1,3 +1,5 @@
+import asyncio
+
 import jubilant
 
 from . import mocks
@@ -68,3 +70,13 @@ def test_list_args(run: mocks.Run):
     juju = jubilant.Juju()
 
     juju.bootstrap('lxd', 'myctrl', to=['to1', 'to2'])
+
+
+def test_async(async_run: mocks.Run):
+    async_run.handle(
+        ['juju', 'bootstrap', 'lxd', 'my-controller', '--no-switch', '--config', 'x=true']
+    )
+    juju = jubilant.AsyncJuju()
+
+    asyncio.run(juju.bootstrap('lxd', 'my-controller', config={'x': True}))
+    assert juju.model is None
@@ -1,3 +1,5 @@
+import asyncio
+
 import jubilant
 
 from . import mocks
@@ -116,3 +118,16 @@ def test_set_with_reset(run: mocks.Run):
     juju = jubilant.Juju()
     retval = juju.config('app1', {'foo': 'bar'}, reset=['baz', 'buzz'])
     assert retval is None
+
+
+def test_async(async_run: mocks.Run):
+    async_run.handle(['juju', 'config', '--format', 'json', 'app1'], stdout=CONFIG_JSON)
+    async_run.handle(['juju', 'config', 'app1', 'inty=43', '--reset', 'booly,stry'])
+    juju = jubilant.AsyncJuju()
+
+    values = asyncio.run(juju.config('app1'))
+    assert values['inty'] == 42
+    assert values['secrety'] == jubilant.SecretURI('secret:abcd1234')
+    app_config = asyncio.run(juju.config('app1', app_config=True))
+    assert app_config == {'juju-application-path': '/', 'trust': False}
+    asyncio.run(juju.config('app1', {'inty': 43}, reset=['booly', 'stry']))
@@ -1,3 +1,5 @@
+import asyncio
+
 import jubilant
 
 from . import mocks
@@ -46,3 +48,10 @@ def test_controller_owner_in_first_arg(run: mocks.Run):
     juju = jubilant.Juju()
 
     juju.consume('anothercontroller:admin/othermodel.mysql')
+
+
+def test_async(async_run: mocks.Run):
+    async_run.handle(['juju', 'consume', 'ctl:owner/othermodel.mysql', 'sql'])
+    juju = jubilant.AsyncJuju()
+
+    asyncio.run(juju.consume('othermodel.mysql', 'sql', controller='ctl', owner='owner'))
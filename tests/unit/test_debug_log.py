@@ -1,3 +1,10 @@
+import asyncio
+import pathlib
+import threading
+import time
+
+import pytest
+
 import jubilant
 
 from . import mocks
@@ -25,3 +32,202 @@ def test_limit(run: mocks.Run):
     juju = jubilant.Juju()
     logs = juju.debug_log(limit=10)
     assert logs == 'out'
+
+
+def test_async(async_run: mocks.Run):
+    async_run.handle(['juju', 'debug-log', '--model', 'mdl', '--limit', '10'], stdout='out')
+
+    juju = jubilant.AsyncJuju(model='mdl')
+    logs = asyncio.run(juju.debug_log(limit=10))
+    assert logs == 'out'
+
+
+def fake_juju(tmp_path: pathlib.Path, script: str) -> str:
+    """Write a fake "juju" binary that saves its arguments and then runs *script*."""
+    path = tmp_path / 'juju'
+    path.write_text(f'#!/bin/sh\necho "$@" > {tmp_path / "args"}\n{script}\n')
+    path.chmod(0o755)
+    return str(path)
+
+
+def test_record_from_line():
+    line = 'unit-mysql-0: 12:34:56 INFO juju.worker.uniter.operation ran "start" hook'
+    record = jubilant.DebugLogRecord._from_line(line)
+    assert record == jubilant.DebugLogRecord(
+        entity='unit-mysql-0',
+        timestamp='12:34:56',
+        level='INFO',
+        module='juju.worker.uniter.operation',
+        message='ran "start" hook',
+    )
+    assert str(record) == line
+
+    record = jubilant.DebugLogRecord._from_line(
+        'machine-0: 2025-01-02 12:34:56.789 ERROR juju.worker failed: boom'
+    )
+    assert record.timestamp == '2025-01-02 12:34:56.789'
+    assert record.level == 'ERROR'
+    assert record.message == 'failed: boom'
+
+    record = jubilant.DebugLogRecord._from_line('  continuation of a traceback')
+    assert record.entity == ''
+    assert record.message == '  continuation of a traceback'
+    assert str(record) == '  continuation of a traceback'
+
+
+def test_stream(tmp_path: pathlib.Path):
+    cli = fake_juju(
+        tmp_path,
+        "echo 'unit-a-0: 01:02:03 INFO mod.one first'\n"
+        "echo 'unit-a-0: 01:02:04 WARNING mod.two second'",
+    )
+
+    juju = jubilant.Juju(model='mdl', cli_binary=cli)
+    records = list(
+        juju.debug_log_stream(
+            include=['a/0', 'b'],
+            exclude=['c'],
+            include_module=['mod'],
+            exclude_module=['mod.three'],
+            level='INFO',
+            lines=5,
+            tail=False,
+        )
+    )
+
+    assert [(r.entity, r.level, r.module, r.message) for r in records] == [
+        ('unit-a-0', 'INFO', 'mod.one', 'first'),
+        ('unit-a-0', 'WARNING', 'mod.two', 'second'),
+    ]
+    args = (tmp_path / 'args').read_text().split()
+    assert args == [
+        'debug-log',
+        '--model',
+        'mdl',
+        '--no-tail',
+        '--lines',
+        '5',
+        '--level',
+        'INFO',
+        '--include',
+        'a/0',
+        '--include',
+        'b',
+        '--exclude',
+        'c',
+        '--include-module',
+        'mod',
+        '--exclude-module',
+        'mod.three',
+    ]
+
+
+def test_stream_replay(tmp_path: pathlib.Path):
+    cli = fake_juju(tmp_path, '')
+
+    juju = jubilant.Juju(cli_binary=cli)
+    assert list(juju.debug_log_stream(replay=True, lines=5)) == []
+
+    args = (tmp_path / 'args').read_text().split()
+    assert args == ['debug-log', '--tail', '--replay']
+
+
+def test_stream_close_stops_process(tmp_path: pathlib.Path):
+    cli = fake_juju(tmp_path, "echo 'unit-a-0: 01:02:03 INFO mod first'\nexec sleep 60")
+
+    juju = jubilant.Juju(cli_binary=cli)
+    start = time.monotonic()
+    stream = juju.debug_log_stream()
+    assert next(stream).message == 'first'
+    stream.close()
+    assert time.monotonic() - start < 30
+
+
+def test_stream_error(tmp_path: pathlib.Path):
+    cli = fake_juju(tmp_path, 'echo "ERROR model not found" >&2\nexit 1')
+
+    juju = jubilant.Juju(cli_binary=cli)
+    with pytest.raises(jubilant.CLIError) as excinfo:
+        list(juju.debug_log_stream())
+    assert excinfo.value.returncode == 1
+    assert 'model not found' in excinfo.value.stderr
+
+
+def test_stream_lots_of_stderr(tmp_path: pathlib.Path):
+    # More than a pipe's buffer of stderr mustn't block the process before it writes stdout.
+    cli = fake_juju(
+        tmp_path,
+        'head -c 1000000 /dev/zero | tr "\\0" x >&2\necho \'unit-a-0: 01:02:03 INFO mod done\'',
+    )
+
+    juju = jubilant.Juju(cli_binary=cli)
+    records = list(juju.debug_log_stream())
+
+    assert [r.message for r in records] == ['done']
+
+
+def test_buffer(tmp_path: pathlib.Path):
+    script = ''.join(f"echo 'unit-a-0: 01:02:03 INFO mod line {i}'\n" for i in range(10))
+    cli = fake_juju(tmp_path, script + 'exec sleep 60')
+
+    juju = jubilant.Juju(cli_binary=cli)
+    with jubilant.DebugLogBuffer(juju, maxlen=3, level='INFO') as log:
+        for _ in range(100):
+            if log.records() and log.records()[-1].message == 'line 9':
+                break
+            threading.Event().wait(0.05)
+
+    assert [r.message for r in log.records()] == ['line 7', 'line 8', 'line 9']
+    assert log.text() == (
+        'unit-a-0: 01:02:03 INFO mod line 7\n'
+        'unit-a-0: 01:02:03 INFO mod line 8\n'
+        'unit-a-0: 01:02:03 INFO mod line 9\n'
+    )
+    args = (tmp_path / 'args').read_text().split()
+    assert args == ['debug-log', '--tail', '--lines', '3', '--level', 'INFO']
+
+
+def test_async_stream(tmp_path: pathlib.Path):
+    cli = fake_juju(
+        tmp_path,
+        "echo 'unit-a-0: 01:02:03 INFO mod.one first'\n"
+        "echo 'unit-a-0: 01:02:04 WARNING mod.two second'",
+    )
+    juju = jubilant.AsyncJuju(model='mdl', cli_binary=cli)
+
+    async def collect():
+        return [r async for r in juju.debug_log_stream(level='INFO', tail=False)]
+
+    records = asyncio.run(collect())
+
+    assert [(r.level, r.message) for r in records] == [('INFO', 'first'), ('WARNING', 'second')]
+    args = (tmp_path / 'args').read_text().split()
+    assert args == ['debug-log', '--model', 'mdl', '--no-tail', '--level', 'INFO']
+
+
+def test_async_stream_close_stops_process(tmp_path: pathlib.Path):
+    cli = fake_juju(tmp_path, "echo 'unit-a-0: 01:02:03 INFO mod first'\nexec sleep 60")
+    juju = jubilant.AsyncJuju(cli_binary=cli)
+
+    async def first():
+        stream = juju.debug_log_stream()
+        record = await stream.__anext__()
+        await stream.aclose()
+        return record
+
+    start = time.monotonic()
+    assert asyncio.run(first()).message == 'first'
+    assert time.monotonic() - start < 30
+
+
+def test_async_stream_error(tmp_path: pathlib.Path):
+    cli = fake_juju(tmp_path, 'echo "ERROR model not found" >&2\nexit 1')
+    juju = jubilant.AsyncJuju(cli_binary=cli)
+
+    async def collect():
+        return [r async for r in juju.debug_log_stream()]
+
+    with pytest.raises(jubilant.CLIError) as excinfo:
+        asyncio.run(collect())
+    assert excinfo.value.returncode == 1
+    assert 'model not found' in excinfo.value.stderr
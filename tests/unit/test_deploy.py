@@ -135,8 +135,9 @@ def test_tempdir(monkeypatch: pytest.MonkeyPatch):
         ]
         temp_dir = pathlib.Path(args[2]).parent
         assert '/snap/juju/common' in str(temp_dir)
-        assert args[2] == f'{temp_dir}/_temp.charm'
-        assert args[4] == f'r1={temp_dir}/r1'
+        assert temp_dir.name == 'jubilant-cache'
+        assert args[2].endswith('.charm')
+        assert args[4].startswith(f'r1={temp_dir}/')
         assert pathlib.Path(args[2]).read_text() == 'CH'
         assert pathlib.Path(args[4][3:]).read_text() == 'R1'
         return subprocess.CompletedProcess(args, 0, '', '')
@@ -145,6 +146,7 @@ def test_tempdir(monkeypatch: pytest.MonkeyPatch):
     monkeypatch.setattr('shutil.which', lambda _: '/snap/bin/juju')  # type: ignore
 
     with tempfile.TemporaryDirectory() as temp:
+        monkeypatch.setenv('HOME', temp)
         (pathlib.Path(temp) / 'my.charm').write_text('CH')
         (pathlib.Path(temp) / 'r1').write_text('R1')
 
@@ -1,3 +1,5 @@
+import asyncio
+
 import jubilant
 
 from . import mocks
@@ -64,3 +66,12 @@ def test_destroy_with_timeout(run: mocks.Run):
     juju.destroy_model('xyz', force=True, timeout=120)
 
     assert juju.model is None
+
+
+def test_async(async_run: mocks.Run):
+    async_run.handle(['juju', 'destroy-model', 'initial', '--no-prompt', '--force'])
+    juju = jubilant.AsyncJuju(model='initial')
+
+    asyncio.run(juju.destroy_model('initial', force=True))
+
+    assert juju.model is None
@@ -0,0 +1,165 @@
+import asyncio
+
+import pytest
+
+import jubilant
+
+from . import mocks
+
+OUT_JSON = r"""
+{
+  "ubuntu/0": {
+    "id": "28",
+    "results": {
+      "return-code": 0,
+      "stdout": "foo\n"
+    },
+    "status": "completed",
+    "unit": "ubuntu/0"
+  },
+  "ubuntu/1": {
+    "id": "29",
+    "results": {
+      "return-code": 1,
+      "stderr": "bar\n"
+    },
+    "status": "completed",
+    "unit": "ubuntu/1"
+  }
+}
+"""
+
+
+def test_app(run: mocks.Run):
+    run.handle(
+        ['juju', 'exec', '--format', 'json', '--application', 'ubuntu', '--', 'echo', 'foo'],
+        stdout=OUT_JSON,
+    )
+    juju = jubilant.Juju()
+
+    tasks = juju.exec_multiple('echo', 'foo', app='ubuntu')
+
+    assert tasks == {
+        'ubuntu/0': jubilant.Task(id='28', status='completed', stdout='foo\n'),
+        'ubuntu/1': jubilant.Task(id='29', status='completed', return_code=1, stderr='bar\n'),
+    }
+    assert tasks['ubuntu/0'].success
+    assert not tasks['ubuntu/1'].success
+
+
+def test_task_failed(run: mocks.Run):
+    run.handle(
+        ['juju', 'exec', '--format', 'json', '--unit', 'ubuntu/0,ubuntu/1', '--', 'echo foo'],
+        returncode=1,
+        stdout=OUT_JSON,
+        stderr='task failed',
+    )
+    juju = jubilant.Juju()
+
+    tasks = juju.exec_multiple('echo foo', unit=['ubuntu/0', 'ubuntu/1'])
+
+    assert sorted(tasks) == ['ubuntu/0', 'ubuntu/1']
+    assert not tasks['ubuntu/1'].success
+
+
+def test_tasks_failed(run: mocks.Run):
+    out_json = OUT_JSON.replace('"return-code": 0', '"return-code": 2')
+    run.handle(
+        ['juju', 'exec', '--format', 'json', '--application', 'ubuntu', '--', 'false'],
+        returncode=1,
+        stdout=out_json,
+        stderr='ERROR the following tasks failed:\n id "28" with return code 2\n'
+        ' id "29" with return code 1\n',
+    )
+    juju = jubilant.Juju()
+
+    tasks = juju.exec_multiple('false', app='ubuntu')
+
+    assert tasks['ubuntu/0'].return_code == 2
+    assert tasks['ubuntu/1'].return_code == 1
+    assert not any(task.success for task in tasks.values())
+
+
+def test_all_args(run: mocks.Run):
+    run.handle(
+        [
+            'juju',
+            'exec',
+            '--model',
+            'mdl',
+            '--format',
+            'json',
+            '--all',
+            '--application',
+            'a,b',
+            '--machine',
+            '0,1/lxd/0',
+            '--unit',
+            'c/0',
+            '--wait',
+            '10s',
+            '--',
+            'echo',
+            'foo',
+        ],
+        stdout=OUT_JSON,
+    )
+    juju = jubilant.Juju(model='mdl')
+
+    juju.exec_multiple(
+        'echo', 'foo', all=True, app=['a', 'b'], machine=[0, '1/lxd/0'], unit='c/0', wait=10
+    )
+
+
+def test_machine_zero(run: mocks.Run):
+    run.handle(
+        ['juju', 'exec', '--format', 'json', '--machine', '0', '--', 'echo', 'foo'],
+        stdout=OUT_JSON,
+    )
+    juju = jubilant.Juju()
+
+    juju.exec_multiple('echo', 'foo', machine=0)
+
+
+def test_no_targets():
+    juju = jubilant.Juju()
+
+    with pytest.raises(TypeError):
+        juju.exec_multiple('echo foo')
+    with pytest.raises(TypeError):
+        juju.exec_multiple('echo foo', unit=[])
+
+
+def test_not_found(run: mocks.Run):
+    run.handle(
+        ['juju', 'exec', '--format', 'json', '--application', 'foo', '--', 'echo', 'foo'],
+        stderr='no units',
+    )
+    juju = jubilant.Juju()
+
+    with pytest.raises(ValueError):
+        juju.exec_multiple('echo', 'foo', app='foo')
+
+
+def test_timeout(run: mocks.Run):
+    run.handle(
+        ['juju', 'exec', '--format', 'json', '--all', '--wait', '0.001s', '--', 'sleep 1'],
+        returncode=1,
+        stderr='timed out',
+    )
+    juju = jubilant.Juju()
+
+    with pytest.raises(TimeoutError):
+        juju.exec_multiple('sleep 1', all=True, wait=0.001)
+
+
+def test_async(async_run: mocks.Run):
+    async_run.handle(
+        ['juju', 'exec', '--format', 'json', '--application', 'ubuntu', '--', 'echo', 'foo'],
+        stdout=OUT_JSON,
+    )
+    juju = jubilant.AsyncJuju()
+
+    tasks = asyncio.run(juju.exec_multiple('echo', 'foo', app='ubuntu'))
+
+    assert sorted(tasks) == ['ubuntu/0', 'ubuntu/1']
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import subprocess
+import sys
+import threading
+from typing import Any
+
+import pytest
+
+import jubilant
+from jubilant._executor import _run_cli_async
+
+from . import mocks
+from .test_run_multiple import task_json
+
+
+class SlowRunner:
+    """Runner that records how many commands run at once."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+
+    def run(
+        self, args: list[str], *, stdin: str | None, timeout: float | None
+    ) -> subprocess.CompletedProcess[str]:
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        threading.Event().wait(0.01)
+        with self.lock:
+            self.running -= 1
+        return subprocess.CompletedProcess(args, 0, ' '.join(args[1:]), '')
+
+
+class FakeExecutor:
+    """Executor that returns canned results, as a test double for the Juju CLI."""
+
+    def __init__(self, results: dict[tuple[str, ...], tuple[str, str]]):
+        self.results = results
+        self.calls: list[list[str]] = []
+
+    def submit(
+        self, args: list[str], *, stdin: str | None, timeout: float | None
+    ) -> concurrent.futures.Future[tuple[str, str]]:
+        self.calls.append(args)
+        future: concurrent.futures.Future[tuple[str, str]] = concurrent.futures.Future()
+        future.set_result(self.results[tuple(args)])
+        return future
+
+
+def test_serial(run: mocks.Run):
+    run.handle(['juju', 'status'], stdout='OUT')
+    run.handle(['juju', 'error'], returncode=3, stdout='OUT', stderr='ERR')
+    juju = jubilant.Juju(executor=jubilant.SerialExecutor())
+
+    assert juju.cli('status') == 'OUT'
+    with pytest.raises(jubilant.CLIError) as excinfo:
+        juju.cli('error')
+    assert excinfo.value.returncode == 3
+    assert excinfo.value.stderr == 'ERR'
+
+
+def test_thread_shared_limit():
+    runner = SlowRunner()
+    with jubilant.ThreadExecutor(max_workers=2, runner=runner) as executor:
+        jujus = [jubilant.Juju(model=f'm{i}', executor=executor) for i in range(3)]
+        with concurrent.futures.ThreadPoolExecutor(6) as pool:
+            futures = [pool.submit(juju.cli, 'status') for juju in jujus for _ in range(2)]
+            results = sorted(f.result() for f in futures)
+
+    assert (
+        results
+        == ['status --model m0'] * 2 + ['status --model m1'] * 2 + ['status --model m2'] * 2
+    )
+    assert runner.max_running == 2
+
+
+def test_thread_error(run: mocks.Run):
+    run.handle(['juju', 'error'], returncode=1, stderr='ERR')
+    with jubilant.ThreadExecutor() as executor:
+        juju = jubilant.Juju(executor=executor)
+
+        with pytest.raises(jubilant.CLIError):
+            juju.cli('error')
+
+
+def test_asyncio():
+    with jubilant.AsyncioExecutor(max_concurrent=2) as executor:
+        juju = jubilant.Juju(cli_binary=sys.executable, executor=executor)
+
+        assert juju.cli('-c', 'print("hi")') == 'hi\n'
+        assert juju.cli('-c', 'import sys; print(sys.stdin.read())', stdin='in') == 'in\n'
+        with pytest.raises(jubilant.CLIError) as excinfo:
+            juju.cli('-c', 'import sys; sys.exit(3)')
+        assert excinfo.value.returncode == 3
+        with pytest.raises(subprocess.TimeoutExpired):
+            juju._cli('-c', 'import time; time.sleep(5)', timeout=0.1)
+
+        futures = [
+            executor.submit([sys.executable, '-c', f'print({i})'], stdin=None, timeout=None)
+            for i in range(5)
+        ]
+        assert [f.result() for f in futures] == [(f'{i}\n', '') for i in range(5)]
+
+    executor.close()
+
+
+def test_async_cancelled(monkeypatch: pytest.MonkeyPatch):
+    processes: list[asyncio.subprocess.Process] = []
+    create_subprocess_exec = asyncio.create_subprocess_exec
+
+    async def create(*args: Any, **kwargs: Any) -> asyncio.subprocess.Process:
+        process = await create_subprocess_exec(*args, **kwargs)
+        processes.append(process)
+        return process
+
+    monkeypatch.setattr(asyncio, 'create_subprocess_exec', create)
+    args = [sys.executable, '-c', 'import time; time.sleep(30)']
+
+    async def run() -> None:
+        task = asyncio.ensure_future(_run_cli_async(args, stdin=None, timeout=None))
+        while not processes:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+    # The process was killed and reaped, rather than left running.
+    assert processes[0].returncode is not None
+
+
+def test_async_juju():
+    executor = FakeExecutor({('juju', 'version'): ('3.6.0', '')})
+    juju = jubilant.AsyncJuju(executor=executor)
+
+    assert asyncio.run(juju.cli('version')) == '3.6.0'
+    assert executor.calls == [['juju', 'version']]
+
+
+def test_run_multiple():
+    executor = FakeExecutor(
+        {
+            ('juju', 'run', '--format', 'json', f'mysql/{i}', 'backup'): (
+                task_json(f'mysql/{i}', str(i)),
+                '',
+            )
+            for i in range(3)
+        }
+    )
+    juju = jubilant.Juju(executor=executor)
+
+    results = dict(juju.run_multiple([f'mysql/{i}' for i in range(3)], 'backup'))
+
+    assert sorted(results) == ['mysql/0', 'mysql/1', 'mysql/2']
+    assert len(executor.calls) == 3
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+
+import pytest
+
+from jubilant import _file_cache
+from jubilant._file_cache import FileCache
+
+
+def test_hit_and_miss(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    source = tmp_path / 'my.charm'
+    source.write_text('CHARM')
+    cache = FileCache(str(tmp_path / 'cache'))
+    hashed: list[str] = []
+    hash_file = _file_cache._hash_file
+
+    def counting_hash_file(path: str) -> str:
+        hashed.append(path)
+        return hash_file(path)
+
+    monkeypatch.setattr(_file_cache, '_hash_file', counting_hash_file)
+
+    cached1 = cache.get(str(source))
+    assert cached1.endswith('.charm')
+    assert os.path.dirname(cached1) == str(tmp_path / 'cache')
+    assert pathlib.Path(cached1).read_text() == 'CHARM'
+    assert len(hashed) == 1
+
+    # Unchanged file: found by path, size, and mtime without hashing it again.
+    cached2 = cache.get(str(source))
+    assert cached2 == cached1
+    assert len(hashed) == 1
+
+    # Same content under another name shares the cached file.
+    other = tmp_path / 'other.charm'
+    other.write_text('CHARM')
+    assert cache.get(str(other)) == cached1
+    assert len(hashed) == 2
+
+    # Changed file: new content, new cached file.
+    source.write_text('CHARM v2')
+    os.utime(source, ns=(1, 1))
+    cached3 = cache.get(str(source))
+    assert cached3 != cached1
+    assert pathlib.Path(cached3).read_text() == 'CHARM v2'
+
+
+@pytest.fixture
+def copy_only(monkeypatch: pytest.MonkeyPatch):
+    """Make the cache copy files, as if reflinks and hard links aren't supported."""
+
+    def fail_link(src: str, dst: str):
+        raise OSError('cross-device link')
+
+    monkeypatch.setattr(_file_cache, 'reflink', lambda src, dst: False)  # type: ignore
+    monkeypatch.setattr(os, 'link', fail_link)
+
+
+def test_copy_fallback(tmp_path: pathlib.Path, copy_only: None):
+    source = tmp_path / 'r1'
+    source.write_text('R1')
+    cache = FileCache(str(tmp_path / 'cache'))
+
+    cached = cache.get(str(source))
+
+    assert pathlib.Path(cached).read_text() == 'R1'
+    assert not os.path.samefile(cached, source)
+    assert sorted(os.listdir(tmp_path / 'cache')) == sorted(
+        [os.path.basename(cached), 'index.json']
+    )
+
+
+def test_modified_cached_file_is_replaced(tmp_path: pathlib.Path, copy_only: None):
+    source = tmp_path / 'my.charm'
+    source.write_text('CHARM')
+    cache = FileCache(str(tmp_path / 'cache'))
+    cached = cache.get(str(source))
+
+    # For example, if something else writes to the cache directory.
+    pathlib.Path(cached).write_text('CORRUPT')
+    os.utime(cached, ns=(1, 1))
+
+    assert cache.get(str(source)) == cached
+    assert pathlib.Path(cached).read_text() == 'CHARM'
+
+
+def test_lru_eviction(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    now = 1000.0
+    monkeypatch.setattr('time.time', lambda: now)
+    cache = FileCache(str(tmp_path / 'cache'), max_bytes=25)
+    paths: dict[str, str] = {}
+    for name in ['a', 'b', 'c']:
+        source = tmp_path / name
+        source.write_text(name * 10)
+        paths[name] = cache.get(str(source))
+        now += 100
+    # Use "a" again, so "b" is the least recently used.
+    assert cache.get(str(tmp_path / 'a')) == paths['a']
+    now += 100
+
+    source = tmp_path / 'd'
+    source.write_text('d' * 10)
+    paths['d'] = cache.get(str(source))
+
+    assert not os.path.exists(paths['b'])
+    assert not os.path.exists(paths['c'])
+    assert os.path.exists(paths['a'])
+    assert os.path.exists(paths['d'])
+    with open(tmp_path / 'cache' / 'index.json') as f:
+        index = json.load(f)
+    assert sorted(index['sources']) == sorted(
+        f'{tmp_path / name}:10:{os.stat(tmp_path / name).st_mtime_ns}' for name in ['a', 'd']
+    )
+
+
+def test_recently_used_not_evicted(tmp_path: pathlib.Path):
+    cache = FileCache(str(tmp_path / 'cache'), max_bytes=5)
+    paths: list[str] = []
+    for name in ['a', 'b']:
+        source = tmp_path / name
+        source.write_text(name * 10)
+        paths.append(cache.get(str(source)))
+
+    # Over the limit, but both were used too recently to remove.
+    assert all(os.path.exists(p) for p in paths)
+
+
+def test_invalid_index(tmp_path: pathlib.Path):
+    (tmp_path / 'cache').mkdir()
+    (tmp_path / 'cache' / 'index.json').write_text('{not json')
+    source = tmp_path / 'my.charm'
+    source.write_text('CHARM')
+    cache = FileCache(str(tmp_path / 'cache'))
+
+    assert pathlib.Path(cache.get(str(source))).read_text() == 'CHARM'
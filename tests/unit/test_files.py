@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import os
+import pathlib
+import stat
+
+import pytest
+
+from jubilant import _files
+
+
+@pytest.fixture
+def no_links(monkeypatch: pytest.MonkeyPatch):
+    def fail_link(src: str, dst: str):
+        raise OSError('cross-device link')
+
+    monkeypatch.setattr(os, 'link', fail_link)
+    monkeypatch.setattr(_files, 'reflink', lambda src, dst: False)  # type: ignore
+
+
+def test_stage_file_copy_fallback(tmp_path: pathlib.Path, no_links: None):
+    source = tmp_path / 'script.sh'
+    source.write_text('#!/bin/sh\n')
+    source.chmod(0o755)
+
+    _files.stage_file(str(source), str(tmp_path / 'staged'))
+
+    staged = tmp_path / 'staged'
+    assert staged.read_text() == '#!/bin/sh\n'
+    assert not os.path.samefile(staged, source)
+    assert stat.S_IMODE(staged.stat().st_mode) == 0o755
+
+
+def test_copy_file_without_copy_file_range(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+):
+    def fail_copy_file_range(src: int, dst: int, count: int) -> int:
+        raise OSError('not supported')
+
+    monkeypatch.setattr(os, 'copy_file_range', fail_copy_file_range, raising=False)
+    source = tmp_path / 'big'
+    source.write_bytes(b'x' * 100_000)
+
+    _files.copy_file(str(source), str(tmp_path / 'copy'))
+
+    assert (tmp_path / 'copy').read_bytes() == b'x' * 100_000
+
+
+def test_move_across_filesystems(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    def fail_replace(src: str, dst: str):
+        raise OSError('cross-device link')
+
+    (tmp_path / 'src' / 'sub').mkdir(parents=True)
+    (tmp_path / 'src' / 'sub' / 'f').write_text('F')
+    (tmp_path / 'file').write_text('FILE')
+    monkeypatch.setattr(os, 'replace', fail_replace)
+
+    _files.move(str(tmp_path / 'src'), str(tmp_path / 'dst'))
+    _files.move(str(tmp_path / 'file'), str(tmp_path / 'file2'))
+
+    assert (tmp_path / 'dst' / 'sub' / 'f').read_text() == 'F'
+    assert (tmp_path / 'file2').read_text() == 'FILE'
+    assert not (tmp_path / 'src').exists()
+    assert not (tmp_path / 'file').exists()
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import importlib
+import json
+import types
+
+import pytest
+
+from jubilant import _json
+
+
+def test_loads():
+    assert _json.loads('{"a": [1, 2.5, "x", null, true]}') == {'a': [1, 2.5, 'x', None, True]}
+
+
+def test_fallback(monkeypatch: pytest.MonkeyPatch):
+    def import_module(name: str) -> types.ModuleType:
+        raise ImportError(name)
+
+    monkeypatch.setattr(importlib, 'import_module', import_module)
+
+    assert _json._find_loads() is json.loads
+
+
+def test_fast_decoder(monkeypatch: pytest.MonkeyPatch):
+    def loads(s: str) -> object:
+        return 'fast'
+
+    def import_module(name: str) -> types.ModuleType:
+        if name != 'msgspec.json':
+            raise ImportError(name)
+        module = types.ModuleType(name)
+        module.decode = loads  # type: ignore
+        return module
+
+    monkeypatch.setattr(importlib, 'import_module', import_module)
+
+    assert _json._find_loads() is loads
@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+import json
+from typing import Any
+
 import pytest
 
 import jubilant
 
+from . import mocks
+from .fake_statuses import MINIMAL_JSON, MINIMAL_STATUS
+
 
 def test_init_defaults():
     juju = jubilant.Juju()
@@ -60,3 +66,18 @@ def test_snap_tempdir(monkeypatch: pytest.MonkeyPatch):
     juju = jubilant.Juju()
 
     assert 'snap' in juju._temp_dir
+
+
+def test_json_loads(run: mocks.Run):
+    run.handle(['juju', 'status', '--format', 'json'], stdout=MINIMAL_JSON)
+    decoded: list[str] = []
+
+    def loads(s: str) -> Any:
+        decoded.append(s)
+        return json.loads(s)
+
+    juju = jubilant.Juju(json_loads=loads)
+    status = juju.status()
+
+    assert status == MINIMAL_STATUS
+    assert decoded == [MINIMAL_JSON]
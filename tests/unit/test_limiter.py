@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import pathlib
+import subprocess
+import threading
+from collections.abc import Generator
+from typing import Any
+
+import pytest
+
+import jubilant
+from jubilant import _limiter
+
+from . import mocks
+
+
+@pytest.fixture(autouse=True)
+def reset_limits() -> Generator[None]:
+    yield
+    _limiter._settings.clear()
+    _limiter._limiters.clear()
+    _limiter._current = None
+
+
+@pytest.fixture
+def juju_data(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> pathlib.Path:
+    (tmp_path / 'controllers.yaml').write_text('current-controller: local\ncontrollers: {}\n')
+    monkeypatch.setenv('JUJU_DATA', str(tmp_path))
+    return tmp_path
+
+
+def test_rate(time: mocks.Time):
+    limiter = jubilant.Limiter(rate=2, burst=2)
+
+    for _ in range(4):
+        with limiter.acquire():
+            pass
+
+    # The first two are in the burst, then one every half second.
+    assert time.monotonic() == 1.0
+    assert limiter.stats() == jubilant.LimiterStats(
+        commands=4, delayed=2, total_wait=1.0, max_wait=0.5
+    )
+
+
+def test_rate_refill(time: mocks.Time):
+    limiter = jubilant.Limiter(rate=1)
+
+    with limiter.acquire():
+        pass
+    time.sleep(5)
+    with limiter.acquire():
+        pass
+
+    assert limiter.stats().delayed == 0
+
+
+def test_max_concurrent():
+    limiter = jubilant.Limiter(2)
+    lock = threading.Lock()
+    running = 0
+    max_running = 0
+
+    def run():
+        nonlocal running, max_running
+        with limiter.acquire():
+            with lock:
+                running += 1
+                max_running = max(max_running, running)
+            threading.Event().wait(0.01)
+            with lock:
+                running -= 1
+
+    threads = [threading.Thread(target=run) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max_running == 2
+    assert limiter.stats().commands == 6
+    assert limiter.stats().delayed > 0
+
+
+def test_controller_from_model(run: mocks.Run):
+    run.handle(['juju', 'status', '--model', 'ctl:mdl'])
+    jubilant.limit_controller('ctl', max_concurrent=1)
+    juju = jubilant.Juju(model='ctl:mdl')
+
+    juju.cli('status')
+
+    limiter = jubilant.controller_limiter('ctl')
+    assert limiter is not None
+    assert limiter.max_concurrent == 1
+    assert limiter.stats().commands == 1
+    assert jubilant.controller_limiter('other') is None
+
+
+def test_current_controller(run: mocks.Run, juju_data: pathlib.Path):
+    run.handle(['juju', 'status', '--model', 'mdl'])
+    jubilant.limit_controller(max_concurrent=4, rate=10)
+    jubilant.limit_controller('other', max_concurrent=1)
+    juju = jubilant.Juju(model='mdl')
+
+    juju.cli('status')
+
+    limiter = jubilant.controller_limiter('local')
+    assert limiter is not None
+    assert (limiter.max_concurrent, limiter.rate) == (4, 10)
+    assert limiter.stats().commands == 1
+    other = jubilant.controller_limiter('other')
+    assert other is not None
+    assert other.max_concurrent == 1
+    assert other.stats().commands == 0
+
+
+def test_unknown_controller(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv('JUJU_DATA', str(tmp_path))
+
+    assert _limiter._current_controller() == ''
+
+
+def test_remove_limits(juju_data: pathlib.Path):
+    jubilant.limit_controller(max_concurrent=4)
+    assert jubilant.controller_limiter('local') is not None
+
+    jubilant.limit_controller()
+
+    assert jubilant.controller_limiter('local') is None
+    assert _limiter.limiter_for_model('mdl') is None
+
+
+def test_error_releases(run: mocks.Run):
+    run.handle(['juju', 'error', '--model', 'ctl:mdl'], returncode=1)
+    jubilant.limit_controller('ctl', max_concurrent=1)
+    juju = jubilant.Juju(model='ctl:mdl')
+
+    for _ in range(2):
+        with pytest.raises(subprocess.CalledProcessError):
+            juju.cli('error')
+
+    limiter = jubilant.controller_limiter('ctl')
+    assert limiter is not None
+    assert limiter.stats().commands == 2
+
+
+def test_async(async_run: mocks.Run):
+    async_run.handle(['juju', 'status', '--model', 'ctl:mdl'], stdout='OUT')
+    jubilant.limit_controller('ctl', max_concurrent=1)
+    juju = jubilant.AsyncJuju(model='ctl:mdl')
+
+    async def run_all() -> list[str]:
+        return await asyncio.gather(*(juju.cli('status') for _ in range(3)))
+
+    assert asyncio.run(run_all()) == ['OUT'] * 3
+    limiter = jubilant.controller_limiter('ctl')
+    assert limiter is not None
+    assert limiter.stats().commands == 3
+
+
+def test_async_cancelled():
+    limiter = jubilant.Limiter(max_concurrent=1)
+
+    async def run() -> None:
+        await limiter._acquire_async()
+        # Cancel a waiter while the only slot is held.
+        waiter = asyncio.ensure_future(limiter._acquire_async())
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        limiter._release()
+
+        # The cancelled waiter didn't take the slot, so it's free again.
+        await asyncio.wait_for(limiter._acquire_async(), timeout=1)
+        limiter._release()
+
+    asyncio.run(run())
+    assert limiter.stats().commands == 2
+
+
+def test_async_cancelled_rate():
+    limiter = jubilant.Limiter(max_concurrent=1, rate=1)
+
+    async def run() -> None:
+        await limiter._acquire_async()
+        limiter._release()
+        # The second acquire waits a second for a token, holding the slot; cancel it.
+        waiter = asyncio.ensure_future(limiter._acquire_async())
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+    asyncio.run(run())
+    assert limiter._running == 0
+
+
+def test_async_waits_for_thread(monkeypatch: pytest.MonkeyPatch):
+    limiter = jubilant.Limiter(max_concurrent=1)
+    held = threading.Event()
+    release = threading.Event()
+
+    def hold():
+        with limiter.acquire():
+            held.set()
+            release.wait(timeout=5)
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    held.wait(timeout=5)
+
+    async def sleep(delay: float) -> None:
+        raise AssertionError('waiting for a place should not poll')
+
+    async def run() -> None:
+        monkeypatch.setattr('asyncio.sleep', sleep)
+        waiter = asyncio.ensure_future(limiter._acquire_async())
+        await asyncio.wait([waiter], timeout=0.05)
+        assert not waiter.done()
+        release.set()
+        await asyncio.wait_for(waiter, timeout=5)
+        limiter._release()
+
+    asyncio.run(run())
+    thread.join()
+    assert limiter.stats().commands == 2
+    assert limiter._running == 0
+
+
+def test_limit_controller_updates_in_place():
+    jubilant.limit_controller('ctl', max_concurrent=2)
+    limiter = jubilant.controller_limiter('ctl')
+    assert limiter is not None
+    limiter._acquire()
+    limiter._acquire()
+
+    jubilant.limit_controller('ctl', max_concurrent=1)
+
+    # The two commands already running still count against the new limit.
+    assert jubilant.controller_limiter('ctl') is limiter
+    assert limiter.max_concurrent == 1
+    acquired = threading.Event()
+
+    def acquire():
+        limiter._acquire()
+        acquired.set()
+
+    thread = threading.Thread(target=acquire)
+    thread.start()
+    limiter._release()
+    assert not acquired.wait(timeout=0.05)
+    limiter._release()
+    assert acquired.wait(timeout=5)
+    thread.join()
+    limiter._release()
+    assert limiter.stats().commands == 3
+
+
+def test_current_controller_cached(juju_data: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    loads = 0
+    safe_load = _limiter._yaml.safe_load
+
+    def counting_safe_load(stream: Any) -> Any:
+        nonlocal loads
+        loads += 1
+        return safe_load(stream)
+
+    monkeypatch.setattr(_limiter._yaml, 'safe_load', counting_safe_load)
+
+    assert _limiter._current_controller() == 'local'
+    assert _limiter._current_controller() == 'local'
+    assert loads == 1
+
+    path = juju_data / 'controllers.yaml'
+    path.write_text('current-controller: other\ncontrollers: {}\n')
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert _limiter._current_controller() == 'other'
+    assert loads == 2
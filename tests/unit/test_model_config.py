@@ -1,3 +1,5 @@
+import asyncio
+
 import jubilant
 
 from . import mocks
@@ -91,3 +93,13 @@ def test_set_with_reset(run: mocks.Run):
     juju = jubilant.Juju()
     retval = juju.model_config({'foo': 'bar'}, reset=['baz', 'buzz'])
     assert retval is None
+
+
+def test_async(async_run: mocks.Run):
+    async_run.handle(['juju', 'model-config', '--format', 'json'], stdout=CONFIG_JSON)
+    async_run.handle(['juju', 'model-config', 'booly=false', '--reset', 'inty'])
+    juju = jubilant.AsyncJuju()
+
+    values = asyncio.run(juju.model_config())
+    assert values == {'booly': True, 'inty': 42, 'floaty': 7.5, 'stry': 'A string.'}
+    asyncio.run(juju.model_config({'booly': False}, reset='inty'))
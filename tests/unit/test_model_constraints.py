@@ -1,3 +1,5 @@
+import asyncio
+
 import jubilant
 from tests.unit import mocks
 
@@ -43,3 +45,14 @@ def test_set(run: mocks.Run):
         }
     )
     assert retval is None
+
+
+def test_async(async_run: mocks.Run):
+    async_run.handle(
+        ['juju', 'model-constraints', '--format', 'json'], stdout='{"arch":"amd64","cores":8}'
+    )
+    async_run.handle(['juju', 'set-model-constraints', 'cores=4'])
+    juju = jubilant.AsyncJuju()
+
+    assert asyncio.run(juju.model_constraints()) == {'arch': 'amd64', 'cores': 8}
+    asyncio.run(juju.model_constraints({'cores': 4}))
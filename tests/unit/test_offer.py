@@ -1,3 +1,5 @@
+import asyncio
+
 import jubilant
 
 from . import mocks
@@ -37,3 +39,10 @@ def test_multiple_endpoints(run: mocks.Run):
     juju = jubilant.Juju()
 
     juju.offer('mysql', endpoint=['db', 'log'])
+
+
+def test_async(async_run: mocks.Run):
+    async_run.handle(['juju', 'offer', 'mysql:db,log', '--controller', 'otherc', 'nam'])
+    juju = jubilant.AsyncJuju(model='mdl')
+
+    asyncio.run(juju.offer('mysql', endpoint=['db', 'log'], controller='otherc', name='nam'))
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import concurrent.futures
+import threading
+
+import pytest
+
+import jubilant
+
+
+class FakeExecutor:
+    """Executor that records commands, running them in the submitting thread."""
+
+    def __init__(
+        self,
+        fail: tuple[str, ...] = (),
+        barrier: threading.Barrier | None = None,
+        slow: tuple[str, ...] = (),
+    ):
+        self.commands: list[tuple[str, ...]] = []
+        self._fail = fail
+        self._barrier = barrier
+        self._slow = slow
+        self._lock = threading.Lock()
+
+    def submit(
+        self, args: list[str], *, stdin: str | None, timeout: float | None
+    ) -> concurrent.futures.Future[tuple[str, str]]:
+        command = tuple(args[1:])
+        if self._barrier is not None and command[0] == 'deploy':
+            self._barrier.wait(timeout=5)
+        if command == self._slow:
+            threading.Event().wait(0.5)
+        with self._lock:
+            self.commands.append(command)
+        future: concurrent.futures.Future[tuple[str, str]] = concurrent.futures.Future()
+        if command == self._fail:
+            future.set_exception(jubilant.CLIError(1, args, '', 'failed'))
+        else:
+            future.set_result(('', ''))
+        return future
+
+
+def test_execute():
+    executor = FakeExecutor()
+    juju = jubilant.Juju(executor=executor)
+    plan = jubilant.DeploymentPlan()
+    plan.deploy('mysql-k8s', 'mysql', channel='8.0/stable', trust=True)
+    plan.deploy('wordpress-k8s', 'wordpress')
+    plan.deploy('traefik-k8s')
+    plan.integrate('wordpress:database', 'mysql')
+    plan.integrate('wordpress', 'traefik-k8s')
+    plan.integrate('mysql', 'othermodel.s3')
+    plan.config('wordpress', {'name': 'My Wiki'}, reset='theme')
+
+    plan.execute(juju, max_workers=2)
+
+    assert sorted(executor.commands) == sorted(
+        [
+            ('deploy', 'mysql-k8s', 'mysql', '--channel', '8.0/stable', '--trust'),
+            ('deploy', 'wordpress-k8s', 'wordpress'),
+            ('deploy', 'traefik-k8s'),
+            ('integrate', 'wordpress:database', 'mysql'),
+            ('integrate', 'wordpress', 'traefik-k8s'),
+            ('integrate', 'mysql', 'othermodel.s3'),
+            ('config', 'wordpress', 'name=My Wiki', '--reset', 'theme'),
+        ]
+    )
+
+    def position(*command: str) -> int:
+        return executor.commands.index(command)
+
+    deploy_mysql = position('deploy', 'mysql-k8s', 'mysql', '--channel', '8.0/stable', '--trust')
+    deploy_wordpress = position('deploy', 'wordpress-k8s', 'wordpress')
+    deploy_traefik = position('deploy', 'traefik-k8s')
+    assert position('integrate', 'wordpress:database', 'mysql') > deploy_mysql
+    assert position('integrate', 'wordpress:database', 'mysql') > deploy_wordpress
+    assert position('integrate', 'wordpress', 'traefik-k8s') > deploy_wordpress
+    assert position('integrate', 'wordpress', 'traefik-k8s') > deploy_traefik
+    assert position('integrate', 'mysql', 'othermodel.s3') > deploy_mysql
+    assert position('config', 'wordpress', 'name=My Wiki', '--reset', 'theme') > deploy_wordpress
+
+
+def test_deploys_run_concurrently():
+    # Each deploy waits until the other has started, so this only passes if they run at once.
+    executor = FakeExecutor(barrier=threading.Barrier(2))
+    juju = jubilant.Juju(executor=executor)
+    plan = jubilant.DeploymentPlan().deploy('a').deploy('b').integrate('a', 'b')
+
+    plan.execute(juju, max_workers=2)
+
+    assert executor.commands[-1] == ('integrate', 'a', 'b')
+
+
+def test_steps_without_deploys():
+    executor = FakeExecutor()
+    juju = jubilant.Juju(executor=executor)
+    plan = jubilant.DeploymentPlan().integrate('a', 'b').config('a', reset=['x', 'y'])
+
+    plan.execute(juju)
+
+    assert sorted(executor.commands) == [
+        ('config', 'a', '--reset', 'x,y'),
+        ('integrate', 'a', 'b'),
+    ]
+
+
+def test_config_order():
+    # The first config change is slow, but the second one (and the integrate after it) wait.
+    executor = FakeExecutor(slow=('config', 'a', 'x=1'))
+    juju = jubilant.Juju(executor=executor)
+    plan = jubilant.DeploymentPlan()
+    plan.deploy('a').deploy('b')
+    plan.config('a', {'x': 1}).config('a', {'x': 2}).config('b', {'y': 3})
+    plan.integrate('a', 'b')
+
+    plan.execute(juju, max_workers=4)
+
+    commands = [c for c in executor.commands if c[0] != 'deploy']
+    assert commands == [
+        ('config', 'b', 'y=3'),
+        ('config', 'a', 'x=1'),
+        ('config', 'a', 'x=2'),
+        ('integrate', 'a', 'b'),
+    ]
+
+
+def test_failure_skips_dependents():
+    executor = FakeExecutor(fail=('deploy', 'a'))
+    juju = jubilant.Juju(executor=executor)
+    plan = (
+        jubilant.DeploymentPlan().deploy('a').deploy('b').integrate('a', 'b').config('b', {'x': 1})
+    )
+
+    with pytest.raises(jubilant.CLIError):
+        plan.execute(juju, max_workers=1)
+
+    assert ('integrate', 'a', 'b') not in executor.commands
+    assert ('config', 'b', 'x=1') not in executor.commands
+
+
+def test_invalid_steps():
+    plan = jubilant.DeploymentPlan()
+    plan.deploy('mysql')
+    with pytest.raises(ValueError):
+        plan.deploy('mysql')
+    with pytest.raises(ValueError):
+        plan.deploy('./foo.charm')
+    with pytest.raises(TypeError):
+        plan.deploy('postgresql', chanel='14/stable')
+    with pytest.raises(TypeError):
+        plan.config('mysql')
+
+
+def test_repr():
+    plan = jubilant.DeploymentPlan().deploy('a').deploy('b').integrate('a', 'b:db')
+    assert repr(plan) == '<DeploymentPlan: deploy a, deploy b, integrate a b:db>'
+
+
+def test_failure_cancels_queued_steps():
+    # While "deploy b" is running, "deploy a" fails, so the queued "deploy c" is cancelled.
+    executor = FakeExecutor(fail=('deploy', 'a'), slow=('deploy', 'b'))
+    juju = jubilant.Juju(executor=executor)
+    plan = jubilant.DeploymentPlan().deploy('a').deploy('b').deploy('c')
+
+    with pytest.raises(jubilant.CLIError):
+        plan.execute(juju, max_workers=1)
+
+    assert ('deploy', 'c') not in executor.commands
@@ -1,6 +1,7 @@
 import json
 
 import jubilant
+from jubilant import _pretty
 
 from .fake_statuses import DATABASE_WEBAPP_JSON, MINIMAL_STATUS, SNAPPASS_JSON
 
@@ -173,8 +174,50 @@ def test_diff():
 - .apps['database'].app_status.current = 'active'
 + .apps['database'].app_status.current = 'waiting'
 - .apps['database'].relations['db'][0].scope = 'global'
++ .apps['database'].relations['db'][0].scope = 'testy'
 - .apps['database'].relations['db'][1].related_app = 'dummy'
 - .apps['database'].relations['db'][1].interface = 'xyz'
-- .apps['database'].relations['db'][1].scope = 'foobar'
-+ .apps['database'].relations['db'][0].scope = 'testy'"""
+- .apps['database'].relations['db'][1].scope = 'foobar'"""
     )
+
+
+def test_diff_added_removed():
+    old_json = json.loads(DATABASE_WEBAPP_JSON)
+    new_json = json.loads(DATABASE_WEBAPP_JSON)
+    del new_json['applications']['webapp']
+    new_json['applications']['database']['units']['database/0']['leader'] = False
+    new_json['applications']['database']['subordinate-to'] = ['foo']
+    old_status = jubilant.Status._from_dict(old_json)
+    new_status = jubilant.Status._from_dict(new_json)
+
+    lines = jubilant._juju._status_diff(old_status, new_status).splitlines()
+
+    assert "+ .apps['database'].subordinate_to[0] = 'foo'" in lines
+    # Fields set to their default are omitted, as in gron output.
+    assert "- .apps['database'].units['database/0'].leader = True" in lines
+    assert not any(line.startswith("+ .apps['database'].units") for line in lines)
+    assert all(line.startswith('- ') for line in lines if "['webapp']" in line)
+    assert "- .apps['webapp'].charm = 'local:webapp-0'" in lines
+
+
+def test_diff_equal():
+    old_status = jubilant.Status._from_dict(json.loads(DATABASE_WEBAPP_JSON))
+    new_status = jubilant.Status._from_dict(json.loads(DATABASE_WEBAPP_JSON))
+
+    assert jubilant._juju._status_diff(old_status, new_status) == ''
+    assert list(_pretty.diff(1, 1)) == []
+    assert list(_pretty.diff([1, 2], [1, 3, 4], '.x')) == [
+        '- .x[1] = 2',
+        '+ .x[1] = 3',
+        '+ .x[2] = 4',
+    ]
+
+
+def test_diff_first():
+    status = jubilant.Status._from_dict(json.loads(SNAPPASS_JSON))
+
+    lines = jubilant._juju._status_diff(None, status).splitlines()
+
+    assert lines[0] == "+ .model.name = 'tt'"
+    assert all(line.startswith('+ ') for line in lines)
+    assert not any('since' in line or 'timestamp' in line for line in lines)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import pathlib
 import subprocess
 import tempfile
@@ -99,8 +100,9 @@ def test_tempdir(monkeypatch: pytest.MonkeyPatch):
         ]
         temp_dir = pathlib.Path(args[4]).parent
         assert '/snap/juju/common' in str(temp_dir)
-        assert args[4] == f'{temp_dir}/_temp.charm'
-        assert args[6] == f'r1={temp_dir}/r1'
+        assert temp_dir.name == 'jubilant-cache'
+        assert args[4].endswith('.charm')
+        assert args[6].startswith(f'r1={temp_dir}/')
         assert pathlib.Path(args[4]).read_text() == 'CH'
         assert pathlib.Path(args[6][3:]).read_text() == 'R1'
         return subprocess.CompletedProcess(args, 0, '', '')
@@ -109,6 +111,7 @@ def test_tempdir(monkeypatch: pytest.MonkeyPatch):
     monkeypatch.setattr('shutil.which', lambda _: '/snap/bin/juju')  # type: ignore
 
     with tempfile.TemporaryDirectory() as temp:
+        monkeypatch.setenv('HOME', temp)
         (pathlib.Path(temp) / 'my.charm').write_text('CH')
         (pathlib.Path(temp) / 'r1').write_text('R1')
 
@@ -123,3 +126,12 @@ def test_tempdir(monkeypatch: pytest.MonkeyPatch):
         )
 
     assert num_calls == 1
+
+
+def test_async(async_run: mocks.Run):
+    async_run.handle(
+        ['juju', 'refresh', '--model', 'mdl', 'xyz', '--channel', 'latest/edge', '--trust']
+    )
+    juju = jubilant.AsyncJuju(model='mdl')
+
+    asyncio.run(juju.refresh('xyz', channel='latest/edge', trust=True))
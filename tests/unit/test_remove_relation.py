@@ -1,3 +1,5 @@
+import asyncio
+
 import jubilant
 
 from . import mocks
@@ -29,3 +31,10 @@ def test_force(run: mocks.Run):
     juju = jubilant.Juju()
 
     juju.remove_relation('app1', 'app2', force=True)
+
+
+def test_async(async_run: mocks.Run):
+    async_run.handle(['juju', 'remove-relation', 'app1:db', 'app2:db', '--force'])
+    juju = jubilant.AsyncJuju()
+
+    asyncio.run(juju.remove_relation('app1:db', 'app2:db', force=True))
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+
 import jubilant
 from tests.unit import mocks
 
@@ -18,3 +20,10 @@ def test_multiple(run: mocks.Run):
     juju = jubilant.Juju()
 
     juju.remove_ssh_key('user1@host', 'user2@host')
+
+
+def test_async(async_run: mocks.Run):
+    async_run.handle(['juju', 'remove-ssh-key', 'user1@host', 'user2@host'])
+    juju = jubilant.AsyncJuju()
+
+    asyncio.run(juju.remove_ssh_key('user1@host', 'user2@host'))
@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 
 import jubilant
@@ -52,3 +54,12 @@ def test_three_units_error():
 
     with pytest.raises(TypeError):
         juju.remove_unit('unit/0', 'unit/1', 'unit/2', num_units=3)
+
+
+def test_async(async_run: mocks.Run):
+    async_run.handle(['juju', 'remove-unit', '--no-prompt', 'wordpress', '--num-units', '2'])
+    juju = jubilant.AsyncJuju()
+
+    asyncio.run(juju.remove_unit('wordpress', num_units=2))
+    with pytest.raises(TypeError):
+        asyncio.run(juju.remove_unit('wordpress/0', 'wordpress/1', num_units=2))
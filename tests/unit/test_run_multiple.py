@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import asyncio
+import subprocess
+import sys
+import threading
+from collections.abc import Generator
+from typing import Any
+
+import pytest
+import yaml
+
+import jubilant
+
+from . import mocks
+
+
+def task_json(unit: str, id: str, return_code: int = 0) -> str:
+    return f'{{"{unit}": {{"id": "{id}", "results": {{"return-code": {return_code}}}, "status": "completed"}}}}'
+
+
+def test_multiple(run: mocks.Run):
+    run.handle(
+        ['juju', 'run', '--format', 'json', 'mysql/0', 'backup'], stdout=task_json('mysql/0', '1')
+    )
+    run.handle(
+        ['juju', 'run', '--format', 'json', 'mysql/1', 'backup'],
+        returncode=1,
+        stdout=task_json('mysql/1', '2', return_code=1),
+        stderr='task failed',
+    )
+    run.handle(
+        ['juju', 'run', '--format', 'json', 'mysql/leader', 'backup'],
+        stdout=task_json('mysql/2', '3'),
+    )
+    juju = jubilant.Juju()
+
+    results = dict(juju.run_multiple(['mysql/0', 'mysql/1', 'mysql/leader'], 'backup'))
+
+    assert results == {
+        'mysql/0': jubilant.Task(id='1', status='completed'),
+        'mysql/1': jubilant.Task(id='2', status='completed', return_code=1),
+        'mysql/2': jubilant.Task(id='3', status='completed'),
+    }
+    assert not results['mysql/1'].success
+
+
+class ConcurrencyRunner:
+    """Runner that records the most commands it has run at once."""
+
+    def __init__(self):
+        self.running = 0
+        self.max_running = 0
+        self.lock = threading.Lock()
+
+    def run(
+        self, args: list[str], *, stdin: str | None, timeout: float | None
+    ) -> subprocess.CompletedProcess[str]:
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        threading.Event().wait(0.01)
+        with self.lock:
+            self.running -= 1
+        unit = next(arg for arg in args if arg.startswith('mysql/'))
+        return subprocess.CompletedProcess(args, 0, task_json(unit, unit[-1]), '')
+
+
+@pytest.fixture
+def reset_limits() -> Generator[None]:
+    yield
+    jubilant.limit_controller('ctl')
+
+
+def test_limiter(reset_limits: None):
+    jubilant.limit_controller('ctl', max_concurrent=2)
+    runner = ConcurrencyRunner()
+    juju = jubilant.Juju(model='ctl:mdl', runner=runner)
+
+    units = [f'mysql/{i}' for i in range(8)]
+    results = dict(juju.run_multiple(units, 'backup', max_workers=8))
+
+    assert sorted(results) == units
+    assert runner.max_running == 2
+    limiter = jubilant.controller_limiter('ctl')
+    assert limiter is not None
+    assert limiter.stats().commands == 8
+
+
+def test_params_and_wait(run: mocks.Run, mock_file: mocks.NamedTemporaryFile):
+    for i in range(3):
+        run.handle(
+            [
+                'juju',
+                'run',
+                '--format',
+                'json',
+                f'mysql/{i}',
+                'backup',
+                '--wait',
+                '10s',
+                '--params',
+                mock_file.name,
+            ],
+            stdout=task_json(f'mysql/{i}', str(i)),
+        )
+    juju = jubilant.Juju()
+
+    units = [
+        unit
+        for unit, _ in juju.run_multiple(
+            [f'mysql/{i}' for i in range(3)], 'backup', {'a': 1}, wait=10
+        )
+    ]
+
+    assert sorted(units) == ['mysql/0', 'mysql/1', 'mysql/2']
+    # The params file is written once and shared by all units.
+    assert yaml.safe_load(''.join(mock_file.writes)) == {'a': 1}
+    assert mock_file.num_flushes == 1
+
+
+def test_error(run: mocks.Run):
+    run.handle(
+        ['juju', 'run', '--format', 'json', 'mysql/0', 'backup', '--wait', '0.001s'],
+        returncode=1,
+        stderr='timed out',
+    )
+    juju = jubilant.Juju()
+
+    with pytest.raises(TimeoutError):
+        list(juju.run_multiple(['mysql/0'], 'backup', wait=0.001))
+
+
+def test_type_error():
+    juju = jubilant.Juju()
+
+    with pytest.raises(TypeError):
+        list(juju.run_multiple('mysql/0', 'backup'))
+
+
+def test_async(async_run: mocks.Run):
+    for i in range(3):
+        async_run.handle(
+            ['juju', 'run', '--format', 'json', f'mysql/{i}', 'backup'],
+            stdout=task_json(f'mysql/{i}', str(i)),
+        )
+    juju = jubilant.AsyncJuju()
+
+    async def run_all() -> list[str]:
+        units = [f'mysql/{i}' for i in range(3)]
+        return [unit async for unit, _ in juju.run_multiple(units, 'backup', max_workers=2)]
+
+    units = asyncio.run(run_all())
+
+    assert sorted(units) == ['mysql/0', 'mysql/1', 'mysql/2']
+
+
+def test_async_cancelled(monkeypatch: pytest.MonkeyPatch):
+    processes: list[asyncio.subprocess.Process] = []
+    create_subprocess_exec = asyncio.create_subprocess_exec
+
+    async def create(*args: Any, **kwargs: Any) -> asyncio.subprocess.Process:
+        # Run a slow process instead of juju.
+        process = await create_subprocess_exec(
+            sys.executable, '-c', 'import time; time.sleep(30)', **kwargs
+        )
+        processes.append(process)
+        return process
+
+    monkeypatch.setattr(asyncio, 'create_subprocess_exec', create)
+    juju = jubilant.AsyncJuju()
+
+    async def run() -> None:
+        results = juju.run_multiple(['mysql/0', 'mysql/1'], 'backup', params={'x': 1})
+        task = asyncio.ensure_future(results.__anext__())
+        while len(processes) < 2:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # Both actions were cancelled and their processes reaped before run_multiple returned.
+        assert all(process.returncode is not None for process in processes)
+
+    asyncio.run(run())
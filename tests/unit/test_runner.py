@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import asyncio
+import pathlib
+import subprocess
+import sys
+from collections.abc import Generator
+
+import pytest
+
+import jubilant
+
+WORKER_COMMAND = [sys.executable, str(pathlib.Path(__file__).parent / 'fake_worker.py')]
+
+
+@pytest.fixture
+def runner() -> Generator[jubilant.WorkerRunner]:
+    with jubilant.WorkerRunner(WORKER_COMMAND) as runner:
+        yield runner
+
+
+def test_cli(runner: jubilant.WorkerRunner):
+    juju = jubilant.Juju(model='mdl', runner=runner)
+
+    assert juju.cli('deploy', 'app1') == 'deploy --model mdl app1\n'
+    assert juju.cli('cat', stdin='multi\nline', include_model=False) == 'multi\nline'
+
+
+def test_persistent(runner: jubilant.WorkerRunner):
+    juju = jubilant.Juju(runner=runner)
+
+    pids = {juju.cli('pid') for _ in range(3)}
+
+    assert len(pids) == 1
+
+
+def test_error(runner: jubilant.WorkerRunner):
+    juju = jubilant.Juju(runner=runner)
+
+    with pytest.raises(jubilant.CLIError) as excinfo:
+        juju.cli('fail')
+
+    exc = excinfo.value
+    assert exc.returncode == 2
+    assert exc.cmd == ['juju', 'fail']
+    assert exc.stdout == 'OUT'
+    assert exc.stderr == 'ERR'
+
+
+def test_timeout(runner: jubilant.WorkerRunner):
+    juju = jubilant.Juju(runner=runner)
+
+    with pytest.raises(subprocess.TimeoutExpired) as excinfo:
+        juju._cli('slow', timeout=5)
+
+    assert excinfo.value.timeout == 5
+    assert excinfo.value.stdout == 'partial'
+
+
+def test_no_reply(runner: jubilant.WorkerRunner, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr('jubilant._runner._TIMEOUT_SLACK', 0.1)
+    juju = jubilant.Juju(runner=runner)
+    pid = juju.cli('pid')
+
+    with pytest.raises(subprocess.TimeoutExpired) as excinfo:
+        juju._cli('hang', timeout=0.1)
+
+    assert excinfo.value.timeout == 0.1
+    # The stuck worker was killed, and a new one runs the next command.
+    assert juju.cli('pid') != pid
+
+
+def test_restart(runner: jubilant.WorkerRunner):
+    juju = jubilant.Juju(runner=runner)
+    pid = juju.cli('pid')
+
+    with pytest.raises(RuntimeError):
+        juju.cli('exit')
+
+    assert juju.cli('pid') != pid
+
+
+def test_close():
+    runner = jubilant.WorkerRunner(WORKER_COMMAND)
+    juju = jubilant.Juju(runner=runner)
+    pid = juju.cli('pid')
+
+    runner.close()
+    runner.close()
+
+    assert juju.cli('pid') != pid
+    runner.close()
+
+
+def test_async(runner: jubilant.WorkerRunner):
+    juju = jubilant.AsyncJuju(runner=runner)
+
+    async def run_all() -> list[str]:
+        return await asyncio.gather(*(juju.cli('echo', str(i)) for i in range(3)))
+
+    assert asyncio.run(run_all()) == ['echo 0\n', 'echo 1\n', 'echo 2\n']
+
+    with pytest.raises(jubilant.CLIError):
+        asyncio.run(juju.cli('fail'))
@@ -1,4 +1,7 @@
+import os
 import pathlib
+import subprocess
+from typing import Any
 
 import pytest
 
@@ -55,41 +58,103 @@ def test_type_error():
         juju.scp('src', 'dst', scp_options='invalid')
 
 
+@pytest.fixture
+def snap_juju(monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path) -> jubilant.Juju:
+    monkeypatch.setattr('shutil.which', lambda _: '/snap/bin/juju')  # type: ignore
+    monkeypatch.setenv('HOME', str(tmp_path / 'home'))
+    return jubilant.Juju()
+
+
 def test_src_tempdir(
-    run: mocks.Run, mock_file: mocks.NamedTemporaryFile, monkeypatch: pytest.MonkeyPatch
+    snap_juju: jubilant.Juju, monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path
 ):
-    copy_src, copy_dst = '', ''
+    source = tmp_path / 'dump.sql'
+    source.write_text('DATA')
+    staged = ''
 
-    def mock_copy(src: str, dst: str):
-        nonlocal copy_src, copy_dst
-        copy_src, copy_dst = src, dst
+    def mock_run(args: 'list[str]', **_: Any):
+        nonlocal staged
+        assert args[:3] == ['juju', 'scp', '--']
+        assert args[4] == 'target:/dest'
+        staged = args[3]
+        assert '/snap/juju/common/' in staged
+        assert os.path.basename(staged) == 'dump.sql'
+        # Same filesystem, so it's a hard link rather than a copy.
+        assert os.path.samefile(staged, source)
+        return subprocess.CompletedProcess(args, 0, '', '')
 
-    monkeypatch.setattr('shutil.which', lambda _: '/snap/bin/juju')  # type: ignore
-    monkeypatch.setattr('shutil.copy', mock_copy)
-    run.handle(['juju', 'scp', '--', mock_file.name, 'target:/dest'])
+    monkeypatch.setattr('subprocess.run', mock_run)
 
-    juju = jubilant.Juju()
-    juju.scp('/local/file', 'target:/dest')
+    snap_juju.scp(source, 'target:/dest')
+
+    assert staged
+    assert not os.path.exists(staged)
+    assert source.read_text() == 'DATA'
+
+
+def test_src_tempdir_directory(
+    snap_juju: jubilant.Juju, monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path
+):
+    source = tmp_path / 'logs'
+    (source / 'sub').mkdir(parents=True)
+    (source / 'a.log').write_text('A')
+    (source / 'sub' / 'b.log').write_text('B')
+
+    def mock_run(args: 'list[str]', **_: Any):
+        assert args[:4] == ['juju', 'scp', '--', '-r']
+        staged = pathlib.Path(args[4])
+        assert staged.name == 'logs'
+        assert (staged / 'a.log').read_text() == 'A'
+        assert (staged / 'sub' / 'b.log').read_text() == 'B'
+        return subprocess.CompletedProcess(args, 0, '', '')
+
+    monkeypatch.setattr('subprocess.run', mock_run)
 
-    assert copy_src == '/local/file'
-    assert copy_dst == mock_file.name
+    snap_juju.scp(source, 'target:/dest', scp_options=['-r'])
 
 
 def test_dst_tempdir(
-    run: mocks.Run, mock_file: mocks.NamedTemporaryFile, monkeypatch: pytest.MonkeyPatch
+    snap_juju: jubilant.Juju, monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path
 ):
-    copy_src, copy_dst = '', ''
+    def mock_run(args: 'list[str]', **_: Any):
+        assert args[:4] == ['juju', 'scp', '--', 'target:/var/dump.sql']
+        assert '/snap/juju/common/' in args[4]
+        pathlib.Path(args[4]).write_text('DATA')
+        return subprocess.CompletedProcess(args, 0, '', '')
 
-    def mock_copy(src: str, dst: str):
-        nonlocal copy_src, copy_dst
-        copy_src, copy_dst = src, dst
+    monkeypatch.setattr('subprocess.run', mock_run)
 
-    monkeypatch.setattr('shutil.which', lambda _: '/snap/bin/juju')  # type: ignore
-    monkeypatch.setattr('shutil.copy', mock_copy)
-    run.handle(['juju', 'scp', '--', 'target:/source', mock_file.name])
+    snap_juju.scp('target:/var/dump.sql', tmp_path / 'local.sql')
+    assert (tmp_path / 'local.sql').read_text() == 'DATA'
 
-    juju = jubilant.Juju()
-    juju.scp('target:/source', '/local/file')
+    # Into an existing directory, using the remote file's name.
+    (tmp_path / 'dir').mkdir()
+    snap_juju.scp('target:/var/dump.sql', tmp_path / 'dir')
+    assert (tmp_path / 'dir' / 'dump.sql').read_text() == 'DATA'
+
+
+def test_dst_tempdir_directory(
+    snap_juju: jubilant.Juju, monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path
+):
+    def mock_run(args: 'list[str]', **_: Any):
+        assert args[:5] == ['juju', 'scp', '--', '-r', 'target:/var/logs/']
+        staged = pathlib.Path(args[5])
+        (staged / 'sub').mkdir(parents=True)
+        (staged / 'sub' / 'b.log').write_text('B')
+        return subprocess.CompletedProcess(args, 0, '', '')
+
+    monkeypatch.setattr('subprocess.run', mock_run)
+
+    snap_juju.scp('target:/var/logs/', tmp_path / 'logs', scp_options=['-r'])
+
+    assert (tmp_path / 'logs' / 'sub' / 'b.log').read_text() == 'B'
+
+
+def test_dst_tempdir_error(snap_juju: jubilant.Juju, monkeypatch: pytest.MonkeyPatch):
+    def mock_run(args: 'list[str]', **_: Any):
+        raise subprocess.CalledProcessError(1, args, '', 'no such file')
+
+    monkeypatch.setattr('subprocess.run', mock_run)
 
-    assert copy_src == mock_file.name
-    assert copy_dst == '/local/file'
+    with pytest.raises(jubilant.CLIError):
+        snap_juju.scp('target:/missing', '/local/file')
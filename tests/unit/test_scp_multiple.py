@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import pathlib
+import subprocess
+import threading
+from collections.abc import Generator
+from typing import Any
+
+import pytest
+
+import jubilant
+
+from . import mocks
+
+
+def test_multiple(run: mocks.Run):
+    run.handle(['juju', 'scp', '--model', 'mdl', '--', 'SRC', 'mysql/0:/tmp/'])
+    run.handle(
+        ['juju', 'scp', '--model', 'mdl', '--', 'SRC', 'mysql/1:/tmp/'],
+        returncode=1,
+        stderr='connection refused',
+    )
+    run.handle(['juju', 'scp', '--model', 'mdl', '--', 'SRC', 'mysql/2:/tmp/'])
+    juju = jubilant.Juju(model='mdl')
+
+    results = juju.scp_multiple('SRC', [f'mysql/{i}:/tmp/' for i in range(3)])
+
+    assert list(results) == ['mysql/0:/tmp/', 'mysql/1:/tmp/', 'mysql/2:/tmp/']
+    assert results['mysql/0:/tmp/'] is None
+    assert results['mysql/2:/tmp/'] is None
+    error = results['mysql/1:/tmp/']
+    assert isinstance(error, jubilant.CLIError)
+    assert error.stderr == 'connection refused'
+
+
+def test_options(run: mocks.Run):
+    run.handle(
+        [
+            'juju',
+            'scp',
+            '--container',
+            'redis',
+            '--no-host-key-checks',
+            '--',
+            '-r',
+            'DIR',
+            'redis/0:/data',
+        ]
+    )
+    juju = jubilant.Juju()
+
+    results = juju.scp_multiple(
+        pathlib.Path('DIR'),
+        ['redis/0:/data'],
+        container='redis',
+        host_key_checks=False,
+        scp_options=['-r'],
+    )
+
+    assert results == {'redis/0:/data': None}
+
+
+class BarrierRunner:
+    """Runner that only completes once *parties* commands are running at the same time."""
+
+    def __init__(self, parties: int):
+        self._barrier = threading.Barrier(parties)
+
+    def run(
+        self, args: list[str], *, stdin: str | None, timeout: float | None
+    ) -> subprocess.CompletedProcess[str]:
+        self._barrier.wait(timeout=5)
+        return subprocess.CompletedProcess(args, 0, '', '')
+
+
+def test_concurrent():
+    juju = jubilant.Juju(runner=BarrierRunner(3))
+
+    results = juju.scp_multiple('SRC', ['a/0:', 'a/1:', 'a/2:'], max_workers=3)
+
+    assert results == {'a/0:': None, 'a/1:': None, 'a/2:': None}
+
+
+class ConcurrencyRunner:
+    """Runner that records the most commands it has run at once."""
+
+    def __init__(self):
+        self.running = 0
+        self.max_running = 0
+        self.lock = threading.Lock()
+
+    def run(
+        self, args: list[str], *, stdin: str | None, timeout: float | None
+    ) -> subprocess.CompletedProcess[str]:
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        threading.Event().wait(0.01)
+        with self.lock:
+            self.running -= 1
+        return subprocess.CompletedProcess(args, 0, '', '')
+
+
+@pytest.fixture
+def reset_limits() -> Generator[None]:
+    yield
+    jubilant.limit_controller('ctl')
+
+
+def test_limiter(reset_limits: None):
+    jubilant.limit_controller('ctl', max_concurrent=2)
+    runner = ConcurrencyRunner()
+    juju = jubilant.Juju(model='ctl:mdl', runner=runner)
+
+    destinations = [f'a/{i}:' for i in range(6)]
+    results = juju.scp_multiple('SRC', destinations, max_workers=6)
+
+    assert results == dict.fromkeys(destinations)
+    assert runner.max_running == 2
+    limiter = jubilant.controller_limiter('ctl')
+    assert limiter is not None
+    assert limiter.stats().commands == 6
+
+
+def test_staged_once(monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path):
+    monkeypatch.setattr('shutil.which', lambda _: '/snap/bin/juju')  # type: ignore
+    monkeypatch.setenv('HOME', str(tmp_path / 'home'))
+    source = tmp_path / 'bundle.tar'
+    source.write_text('DATA')
+    staged: set[str] = set()
+
+    def mock_run(args: list[str], **_: Any):
+        assert args[:3] == ['juju', 'scp', '--']
+        assert '/snap/juju/common/' in args[3]
+        assert pathlib.Path(args[3]).read_text() == 'DATA'
+        staged.add(args[3])
+        return subprocess.CompletedProcess(args, 0, '', '')
+
+    monkeypatch.setattr('subprocess.run', mock_run)
+    juju = jubilant.Juju()
+
+    results = juju.scp_multiple(source, [f'app/{i}:/tmp/' for i in range(5)])
+
+    assert len(results) == 5
+    assert len(staged) == 1
+    assert not os.path.exists(staged.pop())
+
+
+def test_invalid_args():
+    juju = jubilant.Juju()
+
+    with pytest.raises(TypeError):
+        juju.scp_multiple('SRC', 'mysql/0:/tmp/')
+    with pytest.raises(ValueError):
+        juju.scp_multiple('mysql/0:/src', ['mysql/1:/tmp/'])
+    with pytest.raises(ValueError):
+        juju.scp_multiple('SRC', ['mysql/1:/tmp/', '/local/path'])
+    assert juju.scp_multiple('SRC', []) == {}
+
+
+def test_async(async_run: mocks.Run):
+    async_run.handle(['juju', 'scp', '--', 'SRC', 'mysql/0:/tmp/'])
+    async_run.handle(['juju', 'scp', '--', 'SRC', 'mysql/1:/tmp/'], returncode=1, stderr='ERR')
+    juju = jubilant.AsyncJuju()
+
+    results = asyncio.run(
+        juju.scp_multiple('SRC', ['mysql/0:/tmp/', 'mysql/1:/tmp/'], max_workers=1)
+    )
+
+    assert results['mysql/0:/tmp/'] is None
+    error = results['mysql/1:/tmp/']
+    assert isinstance(error, jubilant.CLIError)
+    assert error.stderr == 'ERR'
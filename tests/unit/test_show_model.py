@@ -1,3 +1,4 @@
+import asyncio
 import json
 
 import jubilant
@@ -95,3 +96,16 @@ def test_model_arg(run: mocks.Run):
     juju = jubilant.Juju(model='ctrl:mdl')
     info = juju.show_model('mdlarg')
     assert info.model_uuid == '910dff48-2bc2-4007-858b-e382d2fcdc0e'
+
+
+def test_async(async_run: mocks.Run):
+    async_run.handle(
+        ['juju', 'show-model', '--format', 'json', 'ctrl:mdl'],
+        stdout=json.dumps(MINIMAL_MODELINFO),
+    )
+    juju = jubilant.AsyncJuju(model='ctrl:mdl')
+
+    info = asyncio.run(juju.show_model())
+
+    assert info.short_name == 'min'
+    assert info.controller_name == 'ctrl'
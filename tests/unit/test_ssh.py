@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 
 import jubilant
@@ -71,3 +73,16 @@ def test_type_error():
 
     with pytest.raises(TypeError):
         juju.ssh('ubuntu/0', 'ls', ssh_options='invalid')
+
+
+def test_async(async_run: mocks.Run):
+    async_run.handle(
+        ['juju', 'ssh', '--container', 'c', 'admin@ubuntu/0', '-i', 'key', 'echo', 'foo'],
+        stdout='foo\n',
+    )
+    juju = jubilant.AsyncJuju()
+
+    output = asyncio.run(
+        juju.ssh('ubuntu/0', 'echo', 'foo', container='c', ssh_options=['-i', 'key'], user='admin')
+    )
+    assert output == 'foo\n'
@@ -1,4 +1,5 @@
 import dataclasses
+import json
 
 import jubilant
 from jubilant import statustypes
@@ -50,3 +51,21 @@ def test_status_eq():
     )
     assert status1 == status1b
     assert status1 == status2
+
+
+def test_apps(run: mocks.Run):
+    run.handle(['juju', 'status', '--format', 'json', 'mysql', 'blog*'], stdout=MINIMAL_JSON)
+    juju = jubilant.Juju()
+
+    status = juju.status('mysql', 'blog*')
+
+    assert status == MINIMAL_STATUS
+
+
+def test_status_raw(run: mocks.Run):
+    run.handle(['juju', 'status', '--format', 'json', 'mysql'], stdout=SNAPPASS_JSON)
+    juju = jubilant.Juju()
+
+    status = juju.status_raw('mysql')
+
+    assert status == json.loads(SNAPPASS_JSON)
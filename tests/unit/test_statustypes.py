@@ -1,8 +1,27 @@
+from __future__ import annotations
+
+import copy
+import dataclasses
+import importlib.util
 import json
+import pathlib
+import pickle
+import sys
+import tracemalloc
+import types
+from collections.abc import Callable
+
+import pytest
 
 import jubilant
 
-from .fake_statuses import STATUS_ERRORS_JSON, SUBORDINATES_JSON
+from .fake_statuses import (
+    DATABASE_WEBAPP_JSON,
+    SNAPPASS_JSON,
+    STATUS_ERRORS_JSON,
+    SUBORDINATES_JSON,
+    large_status_dict,
+)
 
 
 def test_juju_status_error():
@@ -62,3 +81,161 @@ def test_get_units():
     assert units['nrpe/2'].public_address == '10.103.56.129'
 
     assert status.get_units('foo') == {}
+    # The units are indexed once, on first use.
+    assert status.get_units('nrpe') is units
+
+
+def test_get_machine_units():
+    status = jubilant.Status._from_dict(json.loads(SUBORDINATES_JSON))
+
+    assert sorted(status.get_machine_units('1')) == ['nrpe/1', 'ubuntu/1']
+    assert sorted(status.get_machine_units('2')) == ['nrpe/2', 'ubun2/0']
+    assert status.get_machine_units('2')['nrpe/2'] is status.get_units('nrpe')['nrpe/2']
+    assert status.get_machine_units('42') == {}
+
+
+def test_get_unit_machine():
+    status = jubilant.Status._from_dict(json.loads(SUBORDINATES_JSON))
+
+    assert status.get_unit_machine('ubuntu/1') == '1'
+    assert status.get_unit_machine('nrpe/1') == '1'
+    assert status.get_unit_machine('nrpe/2') == '2'
+    assert status.get_unit_machine('foo/0') is None
+
+    k8s_status = jubilant.Status._from_dict(json.loads(SNAPPASS_JSON))
+    assert k8s_status.get_unit_machine('snappass-test/0') is None
+
+
+def test_lazy_parsing():
+    status = jubilant.Status._from_dict(json.loads(DATABASE_WEBAPP_JSON))
+    assert 'apps' not in vars(status)
+    assert 'machines' not in vars(status)
+
+    assert status.apps['database'].is_active
+    assert 'apps' in vars(status)
+    assert 'machines' not in vars(status)
+    assert 'storage' not in vars(status)
+
+
+def test_lazy_equality():
+    lazy = jubilant.Status._from_dict(json.loads(DATABASE_WEBAPP_JSON))
+    other = jubilant.Status._from_dict(json.loads(DATABASE_WEBAPP_JSON))
+
+    assert lazy == other
+    assert 'machines' not in vars(lazy)  # compared using the raw dicts
+    assert 'machines' not in vars(other)
+
+    eager = dataclasses.replace(other)  # accesses (and so parses) every field
+    assert lazy == eager
+    assert eager == lazy
+    assert repr(lazy) == repr(eager)
+    assert copy.deepcopy(lazy) == eager
+
+    changed = json.loads(DATABASE_WEBAPP_JSON)
+    changed['machines']['0'] = {'hostname': 'changed'}
+    assert lazy != jubilant.Status._from_dict(changed)
+
+
+def test_lazy_raw_dropped():
+    status = jubilant.Status._from_dict(json.loads(DATABASE_WEBAPP_JSON))
+    assert '_raw' in vars(status)
+
+    str(status)
+
+    assert '_raw' not in vars(status)
+
+
+def test_slots():
+    status = jubilant.Status._from_dict(json.loads(SUBORDINATES_JSON))
+    app = status.apps['nrpe']
+    unit = status.apps['ubuntu'].units['ubuntu/1']
+
+    assert not hasattr(app, '__dict__')
+    assert not hasattr(unit.workload_status, '__dict__')
+    assert app == copy.deepcopy(app)
+    assert unit == pickle.loads(pickle.dumps(unit))  # noqa: S301
+    assert dataclasses.replace(unit, leader=False) != unit
+
+
+def test_interning():
+    status = jubilant.Status._from_dict(large_status_dict(num_apps=2, units_per_app=2))
+
+    units = [*status.apps['app0'].units.values(), *status.apps['app1'].units.values()]
+    assert all(u.workload_status.current is units[0].workload_status.current for u in units)
+    assert status.apps['app0'].base is not None
+    assert status.apps['app1'].base is not None
+    assert status.apps['app0'].base.channel is status.apps['app1'].base.channel
+
+
+def _traced_size(func: Callable[[], object]) -> int:
+    tracemalloc.start()
+    try:
+        obj = func()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del obj
+    return size
+
+
+def _unslotted_statustypes(monkeypatch: pytest.MonkeyPatch) -> types.ModuleType:
+    """Load a copy of the statustypes module with the classes left as regular dataclasses."""
+    path = pathlib.Path(jubilant.statustypes.__file__)
+    source = path.read_text().replace('@_add_slots\n', '')
+    name = 'jubilant._unslotted_statustypes'
+    spec = importlib.util.spec_from_file_location(name, path)
+    assert spec is not None
+    module = importlib.util.module_from_spec(spec)
+    monkeypatch.setitem(sys.modules, name, module)
+    exec(compile(source, str(path), 'exec'), module.__dict__)  # noqa: S102
+    return module
+
+
+def test_memory_benchmark(monkeypatch: pytest.MonkeyPatch):
+    # Synthetic 1,000-unit model (with a machine per unit), fully parsed.
+    status_dict = large_status_dict(num_apps=10, units_per_app=100)
+    unslotted = _unslotted_statustypes(monkeypatch)
+    assert hasattr(unslotted.UnitStatus(), '__dict__')
+
+    def parse(status_class: type[jubilant.Status]) -> jubilant.Status:
+        status = status_class._from_dict(status_dict)
+        return dataclasses.replace(status)  # parse every lazy field
+
+    slotted_size = _traced_size(lambda: parse(jubilant.Status))
+    unslotted_size = _traced_size(lambda: parse(unslotted.Status))
+
+    assert slotted_size < unslotted_size * 0.85
+
+
+def test_cache_reuses_unchanged():
+    cache = jubilant.statustypes._StatusCache()
+    old_dict = large_status_dict(num_apps=3, units_per_app=2)
+    new_dict = large_status_dict(num_apps=3, units_per_app=2)
+    new_dict['applications']['app1']['units']['app1/0']['workload-status']['current'] = 'error'
+    del new_dict['applications']['app2']
+
+    old = jubilant.Status._from_dict(old_dict, cache)
+    old_apps = old.apps
+    old_machines = old.machines
+    new = jubilant.Status._from_dict(new_dict, cache)
+
+    assert new.model is old.model
+    assert new.machines is old_machines
+    assert new.apps['app0'] is old_apps['app0']
+    assert new.apps['app1'] is not old_apps['app1']
+    assert new.apps['app1'].units['app1/0'].is_error
+    assert 'app2' not in new.apps
+    assert new != old
+    assert jubilant.Status._from_dict(new_dict) == new
+
+
+def test_cache_no_growth():
+    cache = jubilant.statustypes._StatusCache()
+
+    for i in range(5):
+        status_dict = large_status_dict(num_apps=1, units_per_app=1)
+        status_dict['applications'] = {f'app{i}': status_dict['applications']['app0']}
+        status = jubilant.Status._from_dict(status_dict, cache)
+        assert list(status.apps) == [f'app{i}']
+
+    assert list(cache._items['apps']) == ['app4']
@@ -1,5 +1,6 @@
 import logging
 import subprocess
+import threading
 from typing import Any
 
 import pytest
@@ -164,3 +165,244 @@ def test_destroy_timeout(monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCapt
         pass
 
     assert 'timeout destroying model' in caplog.records[0].getMessage()
+
+
+class TokenCounter:
+    def __init__(self):
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, n: int) -> str:
+        assert n == 4
+        with self._lock:
+            self._count += 1
+            return f'{self._count:08d}'
+
+
+def handle_models(run: mocks.Run, count: int, *add_args: str):
+    for i in range(1, count + 1):
+        model = f'jubilant-{i:08d}'
+        run.handle(['juju', 'add-model', '--no-switch', model, *add_args])
+        destroy_model = f'ctl:{model}' if '--controller' in add_args else model
+        run.handle(
+            [
+                'juju',
+                'destroy-model',
+                destroy_model,
+                '--no-prompt',
+                '--destroy-storage',
+                '--force',
+            ]
+        )
+
+
+def commands(run: mocks.Run, command: str) -> 'list[str]':
+    """Return the model names passed to the given command, sorted."""
+    index = 3 if command == 'add-model' else 2
+    return sorted(call.args[index] for call in run.calls if call.args[1] == command)
+
+
+def test_pool(run: mocks.Run, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr('secrets.token_hex', TokenCounter())
+    handle_models(run, 5)
+
+    with jubilant.ModelPool(size=2) as pool:
+        with jubilant.temp_model(pool=pool) as juju1:
+            assert juju1.model in ('jubilant-00000001', 'jubilant-00000002')
+        with jubilant.temp_model(pool=pool) as juju2:
+            assert juju2.model is not None
+            assert juju2.model != juju1.model
+
+    # Two models created up front, plus a replacement for each model handed out.
+    assert commands(run, 'add-model') == [f'jubilant-{i:08d}' for i in range(1, 5)]
+    # All of them are destroyed, whether handed out or not.
+    assert commands(run, 'destroy-model') == [f'jubilant-{i:08d}' for i in range(1, 5)]
+    assert juju1.model is None
+    assert juju2.model is None
+
+
+def test_pool_model_args(run: mocks.Run, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr('secrets.token_hex', TokenCounter())
+    handle_models(
+        run,
+        2,
+        'localhost',
+        '--controller',
+        'ctl',
+        '--config',
+        'x=true',
+        '--credential',
+        'cc',
+    )
+
+    pool = jubilant.ModelPool(
+        size=1, controller='ctl', cloud='localhost', config={'x': True}, credential='cc'
+    )
+    juju = pool.acquire(timeout=5)
+    assert juju.model == 'ctl:jubilant-00000001'
+    pool.release(juju, keep=True)
+    pool.close()
+
+    assert commands(run, 'destroy-model') == ['ctl:jubilant-00000002']
+    assert juju.model == 'ctl:jubilant-00000001'
+
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+
+
+def test_pool_create_error(run: mocks.Run, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr('secrets.token_hex', TokenCounter())
+    for i in range(1, 3):
+        run.handle(
+            ['juju', 'add-model', '--no-switch', f'jubilant-{i:08d}'],
+            returncode=1,
+            stderr='quota exceeded',
+        )
+
+    pool = jubilant.ModelPool(size=1)
+    with pytest.raises(jubilant.CLIError), jubilant.temp_model(pool=pool):
+        pass
+    pool.close()
+
+
+def test_pool_with_model_args():
+    pool = jubilant.ModelPool(size=0)
+    with pytest.raises(TypeError), jubilant.temp_model(pool=pool, controller='ctl'):
+        pass
+    with pytest.raises(TypeError), jubilant.temp_model(pool=pool, credential=''):
+        pass
+    pool.close()
+
+
+def test_pool_destroy_error(
+    run: mocks.Run, monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+):
+    monkeypatch.setattr('secrets.token_hex', TokenCounter())
+    run.handle(['juju', 'add-model', '--no-switch', 'jubilant-00000001'])
+    run.handle(['juju', 'add-model', '--no-switch', 'jubilant-00000002'])
+    run.handle(
+        [
+            'juju',
+            'destroy-model',
+            'jubilant-00000001',
+            '--no-prompt',
+            '--destroy-storage',
+            '--force',
+        ],
+        returncode=1,
+        stderr='model not found',
+    )
+    run.handle(
+        [
+            'juju',
+            'destroy-model',
+            'jubilant-00000002',
+            '--no-prompt',
+            '--destroy-storage',
+            '--force',
+        ]
+    )
+    caplog.set_level(logging.ERROR, logger='jubilant')
+
+    with jubilant.ModelPool(size=1) as pool, jubilant.temp_model(pool=pool):
+        pass
+
+    # The error destroying the released model isn't lost.
+    messages = [r.getMessage() for r in caplog.records]
+    assert len(messages) == 1
+    assert 'error destroying model jubilant-00000001' in messages[0]
+    assert 'model not found' in messages[0]
+
+
+def test_pool_destroy_timeout(monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture):
+    def mock_run(args: 'list[str]', **kwargs: 'dict[str, Any]'):
+        if args[1] == 'add-model' or args[2] != 'jubilant-00000001':
+            return subprocess.CompletedProcess(args, 0, '', '')
+        raise subprocess.TimeoutExpired(args, 10 * 60, 'STDOUT', 'STDERR')
+
+    monkeypatch.setattr('subprocess.run', mock_run)
+    monkeypatch.setattr('secrets.token_hex', TokenCounter())
+    caplog.set_level(logging.ERROR, logger='jubilant')
+
+    with jubilant.ModelPool(size=1) as pool, jubilant.temp_model(pool=pool) as juju:
+        pass
+
+    # The timeout destroying the released model is reported when the pool is closed.
+    messages = [r.getMessage() for r in caplog.records]
+    assert len(messages) == 2
+    assert 'timeout destroying model' in messages[0]
+    assert 'error destroying model jubilant-00000001' in messages[1]
+    assert juju.model == 'jubilant-00000001'
+    assert jubilant.wait_model_teardowns() == []
+
+
+def test_destroy_in_background(run: mocks.Run, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr('secrets.token_hex', TokenCounter())
+    handle_models(run, 2)
+
+    with jubilant.temp_model(destroy_in_background=True) as juju1:
+        pass
+    with jubilant.temp_model(destroy_in_background=True) as juju2:
+        pass
+
+    assert jubilant.wait_model_teardowns(timeout=5) == []
+    assert commands(run, 'destroy-model') == ['jubilant-00000001', 'jubilant-00000002']
+    assert juju1.model is None
+    assert juju2.model is None
+    assert jubilant.wait_model_teardowns() == []
+
+
+def test_destroy_in_background_failures(
+    monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+):
+    release = threading.Event()
+
+    def mock_run(args: 'list[str]', **kwargs: 'dict[str, Any]'):
+        if args[1] == 'add-model':
+            return subprocess.CompletedProcess(args, 0, '', '')
+        if args[2] == 'jubilant-00000001':
+            raise subprocess.CalledProcessError(1, args, '', 'model not found')
+        release.wait(timeout=5)
+        return subprocess.CompletedProcess(args, 0, '', '')
+
+    monkeypatch.setattr('subprocess.run', mock_run)
+    monkeypatch.setattr('secrets.token_hex', TokenCounter())
+    caplog.set_level(logging.ERROR, logger='jubilant')
+
+    with jubilant.temp_model(destroy_in_background=True):
+        pass
+    with jubilant.temp_model(destroy_in_background=True):
+        pass
+
+    failed = jubilant.wait_model_teardowns(timeout=0.1)
+    assert sorted(failed) == ['jubilant-00000001', 'jubilant-00000002']
+    messages = sorted(r.getMessage() for r in caplog.records)
+    assert 'error destroying model jubilant-00000001' in messages[0]
+    assert 'model not found' in messages[0]
+    assert messages[1] == 'timeout waiting for model jubilant-00000002 to be destroyed'
+
+    # Models that timed out are waited for again next time.
+    release.set()
+    assert jubilant.wait_model_teardowns(timeout=5) == []
+
+
+def test_destroy_in_background_timeout(
+    monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+):
+    def mock_run(args: 'list[str]', **kwargs: 'dict[str, Any]'):
+        if args[1] == 'add-model':
+            return subprocess.CompletedProcess(args, 0, '', '')
+        raise subprocess.TimeoutExpired(args, 10 * 60, 'STDOUT', 'STDERR')
+
+    monkeypatch.setattr('subprocess.run', mock_run)
+    monkeypatch.setattr('secrets.token_hex', mock_token_hex)
+    caplog.set_level(logging.ERROR, logger='jubilant')
+
+    with jubilant.temp_model(destroy_in_background=True):
+        pass
+
+    assert jubilant.wait_model_teardowns(timeout=5) == ['jubilant-abcd1234']
+    messages = [r.getMessage() for r in caplog.records]
+    assert 'timeout destroying model' in messages[0]
+    assert 'error destroying model jubilant-abcd1234' in messages[1]
+    assert jubilant.wait_model_teardowns() == []
@@ -1,3 +1,5 @@
+import asyncio
+
 import jubilant
 
 from . import mocks
@@ -36,3 +38,10 @@ def test_scope_and_remove(run: mocks.Run):
     juju = jubilant.Juju()
 
     juju.trust('rmv', remove=True, scope='cluster')
+
+
+def test_async(async_run: mocks.Run):
+    async_run.handle(['juju', 'trust', 'app', '--remove', '--scope', 'cluster'])
+    juju = jubilant.AsyncJuju()
+
+    asyncio.run(juju.trust('app', remove=True, scope='cluster'))
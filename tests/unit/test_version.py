@@ -1,3 +1,4 @@
+import asyncio
 import json
 
 import pytest
@@ -68,3 +69,15 @@ def test_parse_error(run: mocks.Run):
 
     with pytest.raises(ValueError):
         juju.version()
+
+
+def test_async(async_run: mocks.Run):
+    async_run.handle(
+        ['juju', 'version', '--format', 'json', '--all'],
+        stdout=json.dumps({'version': '3.6.11-genericlinux-amd64'}),
+    )
+    juju = jubilant.AsyncJuju(model='mdl')
+
+    version = asyncio.run(juju.version())
+
+    assert version == jubilant.Version(3, 6, 11, release='genericlinux', arch='amd64')
@@ -1,4 +1,9 @@
+from __future__ import annotations
+
+import json
 import logging
+import sys
+import time as real_time
 
 import pytest
 
@@ -125,3 +130,181 @@ def test_timeout_zero(time: mocks.Time):
 
     assert time.monotonic() == 0
     assert 'mdl' not in str(excinfo.value)
+
+
+def test_backoff(run: mocks.Run, time: mocks.Time):
+    run.handle(['juju', 'status', '--format', 'json'], stdout=MINIMAL_JSON)
+    juju = jubilant.Juju()
+
+    with pytest.raises(TimeoutError) as excinfo:
+        juju.wait(lambda _: False, backoff=jubilant.Backoff(initial=1, maximum=8), timeout=20)
+
+    # Polls at 0, 1, 3, 7, 15 (then sleeps until 23).
+    assert len(run.calls) == 5
+    assert time.monotonic() == 23
+    assert '(5 status polls)' in str(excinfo.value)
+
+
+def test_backoff_reset_on_change(run: mocks.Run, time: mocks.Time):
+    run.handle(['juju', 'status', '--format', 'json'], stdout=MINIMAL_JSON)
+    juju = jubilant.Juju()
+
+    def ready(status: jubilant.Status) -> bool:
+        if len(run.calls) == 4:
+            changed = MINIMAL_JSON.replace('"mdl"', '"changed"')
+            run.handle(['juju', 'status', '--format', 'json'], stdout=changed)
+        return False
+
+    with pytest.raises(TimeoutError):
+        juju.wait(ready, backoff=jubilant.Backoff(initial=1, maximum=8), timeout=17.5)
+
+    # Polls at 0, 1, 3, 7, 15 (status changed, so back to a 1s delay), 16.
+    assert len(run.calls) == 6
+    assert time.monotonic() == 18
+
+
+def test_backoff_successes(run: mocks.Run, time: mocks.Time, caplog: pytest.LogCaptureFixture):
+    run.handle(['juju', 'status', '--format', 'json'], stdout=MINIMAL_JSON)
+    juju = jubilant.Juju()
+    caplog.set_level(logging.DEBUG, logger='jubilant.wait')
+
+    n = 0
+
+    def ready(_: jubilant.Status) -> bool:
+        nonlocal n
+        n += 1
+        return n >= 4
+
+    juju.wait(ready, backoff=jubilant.Backoff(initial=1, maximum=8))
+
+    # Polls at 0, 1, 3, 7 (ready, so poll at the initial rate again), 8, 9.
+    assert len(run.calls) == 6
+    assert time.monotonic() == 9
+    assert caplog.records[-1].getMessage() == 'wait: ready after 6 status polls'
+
+
+class FakeLogWatcher:
+    def __init__(self, args: list[str], time: mocks.Time):
+        self.args = args
+        self.time = time
+        self.closed = False
+        self.activity_at = [5.0]
+
+    def activity(self) -> bool:
+        if self.activity_at and self.time.monotonic() >= self.activity_at[0]:
+            self.activity_at.pop(0)
+            return True
+        return False
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def log_watchers(time: mocks.Time, monkeypatch: pytest.MonkeyPatch) -> list[FakeLogWatcher]:
+    watchers: list[FakeLogWatcher] = []
+
+    def new_watcher(args: list[str]) -> FakeLogWatcher:
+        watcher = FakeLogWatcher(args, time)
+        watchers.append(watcher)
+        return watcher
+
+    monkeypatch.setattr(jubilant._juju, '_LogWatcher', new_watcher)
+    return watchers
+
+
+def test_debug_log_interval(run: mocks.Run, time: mocks.Time, log_watchers: list[FakeLogWatcher]):
+    run.handle(['juju', 'status', '--model', 'mdl', '--format', 'json'], stdout=MINIMAL_JSON)
+    juju = jubilant.Juju(model='mdl')
+
+    with pytest.raises(TimeoutError):
+        juju.wait(lambda _: False, debug_log_interval=10, timeout=30)
+
+    # Polls at 0, 1 (status unchanged, so follow the log), 5 (hook ran), 15, and 25.
+    assert len(run.calls) == 5
+    assert time.monotonic() == 30
+    [watcher] = log_watchers
+    assert watcher.args[:4] == ['juju', 'debug-log', '--model', 'mdl']
+    assert '--include-module' in watcher.args
+    assert watcher.closed
+
+
+def test_debug_log_interval_ready(
+    run: mocks.Run, time: mocks.Time, log_watchers: list[FakeLogWatcher]
+):
+    run.handle(['juju', 'status', '--format', 'json'], stdout=MINIMAL_JSON)
+    juju = jubilant.Juju()
+
+    juju.wait(lambda _: True, debug_log_interval=10)
+
+    # Successive ready polls aren't held up waiting for the log.
+    assert len(run.calls) == 3
+    assert time.monotonic() == 2
+    assert log_watchers[0].closed
+
+
+def test_log_watcher():
+    script = 'print("ran hook", flush=True); import time; time.sleep(60)'
+    watcher = jubilant._juju._LogWatcher([sys.executable, '-c', script])
+    try:
+        for _ in range(500):
+            if watcher.activity():
+                break
+            real_time.sleep(0.01)
+        else:
+            pytest.fail('no activity seen')
+        assert not watcher.activity()
+    finally:
+        watcher.close()
+
+
+def test_apps(run: mocks.Run, time: mocks.Time):
+    run.handle(['juju', 'status', '--format', 'json', 'blog', 'mysql'], stdout=MINIMAL_JSON)
+    juju = jubilant.Juju()
+
+    status = juju.wait(lambda _: True, apps=['blog', 'mysql'])
+
+    assert len(run.calls) == 3
+    assert status == MINIMAL_STATUS
+
+
+def test_apps_str():
+    juju = jubilant.Juju()
+
+    with pytest.raises(TypeError):
+        juju.wait(lambda _: True, apps='blog')
+
+
+def test_raw(run: mocks.Run, time: mocks.Time):
+    run.handle(['juju', 'status', '--format', 'json'], stdout=MINIMAL_JSON)
+    juju = jubilant.Juju()
+
+    status = juju.wait(lambda status: status['model']['name'] == 'mdl', raw=True)
+
+    assert len(run.calls) == 3
+    assert status == json.loads(MINIMAL_JSON)
+
+
+def test_raw_error(run: mocks.Run, time: mocks.Time):
+    run.handle(['juju', 'status', '--format', 'json'], stdout=MINIMAL_JSON)
+    juju = jubilant.Juju()
+
+    with pytest.raises(jubilant.WaitError) as excinfo:
+        juju.wait(lambda _: False, error=lambda status: 'model' in status, raw=True)
+
+    assert "'name': 'mdl'" in str(excinfo.value)
+
+
+def test_raw_logging(run: mocks.Run, time: mocks.Time, caplog: pytest.LogCaptureFixture):
+    status_dict = json.loads(MINIMAL_JSON)
+    status_dict['controller'] = {'timestamp': '12:00:00'}
+    run.handle(['juju', 'status', '--format', 'json'], stdout=json.dumps(status_dict))
+    juju = jubilant.Juju()
+    caplog.set_level(logging.INFO, logger='jubilant.wait')
+
+    juju.wait(lambda _: True, raw=True)
+
+    message = caplog.records[0].getMessage()
+    assert message.startswith('wait: status changed:\n')
+    assert "+ ['model']['name'] = 'mdl'" in message
+    assert 'timestamp' not in message
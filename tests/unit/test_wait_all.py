@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import threading
+from typing import Any
+
+import pytest
+
+import jubilant
+
+from . import mocks
+from .fake_statuses import MINIMAL_JSON, MINIMAL_STATUS
+
+
+def test_ready(run: mocks.Run, time: mocks.Time):
+    run.handle(['juju', 'status', '--model', 'a', '--format', 'json'], stdout=MINIMAL_JSON)
+    run.handle(['juju', 'status', '--model', 'b', '--format', 'json'], stdout=MINIMAL_JSON)
+    juju_a = jubilant.Juju(model='a')
+    juju_b = jubilant.Juju(model='b')
+
+    n = 0
+
+    def b_ready(_: jubilant.Status) -> bool:
+        nonlocal n
+        n += 1
+        return n >= 3
+
+    results = jubilant.wait_all({juju_b: b_ready, juju_a: lambda _: True})
+
+    assert list(results) == [juju_b, juju_a]
+    assert results == {juju_a: MINIMAL_STATUS, juju_b: MINIMAL_STATUS}
+    # Model "a" is polled 3 times, model "b" 5 times, in rounds one second apart.
+    assert len(run.calls) == 8
+    assert time.monotonic() == 4
+
+
+def test_errors(run: mocks.Run, time: mocks.Time):
+    run.handle(['juju', 'status', '--model', 'a', '--format', 'json'], stdout=MINIMAL_JSON)
+    run.handle(['juju', 'status', '--model', 'b', '--format', 'json'], returncode=1)
+    run.handle(['juju', 'status', '--model', 'c', '--format', 'json'], stdout=MINIMAL_JSON)
+    juju_a = jubilant.Juju(model='a', wait_timeout=10)
+    juju_b = jubilant.Juju(model='b')
+    juju_c = jubilant.Juju(model='c')
+
+    results = jubilant.wait_all(
+        {juju_a: lambda _: False, juju_b: lambda _: True, juju_c: lambda _: True},
+        error=lambda status: status.model.name == 'never',
+    )
+
+    assert isinstance(results[juju_a], TimeoutError)
+    assert isinstance(results[juju_b], jubilant.CLIError)
+    assert results[juju_c] == MINIMAL_STATUS
+    assert time.monotonic() == 10
+
+
+def test_wait_error(run: mocks.Run, time: mocks.Time):
+    run.handle(['juju', 'status', '--format', 'json'], stdout=MINIMAL_JSON)
+    juju = jubilant.Juju()
+
+    results = jubilant.wait_all({juju: lambda _: True}, error=lambda _: True)
+
+    assert isinstance(results[juju], jubilant.WaitError)
+    assert len(run.calls) == 1
+
+
+def test_timeout_override(run: mocks.Run, time: mocks.Time):
+    run.handle(['juju', 'status', '--format', 'json'], stdout=MINIMAL_JSON)
+    juju = jubilant.Juju()
+
+    results = jubilant.wait_all({juju: lambda _: False}, timeout=3, delay=0.5)
+
+    assert isinstance(results[juju], TimeoutError)
+    assert len(run.calls) == 6
+
+
+@pytest.mark.parametrize('max_concurrent', [1, 3])
+def test_max_concurrent(
+    run: mocks.Run, time: mocks.Time, monkeypatch: pytest.MonkeyPatch, max_concurrent: int
+):
+    jujus = [jubilant.Juju(model=str(i)) for i in range(6)]
+    for juju in jujus:
+        assert juju.model is not None
+        run.handle(
+            ['juju', 'status', '--model', juju.model, '--format', 'json'], stdout=MINIMAL_JSON
+        )
+
+    lock = threading.Lock()
+    running = 0
+    max_running = 0
+
+    def counting_run(*args: Any, **kwargs: Any) -> Any:
+        nonlocal running, max_running
+        with lock:
+            running += 1
+            max_running = max(max_running, running)
+        threading.Event().wait(0.01)  # time.sleep is mocked
+        with lock:
+            running -= 1
+        return run(*args, **kwargs)
+
+    monkeypatch.setattr('subprocess.run', counting_run)
+
+    results = jubilant.wait_all(
+        {juju: lambda _: True for juju in jujus}, max_concurrent=max_concurrent
+    )
+
+    assert all(status == MINIMAL_STATUS for status in results.values())
+    assert len(run.calls) == 18
+    assert 1 <= max_running <= max_concurrent
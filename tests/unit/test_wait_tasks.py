@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import subprocess
+import threading
+
+import pytest
+
+import jubilant
+
+from . import mocks
+
+
+def test_run_background(run: mocks.Run, mock_file: mocks.NamedTemporaryFile):
+    run.handle(
+        ['juju', 'run', '--background', 'mysql/0', 'backup', '--params', mock_file.name],
+        stderr='Scheduled operation 1 with task 2\nCheck operation status with ...\n',
+    )
+    juju = jubilant.Juju()
+
+    handle = juju.run_background('mysql/0', 'backup', {'a': 1})
+
+    assert handle == jubilant.TaskHandle(id='2', unit='mysql/0')
+
+
+def test_exec_background(run: mocks.Run):
+    run.handle(
+        ['juju', 'exec', '--background', '--machine', '0', '--', 'echo', 'foo'],
+        stderr='Scheduled operation 3 with task 4\n',
+    )
+    juju = jubilant.Juju()
+
+    handle = juju.exec_background('echo', 'foo', machine=0)
+
+    assert handle == jubilant.TaskHandle(id='4', unit='0')
+
+
+def test_background_no_task_id(run: mocks.Run):
+    run.handle(['juju', 'run', '--background', 'mysql/0', 'backup'], stderr='huh?')
+    juju = jubilant.Juju()
+
+    with pytest.raises(ValueError):
+        juju.run_background('mysql/0', 'backup')
+
+
+def test_wait_tasks(run: mocks.Run, time: mocks.Time):
+    run.handle(
+        ['juju', 'show-task', '2', '--format', 'json'],
+        stdout='{"id": "2", "results": {"return-code": 0, "stdout": "OUT"}, "status": "completed"}',
+    )
+    run.handle(
+        ['juju', 'show-task', '4', '--format', 'json'],
+        stdout='{"id": "4", "message": "oops", "status": "failed"}',
+    )
+    juju = jubilant.Juju()
+    handles = [jubilant.TaskHandle('4', 'mysql/1'), jubilant.TaskHandle('2', 'mysql/0')]
+
+    tasks = juju.wait_tasks(handles)
+
+    assert tasks == [
+        jubilant.Task(id='4', status='failed', message='oops'),
+        jubilant.Task(id='2', status='completed', return_code=0, stdout='OUT'),
+    ]
+    assert len(run.calls) == 2
+    assert time.monotonic() == 0
+
+
+class BarrierRunner:
+    """Runner whose commands only finish once *parties* of them are running at once."""
+
+    def __init__(self, parties: int):
+        self.barrier = threading.Barrier(parties, timeout=5)
+
+    def run(
+        self, args: list[str], *, stdin: str | None, timeout: float | None
+    ) -> subprocess.CompletedProcess[str]:
+        self.barrier.wait()
+        task_id = args[args.index('show-task') + 1]
+        stdout = json.dumps({'id': task_id, 'status': 'completed'})
+        return subprocess.CompletedProcess(args, 0, stdout, '')
+
+
+def test_wait_tasks_concurrent():
+    juju = jubilant.Juju(runner=BarrierRunner(3))
+    handles = [jubilant.TaskHandle(str(i), f'mysql/{i}') for i in range(3)]
+
+    # The three polls would break the barrier if they weren't run at the same time.
+    tasks = juju.wait_tasks(handles)
+
+    assert [task.id for task in tasks] == ['0', '1', '2']
+    assert all(task.status == 'completed' for task in tasks)
+
+
+def test_wait_tasks_timeout(run: mocks.Run, time: mocks.Time):
+    run.handle(
+        ['juju', 'show-task', '2', '--format', 'json'],
+        stdout='{"id": "2", "status": "completed"}',
+    )
+    run.handle(
+        ['juju', 'show-task', '4', '--format', 'json'],
+        stdout='{"id": "4", "status": "running"}',
+    )
+    juju = jubilant.Juju()
+    handles = [jubilant.TaskHandle('2', 'mysql/0'), jubilant.TaskHandle('4', 'mysql/1')]
+
+    with pytest.raises(TimeoutError) as excinfo:
+        juju.wait_tasks(handles, max_delay=5, timeout=10)
+
+    # Polls at 0, 1, 3, 7 (delay doubling up to max_delay), then times out at 12.
+    assert [call.args[2] for call in run.calls] == ['2', '4', '4', '4', '4']
+    assert time.monotonic() == 12
+    assert '4 (mysql/1)' in str(excinfo.value)
+    assert '2 (mysql/0)' not in str(excinfo.value)
+
+
+def test_async(async_run: mocks.Run, time: mocks.Time):
+    async_run.handle(
+        ['juju', 'run', '--background', 'mysql/0', 'backup'],
+        stderr='Scheduled operation 1 with task 2\n',
+    )
+    async_run.handle(
+        ['juju', 'show-task', '2', '--format', 'json'],
+        stdout='{"id": "2", "status": "completed"}',
+    )
+    juju = jubilant.AsyncJuju()
+
+    async def run_and_wait() -> list[jubilant.Task]:
+        handle = await juju.run_background('mysql/0', 'backup')
+        return await juju.wait_tasks([handle])
+
+    tasks = asyncio.run(run_and_wait())
+
+    assert tasks == [jubilant.Task(id='2', status='completed')]
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import itertools
+import json
+from typing import Any, Callable
+
+import pytest
+
+import jubilant
+
+from . import mocks
+from .fake_statuses import (
+    DATABASE_WEBAPP_JSON,
+    MINIMAL_JSON,
+    MINIMAL_STATUS,
+    SNAPPASS_JSON,
+    STATUS_ERRORS_JSON,
+    SUBORDINATES_JSON,
+)
+
+HELPERS = [
+    jubilant.all_active,
+    jubilant.all_agents_idle,
+    jubilant.all_blocked,
+    jubilant.all_error,
+    jubilant.all_maintenance,
+    jubilant.all_waiting,
+    jubilant.any_active,
+    jubilant.any_blocked,
+    jubilant.any_error,
+    jubilant.any_maintenance,
+    jubilant.any_waiting,
+]
+
+
+def _set_unit_statuses(units: dict[str, Any], current: str):
+    for unit in units.values():
+        unit.setdefault('workload-status', {})['current'] = current
+        unit.setdefault('juju-status', {})['current'] = current
+        _set_unit_statuses(unit.get('subordinates', {}), current)
+
+
+def _statuses() -> list[jubilant.Status]:
+    statuses: list[jubilant.Status] = []
+    for status_json in [
+        SNAPPASS_JSON,
+        DATABASE_WEBAPP_JSON,
+        STATUS_ERRORS_JSON,
+        SUBORDINATES_JSON,
+    ]:
+        statuses.append(jubilant.Status._from_dict(json.loads(status_json)))
+        for current in ['active', 'idle', 'error']:
+            status_dict = json.loads(status_json)
+            for app in status_dict['applications'].values():
+                app.setdefault('application-status', {})['current'] = current
+                _set_unit_statuses(app.get('units', {}), current)
+            statuses.append(jubilant.Status._from_dict(status_dict))
+    return statuses
+
+
+STATUSES = _statuses()
+
+
+@pytest.mark.parametrize('helper', HELPERS)
+def test_same_as_helpers(helper: Callable[..., bool]):
+    for status in STATUSES:
+        apps = [*status.apps, 'other']
+        for n in range(3):
+            for app_args in itertools.combinations(apps, n):
+                result = jubilant.when(helper, *app_args)(status)
+                assert result == helper(status, *app_args), (helper, app_args)
+
+
+def test_combinators():
+    status = jubilant.Status._from_dict(json.loads(SUBORDINATES_JSON))
+    for helper1, helper2 in itertools.product(HELPERS, repeat=2):
+        value1 = helper1(status)
+        value2 = helper2(status)
+        cond1 = jubilant.when(helper1)
+        cond2 = jubilant.when(helper2)
+
+        assert (cond1 & cond2)(status) == (value1 and value2)
+        assert (cond1 | cond2)(status) == (value1 or value2)
+        assert (cond1 & ~cond2)(status) == (value1 and not value2)
+        assert (~(cond1 | cond2))(status) == (not (value1 or value2))
+
+
+def test_same_check_twice():
+    status = jubilant.Status._from_dict(json.loads(STATUS_ERRORS_JSON))
+
+    assert not (jubilant.when(jubilant.any_error) & ~jubilant.when(jubilant.any_error))(status)
+    assert (jubilant.when(jubilant.any_error) | ~jubilant.when(jubilant.any_error))(status)
+
+
+def always(status: jubilant.Status) -> bool:
+    return True
+
+
+def never(status: jubilant.Status) -> bool:
+    return False
+
+
+def test_predicates():
+    calls: list[tuple[str, ...]] = []
+
+    def has_apps(status: jubilant.Status, *apps: str) -> bool:
+        calls.append(apps)
+        return all(app in status.apps for app in apps)
+
+    status = jubilant.Status._from_dict(json.loads(SNAPPASS_JSON))
+
+    assert jubilant.when(has_apps, 'snappass-test')(status)
+    assert calls == [('snappass-test',)]
+    assert not (jubilant.when(jubilant.all_active) & never)(status)
+    assert (always & jubilant.when(jubilant.all_active))(status)
+
+    # Predicates aren't called if the result is already known.
+    calls.clear()
+    assert (jubilant.when(jubilant.all_active) | jubilant.when(has_apps, 'x'))(status)
+    assert not (jubilant.when(jubilant.any_error) & jubilant.when(has_apps, 'x'))(status)
+    assert calls == []
+
+
+def test_empty_status():
+    assert jubilant.when(jubilant.all_active)(MINIMAL_STATUS)
+    assert not jubilant.when(jubilant.any_error)(MINIMAL_STATUS)
+    assert not jubilant.when(jubilant.all_active, 'app')(MINIMAL_STATUS)
+
+
+def test_repr():
+    cond = jubilant.when(jubilant.all_active, 'b', 'a') & ~jubilant.when(jubilant.any_error)
+
+    assert repr(cond) == "(when(all_active, 'a', 'b') & ~when(any_error))"
+
+
+def test_condition_is_abstract():
+    with pytest.raises(TypeError):
+        jubilant.Condition()  # type: ignore
+
+
+def test_wait_error(run: mocks.Run, time: mocks.Time):
+    run.handle(['juju', 'status', '--format', 'json'], stdout=MINIMAL_JSON)
+    juju = jubilant.Juju()
+
+    with pytest.raises(jubilant.WaitError) as excinfo:
+        juju.wait(
+            jubilant.when(jubilant.any_active),
+            error=~jubilant.when(jubilant.any_active, 'app'),
+        )
+
+    assert "~when(any_active, 'app') returned true" in str(excinfo.value)